@@ -0,0 +1,126 @@
+"""Paint time per frame of HSVColorWheel during simulated drags.
+
+Compares the original paintEvent (360 drawArc calls plus an 80-step point grid
+for the triangle, full-widget repaint on every move) with the cached ring,
+cached triangle raster and dirty-region updates. Run headless:
+
+    QT_QPA_PLATFORM=offscreen python -m benchmarks.bench_color_wheel
+"""
+import math
+import os
+import statistics
+import time
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt5.QtCore import QPointF, Qt  # noqa: E402
+from PyQt5.QtGui import QColor, QPainter, QPen  # noqa: E402
+from PyQt5.QtWidgets import QApplication  # noqa: E402
+
+from main import HSVColorWheel  # noqa: E402
+
+FRAMES = 200
+
+
+class TimedWheel(HSVColorWheel):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.frame_times = []
+        self.painted_area = []
+
+    def paintEvent(self, event):
+        start = time.perf_counter()
+        super().paintEvent(event)
+        self.frame_times.append(time.perf_counter() - start)
+        rect = event.region().boundingRect()
+        self.painted_area.append(rect.width() * rect.height())
+
+
+class LegacyWheel(TimedWheel):
+    """The paintEvent and update behaviour before caching."""
+
+    def _update_dirty(self, rects):
+        self.update()
+
+    def _paint(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        r = min(self.width(), self.height()-50) // 2 - 8
+        center = QPointF(self.width()/2, (self.height()-50)/2+10)
+        for angle in range(0, 360, 1):
+            color = QColor.fromHsv(angle, 255, 255)
+            painter.setPen(QPen(color, 10))
+            painter.drawArc(int(center.x()-r), int(center.y()-r), 2*r, 2*r, angle*16, 16)
+        tri_r = r-18
+        p_white = QPointF(center.x(), center.y() - tri_r)
+        p_black = QPointF(center.x() - tri_r * math.sin(math.radians(60)), center.y() + tri_r * math.cos(math.radians(60)))
+        p_hue = QPointF(center.x() + tri_r * math.sin(math.radians(60)), center.y() + tri_r * math.cos(math.radians(60)))
+        self._triangle_points = [p_white, p_black, p_hue]
+        steps = 80
+        for i in range(steps):
+            for j in range(steps-i):
+                u = i / steps
+                v = j / steps
+                w = 1 - u - v
+                if w < 0:
+                    continue
+                x = u*p_white.x() + v*p_black.x() + w*p_hue.x()
+                y = u*p_white.y() + v*p_black.y() + w*p_hue.y()
+                painter.setPen(QColor.fromHsvF(self._hue, w, u + w))
+                painter.drawPoint(int(x), int(y))
+        painter.setPen(QPen(Qt.white, 2))
+        painter.setBrush(Qt.NoBrush)
+        painter.drawPolygon(p_white, p_black, p_hue)
+        sel_x, sel_y = self._hue_selector_pos()
+        painter.setPen(QPen(Qt.white, 3))
+        painter.setBrush(self._color)
+        painter.drawEllipse(QPointF(sel_x, sel_y), 9, 9)
+        sv_x, sv_y = self._sv_to_pos()
+        painter.setPen(QPen(Qt.black, 2))
+        painter.setBrush(Qt.white)
+        painter.drawEllipse(QPointF(sv_x, sv_y), 7, 7)
+
+    def paintEvent(self, event):
+        start = time.perf_counter()
+        self._paint(event)
+        self.frame_times.append(time.perf_counter() - start)
+        rect = event.region().boundingRect()
+        self.painted_area.append(rect.width() * rect.height())
+
+
+def drag(app, wheel, mode):
+    center, r = wheel._geometry()
+    wheel.frame_times.clear()
+    wheel.painted_area.clear()
+    for i in range(FRAMES):
+        a = 2 * math.pi * i / FRAMES
+        if mode == 'hue':
+            wheel._set_hue_from_pos(QPointF(center.x() + (r - 5) * math.cos(a), center.y() - (r - 5) * math.sin(a)))
+        else:
+            # Small circle around the middle of the triangle
+            wheel._set_sv_from_pos(QPointF(center.x() + 20 * math.cos(a), center.y() + 10 + 20 * math.sin(a)))
+        app.processEvents()
+    return wheel.frame_times[:], wheel.painted_area[:]
+
+
+def report(name, times, areas):
+    ms = sorted(t * 1e3 for t in times)
+    p95 = ms[int(len(ms) * 0.95) - 1]
+    print(f"{name:<22} {statistics.mean(ms):>8.3f} {p95:>8.3f} {statistics.mean(areas):>10.0f}")
+
+
+def main():
+    app = QApplication.instance() or QApplication([])
+    print(f"{'frame':<22} {'mean ms':>8} {'p95 ms':>8} {'px/frame':>10}")
+    for label, cls in (('before', LegacyWheel), ('after', TimedWheel)):
+        wheel = cls(QColor('#4ecdc4'))
+        wheel.resize(260, 300)
+        wheel.show()
+        app.processEvents()
+        for mode in ('sv', 'hue'):
+            report(f"{label} {mode} drag", *drag(app, wheel, mode))
+        wheel.close()
+
+
+if __name__ == '__main__':
+    main()
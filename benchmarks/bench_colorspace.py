@@ -0,0 +1,61 @@
+"""Cost of interpolating in sRGB, linear RGB, OKLab and OKLCh.
+
+"cold" builds a LUT from bare stops (stop conversion and spline setup
+included); "warm" passes the converted stops and coefficients in, as
+LUTCache does once they are cached for the current edit. Ratios are
+against cold sRGB for the same row.
+
+    python -m benchmarks.bench_colorspace
+"""
+import time
+
+import numpy as np
+
+from gradient_core.colorspace import COLOR_SPACES, to_space
+from gradient_core.engine import SPLINE_MODES, build_lut, spline_coefficients
+
+SIZES = [512, 4096, 65536]
+STOP_COUNTS = [8, 256]
+MODES = ['linear', 'monotone']
+REPEAT = 30
+
+
+def random_gradient(count, seed=0):
+    rng = np.random.default_rng(seed)
+    positions = np.sort(rng.random(count))
+    positions[0], positions[-1] = 0.0, 1.0
+    return positions, rng.integers(0, 256, (count, 3)).astype(np.float64)
+
+
+def best_ms(fn):
+    times = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1e3
+
+
+def main():
+    header = ' '.join(f"{space:>19}" for space in COLOR_SPACES)
+    print(f"{'stops':>5} {'mode':<9} {'size':>6} {header}")
+    print(f"{'':>23} " + ' '.join(f"{'cold':>9} {'warm':>9}" for _ in COLOR_SPACES))
+    for count in STOP_COUNTS:
+        positions, colors = random_gradient(count)
+        for mode in MODES:
+            for size in SIZES:
+                cells = []
+                for space in COLOR_SPACES:
+                    values = to_space(colors, space)
+                    coefficients = spline_coefficients(positions, values, mode) if mode in SPLINE_MODES else None
+                    cold = best_ms(lambda: build_lut(positions, colors, size, mode=mode, space=space))
+                    warm = best_ms(lambda: build_lut(positions, colors, size, mode=mode, space=space,
+                                                     values=values, coefficients=coefficients))
+                    cells.append((cold, warm))
+                base = cells[0][0]
+                row = ' '.join(f"{c / base:>8.2f}x {w / base:>8.2f}x" for c, w in cells)
+                print(f"{count:>5} {mode:<9} {size:>6} {row}   (sRGB cold {base:.3f} ms)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""Benchmark LUT generation: per-sample Python loop vs. the vectorized engine.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_lut
+"""
+import random
+import time
+
+from gradient_core import build_lut, stops_to_arrays
+
+SIZES = [256, 1024, 4096, 65536, 262144, 1048576]
+# The legacy loop is too slow to be worth timing beyond this size
+LEGACY_MAX = 65536
+
+
+def random_stops(count, seed=0):
+    rng = random.Random(seed)
+    stops = [(0.0, (rng.randrange(256), rng.randrange(256), rng.randrange(256))),
+             (1.0, (rng.randrange(256), rng.randrange(256), rng.randrange(256)))]
+    for _ in range(count - 2):
+        stops.append((rng.random(), (rng.randrange(256), rng.randrange(256), rng.randrange(256))))
+    return stops
+
+
+def legacy_color_at(stops, t):
+    # Mirror of the old GradientEditorWindow.get_color_at linear scan
+    stops = sorted(stops, key=lambda s: s[0])
+    if t <= stops[0][0]:
+        return stops[0][1]
+    if t >= stops[-1][0]:
+        return stops[-1][1]
+    for i in range(1, len(stops)):
+        (lp, lc), (rp, rc) = stops[i - 1], stops[i]
+        if lp <= t <= rp:
+            f = (t - lp) / (rp - lp)
+            return tuple(int(lc[c] + f * (rc[c] - lc[c])) for c in range(3))
+    return stops[-1][1]
+
+
+def best_of(fn, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(stop_count=16):
+    stops = random_stops(stop_count)
+    positions, colors = stops_to_arrays(stops)
+    print(f"{stop_count} stops")
+    print(f"{'size':>9} {'legacy ms':>11} {'numpy ms':>10} {'speedup':>9}")
+    for size in SIZES:
+        vec = best_of(lambda: build_lut(positions, colors, size))
+        if size <= LEGACY_MAX:
+            legacy = best_of(lambda: [legacy_color_at(stops, i / (size - 1)) for i in range(size)], repeat=1)
+            print(f"{size:>9} {legacy * 1e3:>11.2f} {vec * 1e3:>10.3f} {legacy / vec:>8.0f}x")
+        else:
+            print(f"{size:>9} {'-':>11} {vec * 1e3:>10.3f} {'-':>9}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""Time and peak memory of PNG export: QPainter + QImage.save vs. the streaming writer.
+
+Each case runs in a fresh subprocess so its peak RSS is measured in
+isolation (reported as growth over the process's peak after imports).
+
+    QT_QPA_PLATFORM=offscreen python -m benchmarks.bench_png_export
+"""
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+SIZES = [(1200, 200), (8000, 4000), (16000, 16000)]
+# The full-frame QImage paths need width * height * 4 bytes; skip the largest
+QIMAGE_MAX_PIXELS = 8000 * 4000
+CASES = ['qpainter', 'stream8', 'stream16']
+STOPS = [(0.0, (255, 0, 0)), (0.25, (255, 200, 0)), (0.5, (0, 200, 80)), (0.75, (0, 80, 255)), (1.0, (120, 0, 200))]
+
+
+def run_qpainter(path, width, height):
+    # Mirror of the old GradientEditorWindow.export_png
+    from PyQt5.QtCore import Qt
+    from PyQt5.QtGui import QBrush, QColor, QImage, QLinearGradient, QPainter
+    img = QImage(width, height, QImage.Format_ARGB32)
+    img.fill(QColor(0, 0, 0, 0))
+    painter = QPainter(img)
+    painter.setRenderHint(QPainter.Antialiasing)
+    grad = QLinearGradient(0, 0, width, 0)
+    for pos, color in STOPS:
+        grad.setColorAt(pos, QColor(*color))
+    painter.setBrush(QBrush(grad))
+    painter.setPen(Qt.NoPen)
+    painter.drawRect(0, 0, width, height)
+    painter.end()
+    img.save(path)
+
+
+def run_stream(path, width, height, bit_depth):
+    from gradient_core import stops_to_arrays
+    from gradient_core.formats import write_png
+    with open(path, 'wb') as f:
+        write_png(f, *stops_to_arrays(STOPS), width=width, height=height, bit_depth=bit_depth)
+
+
+def child(case, width, height):
+    # Import everything up front so only the export itself counts
+    from PyQt5.QtWidgets import QApplication
+    import gradient_core.formats  # noqa: F401
+    app = QApplication.instance() or QApplication([])  # noqa: F841
+    base = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'out.png')
+        start = time.perf_counter()
+        if case == 'qpainter':
+            run_qpainter(path, width, height)
+        else:
+            run_stream(path, width, height, 16 if case == 'stream16' else 8)
+        elapsed = time.perf_counter() - start
+        size = os.path.getsize(path)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(f"{elapsed:.4f} {(peak - base) / 1024:.1f} {size}")
+
+
+def main():
+    print(f"{'size':>12} {'case':<9} {'time s':>8} {'peak +MB':>9} {'file KB':>9}")
+    for width, height in SIZES:
+        for case in CASES:
+            if case == 'qpainter' and width * height > QIMAGE_MAX_PIXELS:
+                continue
+            out = subprocess.run([sys.executable, '-m', 'benchmarks.bench_png_export', case, str(width), str(height)],
+                                 capture_output=True, text=True, check=True).stdout.split()
+            elapsed, peak, size = float(out[0]), float(out[1]), int(out[2])
+            print(f"{f'{width}x{height}':>12} {case:<9} {elapsed:>8.3f} {peak:>9.1f} {size / 1024:>9.1f}")
+
+
+if __name__ == '__main__':
+    if len(sys.argv) == 4:
+        child(sys.argv[1], int(sys.argv[2]), int(sys.argv[3]))
+    else:
+        main()
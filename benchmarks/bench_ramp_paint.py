@@ -0,0 +1,130 @@
+"""Paint time per frame of GradientRamp with many stops.
+
+Compares the original paintEvent (glass borders redrawn and seven
+antialiased ellipses per stop every frame) with the cached bar/border
+pixmaps, per-state marker sprites and level-of-detail marker collapsing.
+"drag" moves the selected stop before every frame, so the bar is redrawn
+from a fresh LUT each time. Run headless:
+
+    QT_QPA_PLATFORM=offscreen python -m benchmarks.bench_ramp_paint
+"""
+import os
+import statistics
+import time
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+import numpy as np  # noqa: E402
+from PyQt5.QtCore import QPointF, Qt  # noqa: E402
+from PyQt5.QtGui import QBrush, QColor, QImage, QPainter, QPen, QPixmap, QTransform  # noqa: E402
+from PyQt5.QtWidgets import QApplication  # noqa: E402
+
+from gradient_core.cache import lut_cache  # noqa: E402
+from gradient_core.stops import StopStore  # noqa: E402
+from main import GradientRamp  # noqa: E402
+
+STOP_COUNTS = [3, 100, 1000, 10000]
+FRAMES = 30
+WIDTH = 1200
+
+
+class TimedRamp(GradientRamp):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.frame_times = []
+
+    def paintEvent(self, event):
+        start = time.perf_counter()
+        super().paintEvent(event)
+        self.frame_times.append(time.perf_counter() - start)
+
+
+class LegacyRamp(TimedRamp):
+    """The paintEvent before caching."""
+
+    def _paint(self):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        rect = self.rect().adjusted(20, 20, -20, -40)
+        lut = lut_cache.get(*self.stops.arrays(), size=max(1, rect.width()), channels=4,
+                            **self.interpolation_options())
+        bar = QImage(lut.data, lut.shape[0], 1, lut.shape[0] * 4, QImage.Format_RGBA8888)
+        brush = QBrush(bar)
+        brush.setTransform(QTransform.fromTranslate(rect.left(), 0))
+        painter.setPen(QPen(QColor(255, 255, 255, 150), 2))
+        painter.setBrush(brush)
+        painter.drawRoundedRect(rect, 15, 15)
+        painter.setPen(QPen(QColor(255, 255, 255, 80), 1))
+        painter.setBrush(Qt.NoBrush)
+        painter.drawRoundedRect(rect.adjusted(1, 1, -1, -1), 14, 14)
+        painter.setPen(QPen(QColor(255, 255, 255, 40), 1))
+        painter.drawRoundedRect(rect.adjusted(2, 2, -2, -2), 13, 13)
+        for i, (position, color) in enumerate(zip(self.stops.positions.tolist(), self.stops.colors.tolist())):
+            x = rect.left() + position * rect.width()
+            y = rect.bottom() + 20
+            r = 14 if i == self.selected else 12
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(QColor(0, 0, 0, 100))
+            painter.drawEllipse(QPointF(x + 3, y + 3), r + 3, r + 3)
+            painter.setBrush(QColor(0, 0, 0, 60))
+            painter.drawEllipse(QPointF(x + 2, y + 2), r + 2, r + 2)
+            painter.setBrush(QColor(0, 0, 0, 30))
+            painter.drawEllipse(QPointF(x + 1, y + 1), r + 1, r + 1)
+            painter.setBrush(QBrush(QColor(*color[:3])))
+            painter.setPen(QPen(QColor(255, 255, 255, 220), 3 if i == self.selected else 2))
+            painter.drawEllipse(QPointF(x, y), r, r)
+            painter.setBrush(QColor(255, 255, 255, 60))
+            painter.setPen(Qt.NoPen)
+            painter.drawEllipse(QPointF(x - r/3, y - r/3), r/2, r/2)
+            if i == self.selected:
+                painter.setPen(QPen(QColor(100, 200, 255, 200), 2))
+                painter.setBrush(Qt.NoBrush)
+                painter.drawEllipse(QPointF(x, y), r + 6, r + 6)
+                painter.setPen(QPen(QColor(100, 200, 255, 100), 1))
+                painter.drawEllipse(QPointF(x, y), r + 8, r + 8)
+
+    def paintEvent(self, event):
+        start = time.perf_counter()
+        self._paint()
+        self.frame_times.append(time.perf_counter() - start)
+
+
+def make_stops(count, seed=0):
+    rng = np.random.default_rng(seed)
+    positions = np.sort(rng.random(count))
+    positions[0], positions[-1] = 0.0, 1.0
+    return StopStore(positions, rng.integers(0, 256, (count, 3)))
+
+
+def run(ramp, target, drag):
+    ramp.frame_times.clear()
+    for i in range(FRAMES):
+        if drag:
+            ramp.selected = ramp.stops.move(ramp.selected, (i + 0.5) / FRAMES)
+        ramp.render(target)
+    return ramp.frame_times[:]
+
+
+def report(name, times):
+    ms = sorted(t * 1e3 for t in times)
+    p95 = ms[int(len(ms) * 0.95) - 1]
+    print(f"{name:<24} {statistics.mean(ms):>9.3f} {p95:>9.3f}")
+
+
+def main():
+    app = QApplication.instance() or QApplication([])  # noqa: F841
+    print(f"{'frame':<24} {'mean ms':>9} {'p95 ms':>9}")
+    for count in STOP_COUNTS:
+        for label, cls in (('before', LegacyRamp), ('after', TimedRamp)):
+            ramp = cls(make_stops(count), lambda: None)
+            ramp.resize(WIDTH, 80)
+            ramp.selected = count // 2
+            target = QPixmap(ramp.size())
+            ramp.render(target)
+            for mode in ('static', 'drag'):
+                report(f"{count:>5} {label} {mode}", run(ramp, target, mode == 'drag'))
+        print()
+
+
+if __name__ == '__main__':
+    main()
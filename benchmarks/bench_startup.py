@@ -0,0 +1,98 @@
+"""Editor start-up time: process start to the first painted frame.
+
+Each run spawns a fresh interpreter that imports ``main``, builds and shows
+the window, and stops once the first paint of the window has been flushed.
+Phases are measured with the wall clock against the moment the parent
+spawned the process, so interpreter start-up and imports are included.
+The child also counts ``setStyleSheet`` calls and the widget polishes they
+cause, the cost the single app stylesheet removes.
+
+    QT_QPA_PLATFORM=offscreen python -m benchmarks.bench_startup [--runs 10] [--main DIR]
+
+``--main`` times the ``main.py`` in another directory (e.g. an older checkout).
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PHASES = ['interpreter', 'imports', 'window', 'first_paint', 'total']
+
+_CHILD = """
+import json, sys, time
+start = time.time()
+sys.path[:0] = sys.argv[1:3]
+from PyQt5.QtCore import QEvent, QObject, QTimer
+from PyQt5.QtWidgets import QApplication, QWidget
+counts = {'set_style_sheet': 0, 'polish': 0}
+_set_style_sheet = QWidget.setStyleSheet
+def set_style_sheet(widget, sheet):
+    counts['set_style_sheet'] += 1
+    _set_style_sheet(widget, sheet)
+QWidget.setStyleSheet = set_style_sheet
+app = QApplication(sys.argv[:1])
+import main
+imported = time.time()
+times = {}
+class Watch(QObject):
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Polish:
+            counts['polish'] += 1
+        elif event.type() == QEvent.Paint and obj is window and 'painted' not in times:
+            times['painted'] = None
+            # Runs once this paint cycle has been flushed
+            QTimer.singleShot(0, finish)
+        return False
+def finish():
+    times['painted'] = time.time()
+    app.quit()
+watch = Watch()
+app.installEventFilter(watch)
+window = main.GradientEditorWindow()
+built = time.time()
+window.show()
+app.exec_()
+print(json.dumps({'start': start, 'imported': imported, 'built': built, 'painted': times['painted'], **counts}))
+"""
+
+
+def run_once(main_dir):
+    env = dict(os.environ)
+    env.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    spawned = time.time()
+    out = subprocess.run([sys.executable, '-c', _CHILD, main_dir, ROOT], capture_output=True, text=True,
+                         check=True, env=env, cwd=main_dir)
+    r = json.loads(out.stdout.strip().splitlines()[-1])
+    return {
+        'interpreter': r['start'] - spawned,
+        'imports': r['imported'] - r['start'],
+        'window': r['built'] - r['imported'],
+        'first_paint': r['painted'] - r['built'],
+        'total': r['painted'] - spawned,
+    }, r['set_style_sheet'], r['polish']
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--main', default=ROOT, help="directory holding the main.py to time (default: this repo)")
+    args = parser.parse_args(argv)
+    main_dir = os.path.abspath(args.main)
+    run_once(main_dir)  # warm the OS file cache and .pyc files
+    samples = {phase: [] for phase in PHASES}
+    for _ in range(args.runs):
+        times, style_sheets, polishes = run_once(main_dir)
+        for phase in PHASES:
+            samples[phase].append(times[phase] * 1e3)
+    print(f"{main_dir}: median of {args.runs} runs, "
+          f"{style_sheets} setStyleSheet calls, {polishes} widget polishes")
+    for phase in PHASES:
+        print(f"  {phase:<12} {statistics.median(samples[phase]):>8.1f} ms   (min {min(samples[phase]):.1f})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+"""Scaling of stop hit-testing and reordering: the old list scans vs. StopStore,
+plus the memory held per stop by a list of stop objects and by StopStore.
+
+    python -m benchmarks.bench_stops
+"""
+import random
+import time
+import tracemalloc
+
+import numpy as np
+
+from gradient_core.stops import StopStore
+
+COUNTS = [10, 100, 1000, 10000]
+WIDTH = 1000.0  # ramp width in pixels used for the hit-test tolerance
+
+
+class Stop:
+    # The editor's stop object before StopStore
+    __slots__ = ('position', 'color')
+
+    def __init__(self, position, color=None):
+        self.position = position
+        self.color = color
+
+
+def make_stops(count, seed=0):
+    rng = random.Random(seed)
+    return [Stop(rng.random()) for _ in range(count)]
+
+
+def legacy_hit_test(stops, x):
+    # Old GradientRamp.mousePressEvent: scan every stop
+    for i, stop in enumerate(stops):
+        if abs(stop.position * WIDTH - x) < 18:
+            return i
+    return None
+
+
+def legacy_move(stops, index, pos):
+    # Old GradientRamp.mouseMoveEvent: full sort plus float-equality search
+    stops[index].position = pos
+    stops.sort(key=lambda s: s.position)
+    return next(i for i, s in enumerate(stops) if s.position == pos)
+
+
+def per_op_us(fn, ops):
+    start = time.perf_counter()
+    for arg in ops:
+        fn(arg)
+    return (time.perf_counter() - start) / len(ops) * 1e6
+
+
+def make_store(count, seed=0):
+    rng = np.random.default_rng(seed)
+    return StopStore(rng.random(count), rng.integers(0, 256, (count, 3)))
+
+
+def bytes_per_stop(build, count):
+    tracemalloc.start()
+    kept = build(count)  # noqa: F841
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size / count
+
+
+def main():
+    rng = random.Random(1)
+    print(f"{'stops':>6} {'op':<8} {'legacy us':>10} {'StopStore us':>13} {'speedup':>8}")
+    for count in COUNTS:
+        legacy = sorted(make_stops(count), key=lambda s: s.position)
+        store = make_store(count)
+        xs = [rng.random() * WIDTH for _ in range(500)]
+        targets = [rng.random() for _ in range(500)]
+
+        old = per_op_us(lambda x: legacy_hit_test(legacy, x), xs)
+        arrays = per_op_us(lambda x: store.hit_test(x / WIDTH, 18 / WIDTH), xs)
+        print(f"{count:>6} {'hit':<8} {old:>10.2f} {arrays:>13.2f} {old / arrays:>7.0f}x")
+
+        state = {'old': 0, 'store': 0}
+
+        def old_move(pos):
+            state['old'] = legacy_move(legacy, state['old'], pos)
+
+        def store_move(pos):
+            state['store'] = store.move(state['store'], pos)
+
+        old = per_op_us(old_move, targets)
+        arrays = per_op_us(store_move, targets)
+        print(f"{count:>6} {'move':<8} {old:>10.2f} {arrays:>13.2f} {old / arrays:>7.0f}x")
+
+        batch = make_stops(100, seed=count)
+        start = time.perf_counter()
+        for stop in batch:
+            legacy.append(stop)
+            legacy.sort(key=lambda s: s.position)
+        old = (time.perf_counter() - start) * 1e6
+        added = make_store(100, seed=count)
+        start = time.perf_counter()
+        store.extend(added.positions, added.colors)
+        arrays = (time.perf_counter() - start) * 1e6
+        print(f"{count:>6} {'add 100':<8} {old:>10.2f} {arrays:>13.2f} {old / arrays:>7.0f}x")
+
+    count = COUNTS[-1]
+    objects = bytes_per_stop(lambda n: [Stop(rng.random(), (1, 2, 3)) for _ in range(n)], count)
+    arrays = bytes_per_stop(make_store, count)
+    print(f"\nmemory per stop at {count} stops: stop object list {objects:.0f} B, StopStore {arrays:.0f} B")
+
+
+if __name__ == '__main__':
+    main()
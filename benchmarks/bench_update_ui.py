@@ -0,0 +1,66 @@
+"""Widget allocations and cost of update_ui during a simulated color wheel drag.
+
+Drags the SV selector through 500 mouse positions with a stop selected, so
+every move goes colorChanged -> change_selected_color -> update_ui. Exits
+non-zero if the drag creates any widget or replaces the wheel mid-gesture.
+
+    QT_QPA_PLATFORM=offscreen python -m benchmarks.bench_update_ui
+"""
+import math
+import os
+import sys
+import time
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt5.QtCore import QEvent, QObject, QPointF  # noqa: E402
+from PyQt5.QtWidgets import QApplication  # noqa: E402
+
+from main import GradientEditorWindow  # noqa: E402
+
+EVENTS = 500
+
+
+class WidgetCounter(QObject):
+    """Counts widgets parented anywhere in the application."""
+
+    def __init__(self):
+        super().__init__()
+        self.count = 0
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.ChildAdded and event.child().isWidgetType():
+            self.count += 1
+        return False
+
+
+def main():
+    app = QApplication.instance() or QApplication([])
+    window = GradientEditorWindow()
+    window.show()
+    window.ramp.selected = 1
+    window.update_ui()
+    app.processEvents()
+
+    wheel = window.hsv_color_wheel
+    center, r = wheel._geometry()
+    counter = WidgetCounter()
+    app.installEventFilter(counter)
+    start = time.perf_counter()
+    wheel._drag_mode = 'sv'
+    for i in range(EVENTS):
+        a = 2 * math.pi * i / 100
+        wheel._set_sv_from_pos(QPointF(center.x() + 25 * math.cos(a), center.y() + 10 + 25 * math.sin(a)))
+        app.processEvents()
+    wheel._drag_mode = None
+    elapsed = time.perf_counter() - start
+    app.removeEventFilter(counter)
+
+    same_wheel = window.hsv_color_wheel is wheel
+    print(f"{EVENTS} drag events: {counter.count} widgets allocated, "
+          f"{elapsed / EVENTS * 1e3:.3f} ms/event, wheel kept: {same_wheel}")
+    return 0 if counter.count == 0 and same_wheel else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,70 @@
+"""Frame time of the editor window while a ramp stop is dragged.
+
+"before" puts back the window-wide QGraphicsDropShadowEffect the editor
+used to install, which makes Qt render the whole widget tree offscreen
+and blur it on every child repaint. "after" is the window as shipped,
+with its shadow drawn from a cached nine-patch. Each frame is one mouse
+move on the ramp plus a synchronous repaint. Run headless:
+
+    QT_QPA_PLATFORM=offscreen python -m benchmarks.bench_window_drag
+"""
+import os
+import statistics
+import time
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt5.QtCore import QEvent, QPointF, Qt  # noqa: E402
+from PyQt5.QtGui import QColor, QMouseEvent  # noqa: E402
+from PyQt5.QtWidgets import QApplication, QGraphicsDropShadowEffect  # noqa: E402
+
+from main import GradientEditorWindow  # noqa: E402
+
+FRAMES = 120
+
+
+def legacy_shadow():
+    # Exactly what GradientEditorWindow.__init__ used to install
+    shadow = QGraphicsDropShadowEffect()
+    shadow.setBlurRadius(10)
+    shadow.setColor(QColor(0, 0, 0, 80))
+    shadow.setOffset(0, 2)
+    return shadow
+
+
+def drag(app, window):
+    ramp = window.ramp
+    rect = ramp.rect().adjusted(20, 20, -20, -40)
+    y = rect.bottom() + 20
+
+    def send(kind, x):
+        ramp.event(QMouseEvent(kind, QPointF(x, y), Qt.LeftButton, Qt.LeftButton, Qt.NoModifier))
+
+    send(QEvent.MouseButtonPress, rect.left() + 0.5 * rect.width())
+    times = []
+    for i in range(FRAMES):
+        start = time.perf_counter()
+        send(QEvent.MouseMove, rect.left() + (0.3 + 0.4 * i / FRAMES) * rect.width())
+        ramp.repaint()
+        app.processEvents()
+        times.append(time.perf_counter() - start)
+    send(QEvent.MouseButtonRelease, rect.left() + 0.7 * rect.width())
+    return times
+
+
+def main():
+    app = QApplication.instance() or QApplication([])
+    print(f"{'window':<10} {'mean ms':>9} {'p50 ms':>9} {'p95 ms':>9}")
+    for label in ('before', 'after'):
+        window = GradientEditorWindow()
+        if label == 'before':
+            window.setGraphicsEffect(legacy_shadow())
+        window.show()
+        app.processEvents()
+        ms = sorted(t * 1e3 for t in drag(app, window))
+        print(f"{label:<10} {statistics.mean(ms):>9.2f} {ms[len(ms) // 2]:>9.2f} {ms[int(len(ms) * 0.95) - 1]:>9.2f}")
+        window.close()
+
+
+if __name__ == '__main__':
+    main()
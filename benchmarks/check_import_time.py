@@ -0,0 +1,79 @@
+"""Import-time regression check for the Qt-free core.
+
+Each import runs in a fresh interpreter (best of several runs) and checks:
+
+* ``import gradient_core`` stays lazy: no NumPy, no Qt, under the budget;
+* every core module costs less than the budget on top of NumPy itself,
+  which the core needs for any real work and does not control;
+* no core module pulls in PyQt5.
+
+Exits non-zero on any violation, so it can gate CI.
+
+    python -m benchmarks.check_import_time [--budget-ms 50]
+"""
+import argparse
+import json
+import subprocess
+import sys
+
+CORE_MODULES = ['gradient_core.cache', 'gradient_core.cli', 'gradient_core.colorspace', 'gradient_core.engine',
+                'gradient_core.formats', 'gradient_core.history', 'gradient_core.jobs', 'gradient_core.library',
+                'gradient_core.lutfile', 'gradient_core.png', 'gradient_core.profiling', 'gradient_core.reduce',
+                'gradient_core.stops', 'gradient_core.watchdog']
+FORBIDDEN = ['PyQt5']
+RUNS = 7
+
+_PROBE = """
+import json, sys, time
+times = []
+for name in sys.argv[1:]:
+    start = time.perf_counter()
+    __import__(name)
+    times.append((time.perf_counter() - start) * 1e3)
+print(json.dumps({'ms': times, 'modules': sorted(m.split('.')[0] for m in sys.modules)}))
+"""
+
+
+def probe(*modules):
+    """Best-of-RUNS time in ms of the last of ``modules``, imported after the others
+    in the same interpreter, and the top-level modules loaded."""
+    best, loaded = None, set()
+    for _ in range(RUNS):
+        out = subprocess.run([sys.executable, '-c', _PROBE, *modules], capture_output=True, text=True, check=True)
+        result = json.loads(out.stdout)
+        best = result['ms'][-1] if best is None else min(best, result['ms'][-1])
+        loaded = set(result['modules'])
+    return best, loaded
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--budget-ms', type=float, default=50.0, help="allowed import cost (default: 50 ms)")
+    args = parser.parse_args(argv)
+    failures = []
+
+    package_ms, loaded = probe('gradient_core')
+    print(f"{'gradient_core (lazy)':<28} {package_ms:>7.1f} ms")
+    if package_ms > args.budget_ms:
+        failures.append(f"import gradient_core took {package_ms:.1f} ms")
+    for name in ['numpy'] + FORBIDDEN:
+        if name in loaded:
+            failures.append(f"import gradient_core loaded {name}")
+
+    numpy_ms, _ = probe('numpy')
+    print(f"{'numpy (not budgeted)':<28} {numpy_ms:>7.1f} ms")
+    for module in CORE_MODULES:
+        own_ms, loaded = probe('numpy', module)
+        print(f"{module:<28} {own_ms:>7.1f} ms after numpy")
+        if own_ms > args.budget_ms:
+            failures.append(f"{module} costs {own_ms:.1f} ms over numpy")
+        failures.extend(f"{module} loaded {name}" for name in FORBIDDEN if name in loaded)
+
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    print("OK" if not failures else f"{len(failures)} import-time check(s) failed")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
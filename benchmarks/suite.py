@@ -0,0 +1,253 @@
+"""Reproducible benchmark suite for the editor's hot paths.
+
+Times LUT evaluation, stop fitting, ``get_color_at``, the exporters, loading
+(parse plus ``set_gradient``) and the ``GradientRamp`` / ``HSVColorWheel``
+paint events on seeded synthetic gradients of 2 to 10,000 stops, headless.
+Results are written as JSON; given a baseline, any case whose median got
+slower by more than ``--threshold`` (and by more than timer noise) fails the run.
+
+    QT_QPA_PLATFORM=offscreen python -m benchmarks.suite -o base.json
+    QT_QPA_PLATFORM=offscreen python -m benchmarks.suite -o new.json --baseline base.json --threshold 0.25
+    python -m benchmarks.suite --results new.json --baseline base.json   # compare without running
+
+Exporters and paints are timed warm, as they run while editing: the shared
+LUT cache already holds the gradient unless the case changes it.
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+import numpy as np  # noqa: E402
+
+RESULTS_VERSION = 1
+STOP_COUNTS = [2, 10, 100, 1000, 10000]
+QUICK_STOP_COUNTS = [2, 100, 1000]
+# Each case repeats until it has run this long (and at least MIN_RUNS times)
+MIN_TIME = 0.2
+QUICK_MIN_TIME = 0.05
+MIN_RUNS = 3
+MAX_RUNS = 2000
+# Slowdowns smaller than this are timer noise, whatever the ratio
+MIN_DELTA_MS = 0.1
+LUT_SIZE = 4096
+POINT_QUERIES = 100
+
+
+def synthetic_gradient(count, seed=0):
+    """Sorted ``(positions, colors)`` with ``count`` stops spanning [0, 1]."""
+    rng = np.random.default_rng(seed + count)
+    positions = np.sort(rng.random(count))
+    positions[0], positions[-1] = 0.0, 1.0
+    return positions, rng.integers(0, 256, (count, 3)).astype(np.float64)
+
+
+def measure(fn, min_time, ops=1):
+    """Median and best time per operation in ms; ``fn`` performs ``ops`` operations."""
+    start = time.perf_counter()
+    fn()  # warm-up: imports, caches, first-paint allocations
+    warmup = (time.perf_counter() - start) * 1e3 / ops
+    # Cases slower than the whole time budget are dominated by real work, so the warm-up counts
+    times = [warmup] if warmup > min_time * 1e3 else []
+    deadline = time.perf_counter() + min_time
+    while len(times) < MIN_RUNS or (time.perf_counter() < deadline and len(times) < MAX_RUNS):
+        start = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - start) * 1e3 / ops)
+    return {'median_ms': statistics.median(times), 'min_ms': min(times), 'runs': len(times)}
+
+
+def engine_cases(count, positions, colors):
+    from gradient_core.engine import build_lut
+    from gradient_core.reduce import fit_stops
+    yield f'build_lut/linear/stops={count}', lambda: build_lut(positions, colors, LUT_SIZE), 1
+    yield f'build_lut/monotone/stops={count}', lambda: build_lut(positions, colors, LUT_SIZE, mode='monotone'), 1
+    yield f'build_lut/oklab/stops={count}', lambda: build_lut(positions, colors, LUT_SIZE, space='oklab'), 1
+    yield f'fit_stops/stops={count}', lambda: fit_stops(positions, colors, 2.0), 1
+
+
+def window_cases(app, window, count, positions, colors, tmp):
+    from PyQt5.QtGui import QPixmap
+
+    from gradient_core.formats import read_gradient, read_interpolation, write_css, write_full_gradient, \
+        write_json, write_jwf, write_png
+
+    def use_stops():
+        window.stops.replace(positions, colors)
+        window.set_interpolation_options('linear', 'srgb')
+        window.ramp.selected = count // 2
+
+    use_stops()
+    ts = np.linspace(0.0, 1.0, POINT_QUERIES).tolist()
+
+    def color_queries():
+        for t in ts:
+            window.get_color_at(t)
+    yield f'get_color_at/stops={count}', color_queries, POINT_QUERIES
+
+    # Exporters, as the export jobs call them, into memory
+    yield f'export_full_gradient/stops={count}', lambda: write_full_gradient(io.StringIO(), positions, colors), 1
+    yield f'export_png/1200x200/stops={count}', lambda: write_png(io.BytesIO(), positions, colors), 1
+    yield f'export_css/stops={count}', lambda: write_css(io.StringIO(), positions, colors), 1
+    yield f'export_jwf/stops={count}', lambda: write_jwf(io.StringIO(), positions, colors), 1
+
+    # load_gradient minus its dialogs: parse, then replace the edited stops (authored, so never fitted)
+    for suffix, writer in (('json', write_json), ('gradient', write_full_gradient)):
+        path = os.path.join(tmp, f'{count}.{suffix}')
+        with open(path, 'w') as f:
+            writer(f, positions, colors)
+
+        def load(path=path):
+            *stops, sampled = read_gradient(path, return_sampled=True)
+            window.set_gradient(*stops, *read_interpolation(path), sampled)
+        yield f'load_gradient/{suffix}/stops={count}', load, 1
+    use_stops()
+
+    ramp = window.ramp
+    target = QPixmap(ramp.size())
+    yield f'ramp_paint/static/stops={count}', lambda: ramp.render(target), 1
+    state = {'i': 0}
+
+    def drag_frame():
+        state['i'] += 1
+        ramp.selected = window.stops.move(ramp.selected, (state['i'] % 50 + 0.5) / 50)
+        ramp.render(target)
+    yield f'ramp_paint/drag/stops={count}', drag_frame, 1
+
+
+def wheel_cases(app):
+    from PyQt5.QtCore import QPointF
+    from PyQt5.QtGui import QColor, QPixmap
+
+    from main import HSVColorWheel
+    wheel = HSVColorWheel(QColor('#4ecdc4'))
+    wheel.resize(260, 300)
+    target = QPixmap(wheel.size())
+    yield 'wheel_paint/static', lambda: wheel.render(target), 1
+    center, r = wheel._geometry()
+    state = {'i': 0}
+
+    def hue_frame():
+        # Walks all hues, so the triangle raster cache keeps missing
+        state['i'] += 7
+        angle = np.radians(state['i'] % 360)
+        wheel._set_hue_from_pos(QPointF(center.x() + (r - 5) * np.cos(angle), center.y() - (r - 5) * np.sin(angle)))
+        wheel.render(target)
+    yield 'wheel_paint/hue_drag', hue_frame, 1
+
+
+def run(counts, min_time, pattern=None):
+    from PyQt5.QtWidgets import QApplication
+
+    from main import GradientEditorWindow
+    app = QApplication.instance() or QApplication([])
+    window = GradientEditorWindow()
+    window.show()
+    app.processEvents()
+    results = {}
+
+    def record(cases):
+        for name, fn, ops in cases:
+            if pattern and pattern not in name:
+                continue
+            results[name] = measure(fn, min_time, ops)
+            print(f"{name:<44} {results[name]['median_ms']:>10.4f} ms  ({results[name]['runs']} runs)", flush=True)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for count in counts:
+            positions, colors = synthetic_gradient(count)
+            record(engine_cases(count, positions, colors))
+            record(window_cases(app, window, count, positions, colors, tmp))
+    record(wheel_cases(app))
+    window.close()
+    return results
+
+
+def environment():
+    from PyQt5.QtCore import QT_VERSION_STR
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))).stdout.strip()
+    except OSError:
+        commit = ''
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'qt': QT_VERSION_STR,
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'commit': commit,
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+    }
+
+
+def compare(baseline, results, threshold):
+    """Print a comparison table; returns the names of regressed cases."""
+    regressions = []
+    print(f"\n{'case':<44} {'base ms':>10} {'new ms':>10} {'ratio':>7}")
+    for name, new in results.items():
+        old = baseline.get(name)
+        if old is None:
+            continue
+        ratio = new['median_ms'] / old['median_ms'] if old['median_ms'] else float('inf')
+        slower = ratio > 1 + threshold and new['median_ms'] - old['median_ms'] > MIN_DELTA_MS
+        if slower:
+            regressions.append(name)
+        print(f"{name:<44} {old['median_ms']:>10.4f} {new['median_ms']:>10.4f} {ratio:>6.2f}x"
+              + ("  REGRESSION" if slower else ""))
+    missing = sorted(set(baseline) - set(results))
+    if missing:
+        print(f"{len(missing)} baseline case(s) not run")
+    return regressions
+
+
+def load_results(path):
+    with open(path) as f:
+        data = json.load(f)
+    if data.get('version') != RESULTS_VERSION:
+        raise SystemExit(f"{path}: unsupported results version {data.get('version')!r}")
+    return data
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('-o', '--output', help="write results JSON here")
+    parser.add_argument('--baseline', help="results JSON to compare against")
+    parser.add_argument('--results', help="compare this results JSON instead of running the suite")
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help="allowed slowdown of a case's median before it fails (default: 0.25 = 25%%)")
+    parser.add_argument('-k', dest='pattern', help="only run cases whose name contains this text")
+    parser.add_argument('--quick', action='store_true', help="fewer stop counts and shorter timing")
+    args = parser.parse_args(argv)
+
+    if args.results:
+        data = load_results(args.results)
+    else:
+        counts = QUICK_STOP_COUNTS if args.quick else STOP_COUNTS
+        results = run(counts, QUICK_MIN_TIME if args.quick else MIN_TIME, args.pattern)
+        data = {'version': RESULTS_VERSION, 'environment': environment(), 'results': results}
+        if args.output:
+            with open(args.output, 'w') as f:
+                json.dump(data, f, indent=1, sort_keys=True)
+            print(f"results written to {args.output}")
+
+    if args.baseline:
+        regressions = compare(load_results(args.baseline)['results'], data['results'], args.threshold)
+        if regressions:
+            print(f"{len(regressions)} case(s) slower than the baseline by more than {args.threshold:.0%}",
+                  file=sys.stderr)
+            return 1
+        print("no regressions")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,32 @@
+"""Qt-free gradient core shared by the editor and headless tools.
+
+The names below are loaded from their submodules on first access (PEP 562),
+so ``import gradient_core`` stays cheap until something actually needs NumPy.
+"""
+import importlib
+
+_EXPORTS = {
+    'LUTCache': 'cache',
+    'StopStore': 'stops',
+    'build_lut': 'engine',
+    'content_hash': 'cache',
+    'evaluate': 'engine',
+    'lut_cache': 'cache',
+    'pack_rgb': 'engine',
+    'stops_to_arrays': 'engine',
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f'.{module}', __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
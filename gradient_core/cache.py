@@ -0,0 +1,148 @@
+"""Content-addressed LUT cache shared by painting and exporting."""
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from .colorspace import to_space
+from .engine import SPLINE_MODES, build_lut, evaluate, spline_coefficients
+
+
+def content_hash(positions, colors):
+    """Stable hex digest of a gradient's stops, independent of process or run."""
+    positions = np.ascontiguousarray(positions, dtype=np.float64)
+    colors = np.ascontiguousarray(colors, dtype=np.float64)
+    h = hashlib.blake2b(digest_size=16)
+    h.update(np.asarray(colors.shape, dtype=np.int64).tobytes())
+    h.update(positions.tobytes())
+    h.update(colors.tobytes())
+    return h.hexdigest()
+
+
+class LUTCache:
+    """LRU cache of evaluated LUTs bounded by total array bytes.
+
+    Entries are keyed by ``(content hash, mode, space, size, dtype, channels)``
+    so a gradient is only interpolated again when its stops actually change.
+    The stops converted to each color space and the spline coefficients are
+    cached alongside, so a new LUT size or a point query only pays for the
+    per-sample work.
+    ``hits``/``misses`` count LUT lookups only; lookups of the per-stop data
+    are counted in ``prepared_hits``/``prepared_misses``.
+    Returned arrays are read-only because they are shared between consumers.
+    The cache can be shared with worker threads: bookkeeping is locked, while
+    LUTs are computed outside the lock (two threads may both compute a missing
+    entry; the later one wins).
+    """
+
+    def __init__(self, max_bytes=32 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.prepared_hits = 0
+        self.prepared_misses = 0
+        self.evictions = 0
+
+    def get(self, positions, colors, size=512, mode='linear', dtype=np.uint8, channels=None, space='srgb'):
+        digest = content_hash(positions, colors)
+        key = (digest, mode, space, size, np.dtype(dtype).str, channels)
+        lut = self._lookup(key)
+        if lut is None:
+            values, coefficients = self._prepare(digest, positions, colors, mode, space)
+            lut = self._store(key, build_lut(positions, colors, size=size, dtype=dtype, channels=channels,
+                                             mode=mode, coefficients=coefficients, space=space, values=values))
+        return lut
+
+    def evaluate(self, positions, colors, t, mode='linear', space='srgb'):
+        """:func:`~gradient_core.engine.evaluate` using the cached per-stop data."""
+        values, coefficients = self._prepare(content_hash(positions, colors), positions, colors, mode, space)
+        return evaluate(positions, colors, t, mode, coefficients, space, values)
+
+    def coefficients(self, positions, colors, mode, space='srgb'):
+        """Spline coefficients for ``mode`` in ``space``, or None for non-spline modes."""
+        return self._prepare(content_hash(positions, colors), positions, colors, mode, space)[1]
+
+    def _prepare(self, digest, positions, colors, mode, space):
+        # Stops converted to ``space`` and, for splines, their coefficients
+        values = None
+        if space != 'srgb':
+            values = self._lookup((digest, space), prepared=True)
+            if values is None:
+                values = self._store((digest, space), to_space(colors, space))
+        if mode not in SPLINE_MODES:
+            return values, None
+        key = (digest, mode, space)
+        coefficients = self._lookup(key, prepared=True)
+        if coefficients is None:
+            stops = colors if values is None else values
+            coefficients = self._store(key, spline_coefficients(positions, stops, mode))
+        return values, coefficients
+
+    def _lookup(self, key, prepared=False):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                if prepared:
+                    self.prepared_misses += 1
+                else:
+                    self.misses += 1
+            else:
+                if prepared:
+                    self.prepared_hits += 1
+                else:
+                    self.hits += 1
+                self._entries.move_to_end(key)
+            return value
+
+    def _store(self, key, value):
+        value.setflags(write=False)
+        if value.nbytes <= self.max_bytes:
+            with self._lock:
+                previous = self._entries.pop(key, None)
+                if previous is not None:
+                    self._bytes -= previous.nbytes
+                self._entries[key] = value
+                self._bytes += value.nbytes
+                self._evict()
+        return value
+
+    def invalidate(self, digest):
+        """Drop every entry computed from the stops with ``digest``."""
+        with self._lock:
+            stale = [key for key in self._entries if key[0] == digest]
+            for key in stale:
+                self._bytes -= self._entries.pop(key).nbytes
+            return len(stale)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'prepared_hits': self.prepared_hits,
+            'prepared_misses': self.prepared_misses,
+            'evictions': self.evictions,
+            'entries': len(self._entries),
+            'bytes': self._bytes,
+        }
+
+    def _evict(self):
+        while self._bytes > self.max_bytes:
+            _, lut = self._entries.popitem(last=False)
+            self._bytes -= lut.nbytes
+            self.evictions += 1
+
+    def __repr__(self):
+        return 'LUTCache({})'.format(', '.join(f'{k}={v}' for k, v in self.stats().items()))
+
+
+# Process-wide cache used by the editor and the exporters
+lut_cache = LUTCache()
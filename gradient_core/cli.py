@@ -0,0 +1,245 @@
+"""Headless batch conversion of gradient files.
+
+    python -m gradient_core palettes/ -f full -f png -o out/ -j 8
+
+Inputs may be ``.json``/``.gradient`` files, ``.ugr``/``.map`` libraries (every
+entry is converted) or directories containing them. Never imports Qt, so it
+runs on machines without a display.
+"""
+import argparse
+import itertools
+import os
+import re
+import sys
+import time
+
+from .colorspace import COLOR_SPACES
+from .engine import INTERPOLATION_MODES
+from .formats import FULL_GRADIENT_SIZE, LUT_SIZES, SAMPLED_FORMATS, WRITERS, read_gradient, read_interpolation
+from .jobs import atomic_write
+from .library import GradientLibrary
+from .reduce import fit_stops
+
+LIBRARY_SUFFIXES = ('.ugr', '.map')
+INPUT_SUFFIXES = ('.json', '.gradient') + LIBRARY_SUFFIXES
+
+# Libraries opened by this (worker) process, so each index is loaded once
+_libraries = {}
+
+
+def collect_inputs(paths):
+    """Expand inputs into ``(path, entry, label)`` tasks, one per gradient.
+
+    Returns ``(tasks, failures)``; a library that cannot be opened becomes a
+    failure in the ``(name, written, error, fit)`` form of :func:`convert_file`.
+    """
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, names in os.walk(path):
+                files.extend(os.path.join(root, n) for n in sorted(names) if n.lower().endswith(INPUT_SUFFIXES))
+        else:
+            files.append(path)
+    tasks = []
+    failures = []
+    for path in files:
+        if not path.lower().endswith(LIBRARY_SUFFIXES):
+            tasks.append((path, None, None))
+            continue
+        try:
+            # Builds and persists the index once, before workers fan out
+            with GradientLibrary(path) as lib:
+                if lib.is_map:
+                    tasks.append((path, 0, None))
+                else:
+                    tasks.extend((path, i, name) for i, name in enumerate(lib.names))
+        except (OSError, ValueError) as e:
+            failures.append((path, [], f"{type(e).__name__}: {e}", None))
+    return tasks, failures
+
+
+def _task_name(path, entry=None):
+    return path if entry is None else f"{path}[{entry}]"
+
+
+def output_path(path, fmt, out_dir, label=None, entry=None):
+    """Output file for one format; a labelled library entry's name includes its index, as names repeat."""
+    suffix = WRITERS[fmt][0]
+    stem = os.path.basename(path)
+    for ext in INPUT_SUFFIXES:
+        if stem.lower().endswith(ext):
+            stem = stem[:-len(ext)]
+            break
+    if label is not None:
+        stem += f"-{entry:04d}-" + (re.sub(r'[^\w.-]+', '_', label).strip('_') or 'gradient')
+    return os.path.join(out_dir or os.path.dirname(path), stem + suffix)
+
+
+def claim_outputs(tasks, formats, out_dir):
+    """Split tasks into those with outputs of their own and failures for those that would overwrite another's.
+
+    Catches inputs such as ``a.json`` and ``a.gradient`` that map to the same
+    files; failures have the ``(name, written, error, fit)`` form of :func:`convert_file`.
+    """
+    owners = {}
+    claimed = []
+    failures = []
+    for path, entry, label in tasks:
+        name = _task_name(path, entry)
+        dests = [os.path.normcase(os.path.abspath(output_path(path, fmt, out_dir, label, entry))) for fmt in formats]
+        clash = next((owners[dest] for dest in dests if dest in owners), None)
+        if clash is not None:
+            failures.append((name, [], f"outputs would overwrite those of {clash}", None))
+            continue
+        owners.update(dict.fromkeys(dests, name))
+        claimed.append((path, entry, label))
+    return claimed, failures
+
+
+def read_input(path, entry=None):
+    """``(positions, colors, sampled)`` of a file or library entry; library entries are sampled palettes."""
+    if entry is None:
+        return read_gradient(path, return_sampled=True)
+    lib = _libraries.get(path)
+    if lib is None:
+        lib = _libraries[path] = GradientLibrary(path)
+    return lib[entry] + (True,)
+
+
+def convert_file(path, formats, out_dir=None, png_size=(1200, 200), max_error=None, entry=None, label=None,
+                 png_depth=8, mode=None, space=None, size=FULL_GRADIENT_SIZE):
+    """Convert one input; returns ``(name, written, error, fit)`` instead of raising.
+
+    ``entry`` selects a gradient inside a library file, ``label`` names its
+    outputs. ``mode`` and ``space`` override the interpolation recorded in
+    the input; ``size`` is the resolution of the sampled formats. With
+    ``max_error`` set, sampled palettes are fitted with :func:`fit_stops` and
+    ``fit`` is ``(samples, stops, achieved error)``; the fitted stops are
+    linear sRGB, while the full .gradient and LUT outputs still carry the
+    original samples. Authored stops are never fitted.
+    """
+    name = _task_name(path, entry)
+    written = []
+    fit = None
+    try:
+        positions, colors, sampled = read_input(path, entry)
+        recorded = read_interpolation(path) if entry is None else ('linear', 'srgb')
+        mode = mode or recorded[0]
+        space = space or recorded[1]
+        source = None
+        if max_error is not None and sampled and len(positions) > 2:
+            result = fit_stops(positions, colors, max_error)
+            fit = (len(positions), len(result.positions), result.max_error)
+            source = (positions, colors, mode, space)
+            # Fitted stops reproduce the samples under linear sRGB interpolation
+            positions, colors = result.positions, result.colors
+            mode, space = 'linear', 'srgb'
+        for fmt in formats:
+            _, writer, binary = WRITERS[fmt]
+            dest = output_path(path, fmt, out_dir, label, entry)
+            # JSON only holds the stops; every rendered format uses the kernel
+            kwargs = {} if fmt == 'json' else {'mode': mode, 'space': space}
+            if fmt == 'png':
+                kwargs.update(width=png_size[0], height=png_size[1], bit_depth=png_depth)
+            elif fmt in SAMPLED_FORMATS:
+                kwargs.update(size=size, source=source)
+            with atomic_write(dest, binary) as f:
+                writer(f, positions, colors, **kwargs)
+            written.append(dest)
+    except Exception as e:
+        return name, written, f"{type(e).__name__}: {e}", fit
+    return name, written, None, fit
+
+
+def parse_size(text):
+    try:
+        width, height = (int(v) for v in text.lower().split('x'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected WIDTHxHEIGHT, got {text!r}")
+    if width <= 0 or height <= 0:
+        raise argparse.ArgumentTypeError(f"width and height must be positive, got {text!r}")
+    return width, height
+
+
+def lut_size(text):
+    size = int(text)
+    if size < 2:
+        raise argparse.ArgumentTypeError(f"a LUT needs at least 2 entries, got {size}")
+    return size
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='python -m gradient_core', description=__doc__.split('\n\n')[0])
+    parser.add_argument('inputs', nargs='+', help=".json/.gradient/.ugr/.map files or directories")
+    parser.add_argument('-f', '--format', dest='formats', action='append', choices=sorted(WRITERS),
+                        help="output format, may be repeated (default: full)")
+    parser.add_argument('-o', '--output-dir', help="write outputs here instead of next to each input")
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count() or 1,
+                        help="worker processes (default: CPU count, 1 runs in-process)")
+    parser.add_argument('--png-size', type=parse_size, default=(1200, 200), metavar='WxH',
+                        help="PNG export size (default: 1200x200)")
+    parser.add_argument('--png-depth', type=int, choices=(8, 16), default=8,
+                        help="bits per PNG channel (default: 8)")
+    parser.add_argument('--lut-size', type=lut_size, default=FULL_GRADIENT_SIZE, metavar='N',
+                        help=f"entries in full .gradient, .lut and .npy outputs, e.g. "
+                             f"{', '.join(map(str, LUT_SIZES))} (default: {FULL_GRADIENT_SIZE})")
+    parser.add_argument('--interpolation', choices=INTERPOLATION_MODES,
+                        help="interpolation kernel (default: as recorded in each input, else linear)")
+    parser.add_argument('--space', choices=COLOR_SPACES,
+                        help="interpolation color space (default: as recorded in each input, else srgb)")
+    parser.add_argument('--reduce', type=float, metavar='MAX_ERROR',
+                        help="fit sampled palettes with the fewest stops within MAX_ERROR per channel (0-255)")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    formats = args.formats or ['full']
+    tasks, rejected = collect_inputs(args.inputs)
+    if not tasks and not rejected:
+        print("No input files found.", file=sys.stderr)
+        return 1
+    tasks, colliding = claim_outputs(tasks, formats, args.output_dir)
+    rejected += colliding
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+
+    start = time.perf_counter()
+    options = (formats, args.output_dir, args.png_size, args.reduce)
+    extra = (args.png_depth, args.interpolation, args.space, args.lut_size)
+    if args.jobs <= 1:
+        results = (convert_file(path, *options, entry, label, *extra) for path, entry, label in tasks)
+        failed, written, fits = _report(itertools.chain(rejected, results))
+    else:
+        # Deferred: the process pool machinery is a noticeable share of startup
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+        with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+            futures = [pool.submit(convert_file, path, *options, entry, label, *extra)
+                       for path, entry, label in tasks]
+            failed, written, fits = _report(itertools.chain(rejected, (f.result() for f in as_completed(futures))))
+    elapsed = time.perf_counter() - start
+
+    total = len(tasks) + len(rejected)
+    ok = total - failed
+    rate = total / elapsed if elapsed > 0 else float('inf')
+    print(f"{ok}/{total} gradients converted, {failed} failed, {written} outputs written "
+          f"in {elapsed:.2f}s ({rate:.1f} gradients/s)")
+    if fits:
+        samples = sum(f[0] for f in fits)
+        stops = sum(f[1] for f in fits)
+        print(f"Reduced {samples} samples to {stops} stops ({samples / stops:.1f}x), "
+              f"worst error {max(f[2] for f in fits):.2f}")
+    return 1 if failed else 0
+
+
+def _report(results):
+    failed = written = 0
+    fits = []
+    for name, outputs, error, fit in results:
+        written += len(outputs)
+        if fit:
+            fits.append(fit)
+        if error:
+            failed += 1
+            print(f"FAILED {name}: {error}", file=sys.stderr)
+    return failed, written, fits
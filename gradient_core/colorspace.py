@@ -0,0 +1,132 @@
+"""Vectorized color space conversions.
+
+Gradients can be interpolated in gamma-encoded sRGB (the legacy behaviour),
+linear-light RGB, OKLab or its polar form OKLCh. :func:`to_space` and
+:func:`from_space` convert whole (N, C) arrays of 0-255 colors in one pass;
+channels past the third (alpha) pass through untouched.
+"""
+import numpy as np
+
+COLOR_SPACES = ('srgb', 'linear', 'oklab', 'oklch')
+
+# Linear sRGB -> LMS and LMS' -> Lab matrices from Ottosson's OKLab reference.
+# The inverses are derived rather than copied so round trips are exact.
+_RGB_TO_LMS = np.array([[0.4122214708, 0.5363325363, 0.0514459929],
+                        [0.2119034982, 0.6806995451, 0.1073969566],
+                        [0.0883024619, 0.2817188376, 0.6299787005]])
+_LMS_TO_LAB = np.array([[0.2104542553, 0.7936177850, -0.0040720468],
+                        [1.9779984951, -2.4285922050, 0.4505937099],
+                        [0.0259040371, 0.7827717662, -0.8086757660]])
+_LAB_TO_LMS = np.linalg.inv(_LMS_TO_LAB)
+_LMS_TO_RGB = np.linalg.inv(_RGB_TO_LMS)
+# Below this OKLCh chroma a color is gray (8-bit grays reach ~4e-8, other colors ~1e-3)
+ACHROMATIC_CHROMA = 1e-4
+
+
+def hsv_to_rgb(h, s, v):
+    """Convert HSV arrays (all 0-1, hue wraps) to an (..., 3) float RGB array in 0-1."""
+    h, s, v = np.broadcast_arrays(np.asarray(h, dtype=np.float64),
+                                  np.asarray(s, dtype=np.float64),
+                                  np.asarray(v, dtype=np.float64))
+    h6 = (h % 1.0) * 6.0
+    sector = np.floor(h6).astype(np.int8) % 6
+    f = h6 - np.floor(h6)
+    p = v * (1.0 - s)
+    q = v * (1.0 - s * f)
+    t = v * (1.0 - s * (1.0 - f))
+    # (r, g, b) choices for each of the six hue sectors
+    r = np.choose(sector, [v, q, p, p, t, v])
+    g = np.choose(sector, [t, v, v, q, p, p])
+    b = np.choose(sector, [p, p, t, v, v, q])
+    return np.stack([r, g, b], axis=-1)
+
+
+def srgb_to_linear(c):
+    """sRGB transfer function decode; ``c`` in 0-1."""
+    c = np.asarray(c, dtype=np.float64)
+    return np.where(c <= 0.04045, c / 12.92, ((c + 0.055) / 1.055) ** 2.4)
+
+
+def linear_to_srgb(c):
+    """sRGB transfer function encode; ``c`` is clipped to 0-1 first."""
+    c = np.clip(c, 0.0, 1.0)
+    out = 1.055 * c ** (1 / 2.4) - 0.055
+    # Only the few samples in the linear toe need the other branch
+    toe = c <= 0.0031308
+    out[toe] = c[toe] * 12.92
+    return out
+
+
+def _transform(matrix, values):
+    # (3, 3) x (3, N) is several times faster than (N, 3) x (3, 3) in NumPy
+    return (matrix @ values.T).T
+
+
+def linear_to_oklab(rgb):
+    return _transform(_LMS_TO_LAB, np.cbrt(_transform(_RGB_TO_LMS, rgb)))
+
+
+def oklab_to_linear(lab):
+    lms = _transform(_LAB_TO_LMS, lab)
+    return _transform(_LMS_TO_RGB, lms * lms * lms)
+
+
+def oklab_to_oklch(lab):
+    """(L, a, b) -> (L, C, h) with the hue in radians."""
+    return np.stack([lab[..., 0], np.hypot(lab[..., 1], lab[..., 2]), np.arctan2(lab[..., 2], lab[..., 1])], axis=-1)
+
+
+def oklch_to_oklab(lch):
+    return np.stack([lch[..., 0], lch[..., 1] * np.cos(lch[..., 2]), lch[..., 1] * np.sin(lch[..., 2])], axis=-1)
+
+
+def _unwrap_hues(lch):
+    # Gray stops borrow the hue of the nearest colored stop, then consecutive
+    # hues are unwrapped so every segment takes the short way round the circle
+    hue = lch[:, 2]
+    colored = lch[:, 1] > ACHROMATIC_CHROMA
+    lch[~colored, 1] = 0.0
+    if colored.any() and not colored.all():
+        n = len(hue)
+        index = np.arange(n)
+        before = np.maximum.accumulate(np.where(colored, index, -1))
+        after = np.minimum.accumulate(np.where(colored, index, n)[::-1])[::-1]
+        use_after = (before < 0) | ((after < n) & (after - index < index - before))
+        hue = hue[np.where(use_after, after, before)]
+    lch[:, 2] = np.unwrap(hue)
+    return lch
+
+
+def to_space(colors, space):
+    """Convert (N, C) 0-255 colors into ``space`` coordinates for interpolation."""
+    colors = np.asarray(colors, dtype=np.float64)
+    if space == 'srgb':
+        return colors
+    if space not in COLOR_SPACES:
+        raise ValueError(f"unknown color space: {space!r}")
+    values = colors.copy()
+    rgb = srgb_to_linear(colors[:, :3] / 255.0)
+    if space != 'linear':
+        rgb = linear_to_oklab(rgb)
+        if space == 'oklch':
+            rgb = _unwrap_hues(oklab_to_oklch(rgb))
+    values[:, :3] = rgb
+    return values
+
+
+def from_space(values, space):
+    """Inverse of :func:`to_space`: back to 0-255 sRGB, clipped to the gamut."""
+    values = np.asarray(values, dtype=np.float64)
+    if space == 'srgb':
+        return values
+    if space not in COLOR_SPACES:
+        raise ValueError(f"unknown color space: {space!r}")
+    colors = values.copy()
+    rgb = values[:, :3]
+    if space == 'oklch':
+        rgb = oklch_to_oklab(rgb)
+    if space != 'linear':
+        rgb = oklab_to_linear(rgb)
+    # Rounding off conversion noise keeps exact stop colors exact under truncation
+    colors[:, :3] = np.round(linear_to_srgb(rgb) * 255.0, 4)
+    return colors
@@ -0,0 +1,177 @@
+"""Vectorized gradient evaluation.
+
+Everything here works on plain NumPy arrays so it can be shared by the editor,
+the exporters and headless tools without pulling in Qt.
+"""
+import numpy as np
+
+from .colorspace import from_space, to_space
+
+
+def stops_to_arrays(stops):
+    """Convert ``(position, (r, g, b[, a]))`` pairs into sorted arrays.
+
+    Returns ``(positions, colors)`` where ``positions`` is float64 of shape (N,)
+    and ``colors`` is float64 of shape (N, C) with channels in 0-255.
+    """
+    stops = list(stops)
+    if not stops:
+        raise ValueError("a gradient needs at least one stop")
+    positions = np.fromiter((s[0] for s in stops), dtype=np.float64, count=len(stops))
+    colors = np.array([tuple(s[1]) for s in stops], dtype=np.float64)
+    order = np.argsort(positions, kind='stable')
+    return positions[order], colors[order]
+
+
+def _ease_in(f):
+    return f * f
+
+
+def _ease_out(f):
+    return f * (2.0 - f)
+
+
+def _ease_in_out(f):
+    return np.where(f < 0.5, 2.0 * f * f, 1.0 - 2.0 * (1.0 - f) ** 2)
+
+
+# Per-segment easing of the local parameter f in [0, 1]
+EASINGS = {
+    'ease-in': _ease_in,
+    'ease-out': _ease_out,
+    'ease-in-out': _ease_in_out,
+}
+SPLINE_MODES = ('monotone', 'catmull-rom')
+INTERPOLATION_MODES = ('linear',) + tuple(EASINGS) + SPLINE_MODES
+
+
+def _secants(positions, colors):
+    h = np.diff(positions)
+    d = np.divide(np.diff(colors, axis=0), h[:, None], out=np.zeros((len(h), colors.shape[1])),
+                  where=h[:, None] > 0)
+    return h, d
+
+
+def _catmull_rom_tangents(positions, colors, h, d):
+    # Non-uniform Catmull-Rom: central differences, one-sided at the ends
+    m = np.empty_like(colors)
+    m[0], m[-1] = d[0], d[-1]
+    span = (positions[2:] - positions[:-2])[:, None]
+    m[1:-1] = np.divide(colors[2:] - colors[:-2], span, out=np.zeros_like(m[1:-1]), where=span > 0)
+    return m
+
+
+def _monotone_tangents(h, d):
+    # Fritsch-Carlson (PCHIP): weighted harmonic mean of the neighbouring
+    # secants, flat wherever the data turns so no channel overshoots
+    m = np.zeros((len(h) + 1, d.shape[1]))
+    m[0], m[-1] = d[0], d[-1]
+    if len(h) > 1:
+        h0, h1 = h[:-1, None], h[1:, None]
+        d0, d1 = d[:-1], d[1:]
+        w1, w2 = 2.0 * h1 + h0, h1 + 2.0 * h0
+        same = d0 * d1 > 0
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mean = (w1 + w2) / (w1 / d0 + w2 / d1)
+        m[1:-1] = np.where(same, mean, 0.0)
+    return m
+
+
+def spline_coefficients(positions, colors, mode):
+    """Cubic Hermite coefficients per segment for a spline ``mode``.
+
+    ``colors`` are the stop values in whatever space the gradient is
+    interpolated in (see :func:`gradient_core.colorspace.to_space`).
+
+    Returns an (N - 1, 4, C) array; segment i evaluates as
+    ``c0 + c1 f + c2 f^2 + c3 f^3`` over its local parameter f in [0, 1].
+    Computing them is the only per-edit cost of a spline, so callers should
+    keep them (see :meth:`gradient_core.cache.LUTCache.coefficients`).
+    """
+    positions = np.asarray(positions, dtype=np.float64)
+    colors = np.asarray(colors, dtype=np.float64)
+    if mode not in SPLINE_MODES:
+        raise ValueError(f"not a spline interpolation mode: {mode!r}")
+    if len(positions) < 2:
+        return np.zeros((0, 4, colors.shape[1]))
+    h, d = _secants(positions, colors)
+    if mode == 'monotone':
+        m = _monotone_tangents(h, d)
+    else:
+        m = _catmull_rom_tangents(positions, colors, h, d)
+    p0, p1 = colors[:-1], colors[1:]
+    t0, t1 = m[:-1] * h[:, None], m[1:] * h[:, None]
+    return np.stack([p0, t0, 3.0 * (p1 - p0) - 2.0 * t0 - t1, 2.0 * (p0 - p1) + t0 + t1], axis=1)
+
+
+def evaluate(positions, colors, t, mode='linear', coefficients=None, space='srgb', values=None):
+    """Interpolate ``colors`` at the sample points ``t`` with kernel ``mode``.
+
+    ``positions`` must be sorted. Samples outside the stop range clamp to the
+    first/last stop. Interpolation runs in color ``space``; ``values`` (the
+    stops already converted with :func:`~gradient_core.colorspace.to_space`)
+    and spline ``coefficients`` computed from them may be passed in from a
+    cache. Results are clamped to 0-255. Returns a float64 array of shape
+    (len(t), C) in sRGB.
+    """
+    if mode not in INTERPOLATION_MODES:
+        raise ValueError(f"unknown interpolation mode: {mode!r}")
+    positions = np.asarray(positions, dtype=np.float64)
+    colors = np.asarray(colors, dtype=np.float64)
+    t = np.atleast_1d(np.asarray(t, dtype=np.float64))
+    n = len(positions)
+    if n == 1:
+        return np.repeat(colors[:1], len(t), axis=0)
+    if values is None:
+        values = to_space(colors, space)
+    # Index of the stop on the left of every sample, clamped to a valid segment
+    idx = np.searchsorted(positions, t, side='right') - 1
+    np.clip(idx, 0, n - 2, out=idx)
+    left = positions[idx]
+    span = positions[idx + 1] - left
+    f = np.divide(t - left, span, out=np.zeros_like(t), where=span > 0)
+    np.clip(f, 0.0, 1.0, out=f)
+    if mode in SPLINE_MODES:
+        if coefficients is None:
+            coefficients = spline_coefficients(positions, values, mode)
+        c = coefficients[idx]
+        f = f[:, None]
+        out = c[:, 0] + f * (c[:, 1] + f * (c[:, 2] + f * c[:, 3]))
+    else:
+        if mode in EASINGS:
+            f = EASINGS[mode](f)
+        c0 = values[idx]
+        out = c0 + f[:, None] * (values[idx + 1] - c0)
+    out = from_space(out, space)
+    if mode in SPLINE_MODES:
+        # Only splines can overshoot the stop colors
+        np.clip(out, 0.0, 255.0, out=out)
+    # Explicit end clamps: with duplicated end positions the segment search lands on an inner stop
+    out = np.where((t <= positions[0])[:, None], colors[0], out)
+    return np.where((t >= positions[-1])[:, None], colors[-1], out)
+
+
+def build_lut(positions, colors, size=512, dtype=np.uint8, channels=None, mode='linear', coefficients=None,
+              space='srgb', values=None):
+    """Sample the gradient at ``size`` evenly spaced points over [0, 1].
+
+    uint8 LUTs hold 0-255 channels (truncated, matching the legacy exporter);
+    float LUTs are normalized to 0-1. Pass ``channels=4`` to get an RGBA LUT
+    from RGB stops (alpha is opaque). See :func:`evaluate` for the rest.
+    """
+    t = np.linspace(0.0, 1.0, size) if size > 1 else np.zeros(1)
+    lut = evaluate(positions, colors, t, mode, coefficients, space, values)
+    if channels == 4 and lut.shape[1] == 3:
+        lut = np.concatenate([lut, np.full((size, 1), 255.0)], axis=1)
+    elif channels is not None and channels != lut.shape[1]:
+        lut = lut[:, :channels]
+    dtype = np.dtype(dtype)
+    if dtype == np.uint8:
+        return lut.astype(np.uint8)
+    return (lut / 255.0).astype(dtype)
+
+
+def pack_rgb(lut):
+    """Pack a uint8 RGB(A) LUT into ``0xRRGGBB`` integers."""
+    lut = np.asarray(lut, dtype=np.uint32)
+    return (lut[:, 0] << 16) | (lut[:, 1] << 8) | lut[:, 2]
@@ -0,0 +1,274 @@
+"""Readers and writers for the gradient file formats the editor understands.
+
+Stops are passed around as the sorted ``(positions, colors)`` arrays used by
+:mod:`gradient_core.engine`, with colors in 0-255.
+"""
+import json
+from functools import partial
+
+import numpy as np
+
+from .cache import content_hash, lut_cache
+from .colorspace import COLOR_SPACES
+from .engine import INTERPOLATION_MODES, pack_rgb, stops_to_arrays
+from .lutfile import write_lut_file
+from .png import PNGWriter
+
+FULL_GRADIENT_SIZE = 512
+# Resolutions offered for palette and LUT exports; any size >= 2 works
+LUT_SIZES = (256, 512, 1024, 4096, 65536)
+# Binary LUT sample layouts: name -> (dtype, channels)
+LUT_LAYOUTS = {
+    'rgb8': (np.uint8, 3),
+    'rgba8': (np.uint8, 4),
+    'f16': (np.float16, 4),
+    'f32': (np.float32, 4),
+}
+# Non-linear gradients are written to CSS as this many evenly spaced samples
+CSS_SAMPLES = 64
+# Rows (PNG) or palette entries (.gradient) written between progress reports
+PROGRESS_CHUNK = 256
+
+
+def parse_color(value):
+    """Parse ``#rgb``, ``#rrggbb`` or ``#aarrggbb`` into an (r, g, b) tuple."""
+    text = value.strip().lstrip('#')
+    if len(text) == 3:
+        text = ''.join(c * 2 for c in text)
+    elif len(text) == 8:
+        text = text[2:]  # drop alpha, as QColor would for display
+    if len(text) != 6:
+        raise ValueError(f"unsupported color: {value!r}")
+    return tuple(int(text[i:i + 2], 16) for i in (0, 2, 4))
+
+
+def color_name(rgb):
+    """Lowercase ``#rrggbb`` name, matching ``QColor.name()``."""
+    r, g, b = (int(c) for c in rgb[:3])
+    return f'#{r:02x}{g:02x}{b:02x}'
+
+
+def read_json(lines, return_sampled=False):
+    data = json.loads(''.join(lines))
+    stops = stops_to_arrays((stop['position'], parse_color(stop['color'])) for stop in data)
+    return stops + (False,) if return_sampled else stops
+
+
+def read_gradient_lines(lines, return_sampled=False):
+    """Parse the body of a ``.gradient`` file.
+
+    Editor metadata stops (``# pos=... color=...``) win; otherwise fall back to
+    ``index=N color=packed`` lines or the JWildfire ``pos r g b`` format.
+    The interpolation settings are read separately by :func:`read_interpolation`.
+    With ``return_sampled``, a third value says whether the stops came from
+    the sampled fallback rather than authored stops.
+    """
+    stops = []
+    for line in lines:
+        if line.strip().startswith('# pos='):
+            parts = line.strip().split()
+            pos = float(parts[1].split('=')[1])
+            color = parts[2].split('=')[1]
+            stops.append((pos, parse_color(color)))
+    if stops:
+        arrays = stops_to_arrays(stops)
+        return arrays + (False,) if return_sampled else arrays
+    indexed = []
+    for line in lines:
+        parts = line.strip().split()
+        if line.strip().startswith('index=') and 'color=' in line:
+            idx = int(parts[0].split('=')[1])
+            packed = int(parts[1].split('=')[1])
+            indexed.append((idx, ((packed >> 16) & 0xFF, (packed >> 8) & 0xFF, packed & 0xFF)))
+        elif len(parts) == 4 and parts[0].isdigit():
+            # JWildfire simple format: pos r g b
+            stops.append((int(parts[0]) / 255.0, tuple(map(int, parts[1:4]))))
+    if indexed:
+        # Palettes may be exported at any resolution; the last index is position 1
+        last = max(max(idx for idx, _ in indexed), 1)
+        stops.extend((idx / last, color) for idx, color in indexed)
+    if not stops:
+        raise ValueError("No stops found in .gradient file.")
+    arrays = stops_to_arrays(stops)
+    return arrays + (True,) if return_sampled else arrays
+
+
+def read_interpolation(path):
+    """``(mode, space)`` recorded in a ``.gradient`` file's metadata, else ``('linear', 'srgb')``."""
+    mode, space = 'linear', 'srgb'
+    if str(path).endswith('.gradient'):
+        with open(path, 'r') as f:
+            for line in f:
+                if not line.startswith('#'):
+                    if line.strip():
+                        break
+                    continue
+                key, _, value = line[1:].strip().partition('=')
+                if key == 'interpolation' and value in INTERPOLATION_MODES:
+                    mode = value
+                elif key == 'color_space' and value in COLOR_SPACES:
+                    space = value
+    return mode, space
+
+
+def read_gradient(path, return_sampled=False):
+    """Load a ``.json`` or ``.gradient`` file into ``(positions, colors)``.
+
+    With ``return_sampled``, also returns whether the file holds a sampled
+    palette rather than authored stops (see :func:`read_gradient_lines`).
+    """
+    with open(path, 'r') as f:
+        lines = f.readlines()
+    if str(path).endswith('.json'):
+        return read_json(lines, return_sampled)
+    if str(path).endswith('.gradient'):
+        return read_gradient_lines(lines, return_sampled)
+    raise ValueError(f"unsupported gradient file: {path}")
+
+
+def write_json(f, positions, colors):
+    data = [{'position': float(p), 'color': color_name(c)} for p, c in zip(positions, colors)]
+    json.dump(data, f, indent=2)
+
+
+def write_css(f, positions, colors, mode='linear', space='srgb'):
+    # CSS only interpolates linearly in sRGB, so anything else is written as samples
+    if (mode, space) == ('linear', 'srgb'):
+        stops_css = ', '.join(f"{color_name(c)} {int(p * 100)}%" for p, c in zip(positions, colors))
+    else:
+        lut = lut_cache.get(positions, colors, size=CSS_SAMPLES, mode=mode, space=space)
+        stops_css = ', '.join(f"{color_name(c)} {i * 100 / (CSS_SAMPLES - 1):g}%" for i, c in enumerate(lut))
+    f.write(f"background: linear-gradient(90deg, {stops_css});")
+
+
+def write_jwf(f, positions, colors, mode='linear', space='srgb'):
+    f.write("JWFGradient\n")
+    if (mode, space) != ('linear', 'srgb'):
+        # One sample per JWildfire palette slot
+        colors = lut_cache.get(positions, colors, size=256, mode=mode, space=space)
+        positions = np.linspace(0.0, 1.0, 256)
+    for p, c in zip(positions, colors):
+        r, g, b = (int(v) for v in c[:3])
+        f.write(f"{int(p * 255)} {r} {g} {b}\n")
+
+
+def _source_palette(source):
+    """``(positions, colors, mode, space)`` of a ``source`` palette; without a recorded interpolation it is linear sRGB."""
+    positions, colors, *interpolation = source
+    mode, space = interpolation or ('linear', 'srgb')
+    return positions, colors, mode, space
+
+
+def write_full_gradient(f, positions, colors, size=FULL_GRADIENT_SIZE, source=None, mode='linear', space='srgb',
+                        progress=None):
+    """Write editor stops as metadata comments, then the sampled palette.
+
+    ``source`` is an optional full-resolution ``(positions, colors[, mode, space])``
+    palette the stops were fitted from; it is written verbatim when it already
+    has ``size`` samples, so imported palettes round-trip losslessly, and is
+    otherwise resampled with the interpolation it was read with. A non-default
+    ``mode`` or ``space`` is recorded in the metadata for :func:`read_interpolation`.
+    ``progress`` is an optional :class:`~gradient_core.jobs.Progress` (or any
+    callable) called with the fraction written.
+    """
+    f.write("# editor_version=1.0\n")
+    if mode != 'linear':
+        f.write(f"# interpolation={mode}\n")
+    if space != 'srgb':
+        f.write(f"# color_space={space}\n")
+    f.write("# editable_stops:\n")
+    for p, c in zip(positions, colors):
+        f.write(f"# pos={p:.6f} color={color_name(c)}\n")
+    f.write("\ngradient:\n")
+    f.write(' title="CustomGradient" smooth=no\n')
+    if source is not None and len(source[0]) == size:
+        packed = pack_rgb(np.asarray(source[1], dtype=np.uint8))
+    elif source is not None:
+        positions, colors, mode, space = _source_palette(source)
+        packed = pack_rgb(lut_cache.get(positions, colors, size=size, mode=mode, space=space))
+    else:
+        packed = pack_rgb(lut_cache.get(positions, colors, size=size, mode=mode, space=space))
+    packed = packed.tolist()
+    for start in range(0, len(packed), PROGRESS_CHUNK):
+        f.writelines(f" index={i} color={c}\n" for i, c in enumerate(packed[start:start + PROGRESS_CHUNK], start))
+        if progress is not None:
+            progress(min(start + PROGRESS_CHUNK, len(packed)) / len(packed))
+
+
+def gradient_row(positions, colors, width, bit_depth=8, mode='linear', space='srgb'):
+    """One RGBA scanline of the gradient as uint8 (8-bit) or uint16 (16-bit)."""
+    if bit_depth == 16:
+        lut = lut_cache.get(positions, colors, size=width, mode=mode, dtype=np.float64, channels=4, space=space)
+        return np.round(lut * 65535.0).astype(np.uint16)
+    return lut_cache.get(positions, colors, size=width, mode=mode, channels=4, space=space)
+
+
+def write_png(f, positions, colors, width=1200, height=200, bit_depth=8, mode='linear', space='srgb', progress=None):
+    """Stream a ``width`` x ``height`` gradient strip as PNG.
+
+    The image is one LUT row broadcast vertically, so memory use depends only
+    on ``width`` however tall the output is. ``progress`` is called with the
+    fraction of rows written, as in :func:`write_full_gradient`.
+    """
+    row = gradient_row(positions, colors, width, bit_depth, mode, space)
+    with PNGWriter(f, width, height, 4, bit_depth) as writer:
+        for start in range(0, height, PROGRESS_CHUNK):
+            rows = min(PROGRESS_CHUNK, height - start)
+            writer.write_rows(np.broadcast_to(row, (rows,) + row.shape))
+            if progress is not None:
+                progress((start + rows) / height)
+
+
+def lut_samples(positions, colors, size, dtype, channels, source=None, mode='linear', space='srgb'):
+    """``(samples, digest, mode, space)`` for a binary LUT export.
+
+    Samples are uint8 (0-255) or float (0-1) sRGB values. As in
+    :func:`write_full_gradient`, a ``source`` palette is resampled instead of
+    the fitted stops; the digest, mode and space describe what was sampled.
+    """
+    if source is not None:
+        positions, colors, mode, space = _source_palette(source)
+    if np.dtype(dtype) == np.uint8:
+        lut = lut_cache.get(positions, colors, size=size, mode=mode, channels=channels, space=space)
+    else:
+        lut = lut_cache.get(positions, colors, size=size, mode=mode, dtype=np.float64, channels=channels,
+                            space=space).astype(dtype)
+    return lut, content_hash(positions, colors), mode, space
+
+
+def write_lut(f, positions, colors, size=FULL_GRADIENT_SIZE, layout='f32', source=None, mode='linear', space='srgb',
+              progress=None):
+    """Write a ``size``-entry LUT as a headered binary file (see :mod:`gradient_core.lutfile`).
+
+    ``layout`` names one of :data:`LUT_LAYOUTS`; the other arguments are as
+    for :func:`write_full_gradient`.
+    """
+    dtype, channels = LUT_LAYOUTS[layout]
+    lut, digest, mode, space = lut_samples(positions, colors, size, dtype, channels, source, mode, space)
+    write_lut_file(f, lut, space, mode, digest, progress)
+
+
+def write_npy(f, positions, colors, size=FULL_GRADIENT_SIZE, source=None, mode='linear', space='srgb',
+              progress=None):
+    """Write a ``size`` x 4 float32 RGBA LUT as ``.npy``, loadable with ``np.load(path, mmap_mode='r')``."""
+    lut = lut_samples(positions, colors, size, np.float32, 4, source, mode, space)[0]
+    np.lib.format.write_array(f, lut, allow_pickle=False)
+    if progress is not None:
+        progress(1.0)
+
+
+# name -> (file suffix, writer, binary)
+WRITERS = {
+    'json': ('.json', write_json, False),
+    'css': ('.css', write_css, False),
+    'jwf': ('.jwf.gradient', write_jwf, False),
+    'full': ('.full.gradient', write_full_gradient, False),
+    'png': ('.png', write_png, True),
+    'lut-rgb8': ('.rgb8.lut', partial(write_lut, layout='rgb8'), True),
+    'lut-rgba8': ('.rgba8.lut', partial(write_lut, layout='rgba8'), True),
+    'lut-f16': ('.f16.lut', partial(write_lut, layout='f16'), True),
+    'lut-f32': ('.f32.lut', partial(write_lut, layout='f32'), True),
+    'npy': ('.npy', write_npy, True),
+}
+# Formats sampled at a chosen resolution; they keep the original samples of a fitted palette
+SAMPLED_FORMATS = ('full', 'lut-rgb8', 'lut-rgba8', 'lut-f16', 'lut-f32', 'npy')
@@ -0,0 +1,102 @@
+"""Bounded undo/redo history of immutable editor states.
+
+States are opaque to :class:`History` except for their size; the editor
+stores ``(positions, colors, mode, space)`` tuples whose arrays come from
+:meth:`StopStore.snapshot <gradient_core.stops.StopStore.snapshot>`, so
+states with unchanged stops share the same arrays instead of copies.
+"""
+from collections import deque
+
+
+def state_nbytes(state):
+    """Bytes held by the arrays in a state tuple (shared arrays are counted each time)."""
+    return sum(getattr(item, 'nbytes', 0) for item in state)
+
+
+def same_state(a, b):
+    """O(1) check: same array objects and equal plain values."""
+    return len(a) == len(b) and all(x is y if hasattr(x, 'nbytes') else x == y for x, y in zip(a, b))
+
+
+class History:
+    """Linear undo/redo stack around a current state.
+
+    :meth:`record` pushes the previous state and drops the redo branch;
+    :meth:`undo` and :meth:`redo` move one step and return the state to
+    restore, or None at either end. All three are O(1) amortized. Once the
+    states exceed ``max_bytes`` or ``max_entries``, the oldest undo steps
+    are evicted (the current state is always kept).
+    """
+
+    def __init__(self, state=None, max_bytes=64 * 1024 * 1024, max_entries=10000):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._undo = deque()
+        self._redo = []
+        self._bytes = 0
+        self.current = None
+        self.evictions = 0
+        if state is not None:
+            self.reset(state)
+
+    def reset(self, state):
+        """Forget all steps and start again from ``state``."""
+        self._undo.clear()
+        self._redo.clear()
+        self.current = state
+        self._bytes = state_nbytes(state)
+
+    def record(self, state):
+        """Make ``state`` current; returns False when it is the current state already."""
+        if self.current is None:
+            self.reset(state)
+            return True
+        if same_state(state, self.current):
+            return False
+        self._undo.append(self.current)
+        for dropped in self._redo:
+            self._bytes -= state_nbytes(dropped)
+        self._redo.clear()
+        self.current = state
+        self._bytes += state_nbytes(state)
+        self._evict()
+        return True
+
+    def undo(self):
+        if not self._undo:
+            return None
+        self._redo.append(self.current)
+        self.current = self._undo.pop()
+        return self.current
+
+    def redo(self):
+        if not self._redo:
+            return None
+        self._undo.append(self.current)
+        self.current = self._redo.pop()
+        return self.current
+
+    @property
+    def can_undo(self):
+        return bool(self._undo)
+
+    @property
+    def can_redo(self):
+        return bool(self._redo)
+
+    @property
+    def nbytes(self):
+        return self._bytes
+
+    def __len__(self):
+        """Number of states held, including the current one."""
+        return len(self._undo) + len(self._redo) + (self.current is not None)
+
+    def _evict(self):
+        while self._undo and (self._bytes > self.max_bytes or len(self) > self.max_entries):
+            self._bytes -= state_nbytes(self._undo.popleft())
+            self.evictions += 1
+
+    def __repr__(self):
+        return (f'History(undo={len(self._undo)}, redo={len(self._redo)}, bytes={self._bytes}, '
+                f'evictions={self.evictions})')
@@ -0,0 +1,56 @@
+"""Qt-free plumbing for background export jobs: progress, cancellation and atomic writes."""
+import os
+import threading
+from contextlib import contextmanager
+
+
+class Cancelled(Exception):
+    """Raised inside a job once it has been cancelled."""
+
+
+class Progress:
+    """Progress callback and cancellation token handed to long-running writers.
+
+    Writers call it with the fraction done (0-1) at convenient points; the
+    value is passed on to ``callback``. Once :meth:`cancel` has been called,
+    from any thread, the next call raises :class:`Cancelled`.
+    """
+
+    def __init__(self, callback=None):
+        self.callback = callback
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def __call__(self, fraction):
+        if self._cancelled.is_set():
+            raise Cancelled()
+        if self.callback is not None:
+            self.callback(fraction)
+
+
+@contextmanager
+def atomic_write(path, binary=False):
+    """Open a temporary file next to ``path`` and move it into place only on success.
+
+    A failed, cancelled or interrupted write removes the temporary file, so
+    ``path`` is either left untouched or replaced by the complete output.
+    """
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp, 'wb' if binary else 'w') as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
@@ -0,0 +1,144 @@
+"""Lazy access to multi-gradient library files (Apophysis ``.ugr``, Fractint ``.map``).
+
+Opening a library makes a single pass over the memory-mapped file to record
+the byte range of every ``name { ... }`` block. The index is saved next to
+the file as ``<file>.idx`` and reused while the file's size and mtime are
+unchanged. Entries are only decoded when asked for.
+"""
+import json
+import mmap
+import os
+import re
+
+from .engine import stops_to_arrays
+
+INDEX_VERSION = 1
+# Apophysis/UltraFractal gradients have 400 slots
+UGR_SLOTS = 400
+
+_ENTRY_START = re.compile(rb'^[ \t]*([^\r\n{}]*?)[ \t]*\{', re.MULTILINE)
+_UGR_COLOR = re.compile(r'index=(-?\d+)\s+color=(\d+)')
+
+
+def scan_entries(buf):
+    """One pass over ``buf`` returning ``[(name, start, end), ...]`` byte ranges."""
+    entries = []
+    pos = 0
+    while True:
+        match = _ENTRY_START.search(buf, pos)
+        if match is None:
+            break
+        end = buf.find(b'}', match.end())
+        end = len(buf) if end < 0 else end + 1
+        entries.append((match.group(1).decode('latin-1'), match.start(), end))
+        pos = end
+    return entries
+
+
+def parse_ugr_entry(text):
+    """Decode one ``.ugr`` block. Colors are packed as ``0xBBGGRR``."""
+    stops = []
+    for idx, packed in _UGR_COLOR.findall(text):
+        packed = int(packed)
+        stops.append(((int(idx) % UGR_SLOTS) / (UGR_SLOTS - 1),
+                      (packed & 0xFF, (packed >> 8) & 0xFF, (packed >> 16) & 0xFF)))
+    if not stops:
+        raise ValueError("No colors found in gradient entry.")
+    return stops_to_arrays(stops)
+
+
+def parse_map(text):
+    """Decode a Fractint ``.map`` palette: one ``r g b`` line per slot."""
+    colors = []
+    for line in text.splitlines():
+        parts = line.split()
+        if len(parts) >= 3 and all(p.isdigit() for p in parts[:3]):
+            colors.append(tuple(int(p) for p in parts[:3]))
+    if not colors:
+        raise ValueError("No colors found in .map file.")
+    last = max(len(colors) - 1, 1)
+    return stops_to_arrays((i / last, c) for i, c in enumerate(colors))
+
+
+class GradientLibrary:
+    """Read-only, lazily decoded view of a gradient library file.
+
+    ``len(lib)`` and ``lib.names`` come from the index; ``lib[i]`` decodes one
+    entry into ``(positions, colors)``. Use as a context manager or call
+    :meth:`close` to release the memory map.
+    """
+
+    def __init__(self, path, persist_index=True):
+        self.path = os.fspath(path)
+        self._file = open(self.path, 'rb')
+        size = os.fstat(self._file.fileno()).st_size
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b''
+        self.is_map = self.path.lower().endswith('.map')
+        if self.is_map:
+            name = os.path.splitext(os.path.basename(self.path))[0]
+            self._entries = [(name, 0, size)]
+        else:
+            self._entries = self._load_index(persist_index)
+
+    @property
+    def index_path(self):
+        return self.path + '.idx'
+
+    def _stat_key(self):
+        st = os.stat(self.path)
+        return st.st_size, st.st_mtime_ns
+
+    def _load_index(self, persist):
+        size, mtime_ns = self._stat_key()
+        try:
+            with open(self.index_path, 'r') as f:
+                data = json.load(f)
+            if (data.get('version'), data.get('size'), data.get('mtime_ns')) == (INDEX_VERSION, size, mtime_ns):
+                return [tuple(e) for e in data['entries']]
+        except (OSError, ValueError, KeyError):
+            pass
+        entries = scan_entries(self._map)
+        if persist:
+            self._save_index(entries, size, mtime_ns)
+        return entries
+
+    def _save_index(self, entries, size, mtime_ns):
+        data = {'version': INDEX_VERSION, 'size': size, 'mtime_ns': mtime_ns, 'entries': entries}
+        tmp = self.index_path + '.tmp'
+        try:
+            with open(tmp, 'w') as f:
+                json.dump(data, f, separators=(',', ':'))
+            os.replace(tmp, self.index_path)
+        except OSError:
+            # A read-only library still works, it just gets rescanned next time
+            pass
+
+    @property
+    def names(self):
+        return [e[0] for e in self._entries]
+
+    def __len__(self):
+        return len(self._entries)
+
+    def entry_bytes(self, index):
+        _, start, end = self._entries[index]
+        return bytes(self._map[start:end])
+
+    def decode(self, raw):
+        """Parse raw entry bytes (from :meth:`entry_bytes`) into ``(positions, colors)``."""
+        text = raw.decode('latin-1')
+        return parse_map(text) if self.is_map else parse_ugr_entry(text)
+
+    def __getitem__(self, index):
+        return self.decode(self.entry_bytes(index))
+
+    def close(self):
+        if isinstance(self._map, mmap.mmap):
+            self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,80 @@
+"""Binary LUT files that a renderer can memory-map without parsing.
+
+A file is a 64-byte little-endian header followed by ``entries`` x ``channels``
+samples in row-major order, so the samples start 64-byte aligned:
+
+    offset  bytes  field
+         0      8  magic ``b'GRADLUT\\0'``
+         8      2  format version (1)
+        10      1  sample type: 1 = uint8 (0-255), 2 = float16, 3 = float32 (0-1)
+        11      1  channels: 3 (RGB) or 4 (RGBA)
+        12      4  entries (the resolution)
+        16     16  color space the stops were blended in, ASCII, NUL padded
+        32     16  interpolation mode, ASCII, NUL padded
+        48     16  content hash of the stops (:func:`~gradient_core.cache.content_hash`, raw bytes)
+
+Samples are sRGB-encoded whatever the blend space, and alpha is opaque.
+"""
+import struct
+from collections import namedtuple
+
+import numpy as np
+
+MAGIC = b'GRADLUT\0'
+VERSION = 1
+HEADER = struct.Struct('<8sHBBI16s16s16s')
+_SAMPLE_TYPES = {1: np.dtype(np.uint8), 2: np.dtype('<f2'), 3: np.dtype('<f4')}
+_SAMPLE_CODES = {dtype: code for code, dtype in _SAMPLE_TYPES.items()}
+# Samples written between progress reports
+PROGRESS_ENTRIES = 16384
+
+LUTHeader = namedtuple('LUTHeader', 'entries channels dtype space mode digest')
+
+
+def write_lut_file(f, lut, space, mode, digest, progress=None):
+    """Write an (N, 3|4) uint8, float16 or float32 ``lut`` with its header to the binary file ``f``.
+
+    ``digest`` is the hex content hash of the stops the LUT was built from.
+    """
+    lut = np.asarray(lut)
+    dtype = lut.dtype.newbyteorder('<')
+    if dtype not in _SAMPLE_CODES:
+        raise ValueError(f"unsupported sample type: {lut.dtype}")
+    if lut.ndim != 2 or lut.shape[1] not in (3, 4):
+        raise ValueError(f"expected an (N, 3|4) LUT, got shape {lut.shape}")
+    f.write(HEADER.pack(MAGIC, VERSION, _SAMPLE_CODES[dtype], lut.shape[1], len(lut), space.encode('ascii'),
+                        mode.encode('ascii'), bytes.fromhex(digest)))
+    data = np.ascontiguousarray(lut, dtype=dtype)
+    for start in range(0, len(data), PROGRESS_ENTRIES):
+        f.write(data[start:start + PROGRESS_ENTRIES].tobytes())
+        if progress is not None:
+            progress(min(start + PROGRESS_ENTRIES, len(data)) / len(data))
+
+
+def read_lut_header(f):
+    """Parse the header at the start of the binary file ``f``."""
+    raw = f.read(HEADER.size)
+    if len(raw) != HEADER.size:
+        raise ValueError("truncated LUT header")
+    magic, version, code, channels, entries, space, mode, digest = HEADER.unpack(raw)
+    if magic != MAGIC:
+        raise ValueError("not a gradient LUT file")
+    if version != VERSION:
+        raise ValueError(f"unsupported LUT file version: {version}")
+    if code not in _SAMPLE_TYPES or channels not in (3, 4):
+        raise ValueError("corrupt LUT header")
+    return LUTHeader(entries, channels, _SAMPLE_TYPES[code], space.rstrip(b'\0').decode('ascii'),
+                     mode.rstrip(b'\0').decode('ascii'), digest.hex())
+
+
+def read_lut_file(path, mmap=True):
+    """``(header, samples)`` of a LUT file; the samples are a read-only memory map unless ``mmap`` is False."""
+    with open(path, 'rb') as f:
+        header = read_lut_header(f)
+        shape = (header.entries, header.channels)
+        if not mmap:
+            samples = np.fromfile(f, dtype=header.dtype, count=shape[0] * shape[1])
+            if samples.size != shape[0] * shape[1]:
+                raise ValueError("truncated LUT file")
+            return header, samples.reshape(shape)
+    return header, np.memmap(path, dtype=header.dtype, mode='r', offset=HEADER.size, shape=shape)
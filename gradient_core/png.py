@@ -0,0 +1,131 @@
+"""Minimal PNG encoder so headless tools can write images without Qt.
+
+:class:`PNGWriter` streams scanlines straight into the file, so the image
+never has to exist in memory as a whole. A row identical to the one above
+is stored with the Up filter (all zero bytes); long runs of those are
+emitted as a pre-compressed tile, so vertically constant images such as
+gradient strips cost about one row of work however tall they are.
+"""
+import struct
+import zlib
+
+import numpy as np
+
+_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+_COLOR_TYPES = {3: 2, 4: 6}  # channels -> PNG color type (RGB, RGBA)
+_DTYPES = {8: np.dtype(np.uint8), 16: np.dtype('>u2')}
+IDAT_CHUNK_SIZE = 1 << 20
+# Repeated rows per pre-compressed tile
+REPEAT_TILE = 64
+
+
+def _chunk(tag, data):
+    return struct.pack('>I', len(data)) + tag + data + struct.pack('>I', zlib.crc32(tag + data) & 0xFFFFFFFF)
+
+
+class PNGWriter:
+    """Incremental PNG writer: feed rows with :meth:`write_rows`, then :meth:`close`.
+
+    ``bit_depth`` is 8 or 16; rows are converted to uint8 or big-endian
+    uint16 as needed. Compressed data is flushed to ``f`` in IDAT chunks of
+    about :data:`IDAT_CHUNK_SIZE` bytes.
+    """
+
+    def __init__(self, f, width, height, channels=4, bit_depth=8, compress_level=6):
+        if channels not in _COLOR_TYPES:
+            raise ValueError(f"unsupported channel count: {channels}")
+        if bit_depth not in _DTYPES:
+            raise ValueError(f"unsupported bit depth: {bit_depth}")
+        self.f = f
+        self.width, self.height, self.channels = width, height, channels
+        self.dtype = _DTYPES[bit_depth]
+        self.rows_written = 0
+        self.compress_level = compress_level
+        # Raw deflate with a hand-written zlib header/trailer, so cached tiles can be spliced in
+        self._compressor = zlib.compressobj(compress_level, zlib.DEFLATED, -zlib.MAX_WBITS)
+        self._adler = 1
+        self._pending = []
+        self._pending_size = 0
+        self._previous = None
+        self._repeats = 0
+        self._tile = None
+        self._up_row = b'\x02' + bytes(width * channels * self.dtype.itemsize)
+        f.write(_SIGNATURE)
+        f.write(_chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, bit_depth, _COLOR_TYPES[channels], 0, 0, 0)))
+        self._push(b'\x78\x9c')
+
+    def write_rows(self, rows):
+        """Append an (N, W, C) block of scanlines (any view, e.g. a broadcast row)."""
+        rows = np.asarray(rows)
+        if rows.shape[1:] != (self.width, self.channels):
+            raise ValueError(f"expected rows of shape (N, {self.width}, {self.channels}), got {rows.shape}")
+        if self.rows_written + len(rows) > self.height:
+            raise ValueError("more rows than the image height")
+        for row in rows:
+            data = row.astype(self.dtype, copy=False).tobytes()
+            # Filter type 2 (Up) with a zero delta repeats the previous row
+            if data == self._previous:
+                self._repeats += 1
+                continue
+            self._flush_repeats()
+            line = b'\x00' + data
+            self._adler = zlib.adler32(line, self._adler)
+            self._push(self._compressor.compress(line))
+            self._previous = data
+        self.rows_written += len(rows)
+
+    def _flush_repeats(self):
+        tiles, rest = divmod(self._repeats, REPEAT_TILE)
+        if tiles:
+            if self._tile is None:
+                # Compressed from an empty dictionary and full-flushed, so it is valid anywhere
+                # after a full flush of the main stream
+                compressor = zlib.compressobj(self.compress_level, zlib.DEFLATED, -zlib.MAX_WBITS)
+                tile = [compressor.compress(self._up_row) for _ in range(REPEAT_TILE)]
+                tile.append(compressor.flush(zlib.Z_FULL_FLUSH))
+                self._tile = b''.join(tile)
+            self._push(self._compressor.flush(zlib.Z_FULL_FLUSH))
+            for _ in range(tiles):
+                self._push(self._tile)
+        for _ in range(rest):
+            self._push(self._compressor.compress(self._up_row))
+        for _ in range(self._repeats):
+            self._adler = zlib.adler32(self._up_row, self._adler)
+        self._repeats = 0
+
+    def _push(self, data):
+        if data:
+            self._pending.append(data)
+            self._pending_size += len(data)
+        if self._pending_size >= IDAT_CHUNK_SIZE:
+            self._flush_idat()
+
+    def _flush_idat(self):
+        if self._pending:
+            self.f.write(_chunk(b'IDAT', b''.join(self._pending)))
+            self._pending = []
+            self._pending_size = 0
+
+    def close(self):
+        if self.rows_written != self.height:
+            raise ValueError(f"wrote {self.rows_written} of {self.height} rows")
+        self._flush_repeats()
+        self._push(self._compressor.flush())
+        self._push(struct.pack('>I', self._adler & 0xFFFFFFFF))
+        self._flush_idat()
+        self.f.write(_chunk(b'IEND', b''))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        if exc_type is None:
+            self.close()
+
+
+def write_png(f, pixels, compress_level=6, bit_depth=8):
+    """Write an (H, W, 3|4) array to the binary file object ``f``."""
+    pixels = np.asarray(pixels)
+    height, width, channels = pixels.shape
+    with PNGWriter(f, width, height, channels, bit_depth, compress_level) as writer:
+        writer.write_rows(pixels)
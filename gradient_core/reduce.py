@@ -0,0 +1,121 @@
+"""Fit sampled palettes with the fewest stops that stay within an error bound."""
+from collections import namedtuple
+
+import numpy as np
+
+from .engine import evaluate
+
+StopFit = namedtuple('StopFit', 'positions colors max_error ratio')
+
+
+# Segments up to this many samples long are tested for every start point at once
+BAND_DEPTH = 256
+
+
+def _band(x, y, tolerance, depth):
+    """Which of the next ``depth`` samples every start point reaches, for all starts at once.
+
+    ``y`` holds one channel per row. A segment from sample i to j is valid if
+    its slope lies inside the slope window allowed by every sample strictly
+    between them, so the window is a running max/min over the samples after
+    i. The window only shrinks, so a start is dropped once it empties.
+    Returns ``(ok, rows, lo, hi)``: ``ok[i, d - 1]`` says whether samples
+    i..i + d can be one segment; starts in ``rows`` may reach further, and
+    the matching columns of ``lo``/``hi`` are their windows so far.
+    """
+    n = len(x)
+    ok = np.zeros((n - 1, depth), dtype=bool)
+    rows = np.arange(n - 1)
+    lo = np.full((len(y), n - 1), -np.inf)
+    hi = np.full((len(y), n - 1), np.inf)
+    for d in range(1, depth + 1):
+        # rows is ascending, so the starts that still have a sample d later are a prefix
+        count = np.searchsorted(rows, n - d)
+        rows, lo, hi = rows[:count], lo[:, :count], hi[:, :count]
+        if not count:
+            break
+        j = rows + d
+        inv_dx = 1.0 / (x[j] - x[rows])
+        dy = y[:, j] - y[:, rows]
+        slope = dy * inv_dx
+        ok[rows, d - 1] = ((slope >= lo) & (slope <= hi)).all(axis=0)
+        np.maximum(lo, (dy - tolerance) * inv_dx, out=lo)
+        np.minimum(hi, (dy + tolerance) * inv_dx, out=hi)
+        alive = (lo <= hi).all(axis=0)
+        if not alive.all():
+            rows, lo, hi = rows[alive], lo[:, alive], hi[:, alive]
+    return ok, rows, lo, hi
+
+
+def _reachable(x, y, i, tolerance, start, lo_run, hi_run):
+    """Continue one start's scan from sample ``start`` with its ``(C, 1)`` window so far.
+
+    Returns the mask over ``start..``, cut in the block where the window empties.
+    """
+    masks = []
+    block = max(start - i, 16)
+    while start < len(x):
+        stop = min(start + block, len(x))
+        inv_dx = 1.0 / (x[start:stop] - x[i])
+        dy = y[:, start:stop] - y[:, i:i + 1]
+        slope = dy * inv_dx
+        lo = np.maximum.accumulate((dy - tolerance) * inv_dx, axis=1)
+        hi = np.minimum.accumulate((dy + tolerance) * inv_dx, axis=1)
+        np.maximum(lo, lo_run, out=lo)
+        np.minimum(hi, hi_run, out=hi)
+        # Sample start + k is bounded by the window over the samples before it
+        first = (slope[:, :1] >= lo_run) & (slope[:, :1] <= hi_run)
+        rest = (slope[:, 1:] >= lo[:, :-1]) & (slope[:, 1:] <= hi[:, :-1])
+        masks.append(np.concatenate([first, rest], axis=1).all(axis=0))
+        lo_run, hi_run = lo[:, -1:], hi[:, -1:]
+        if np.any(lo_run > hi_run):
+            break
+        start = stop
+        block *= 2
+    return np.concatenate(masks) if masks else np.zeros(0, dtype=bool)
+
+
+def fit_stops(positions, colors, max_error=1.0):
+    """Pick the minimum number of samples whose linear interpolation reproduces
+    every sample within ``max_error`` per channel (0-255 units).
+
+    Dynamic programming over the samples. Reachability is computed for all
+    start points together, and each start's scan ends where no longer segment
+    can fit; starts that cannot shorten the best fit found so far are
+    skipped. Returns a :class:`StopFit` with the kept stops, the achieved max
+    error and the compression ratio (samples per kept stop).
+    """
+    x, first = np.unique(np.asarray(positions, dtype=np.float64), return_index=True)
+    y = np.asarray(colors, dtype=np.float64)[first]
+    n = len(x)
+    if n <= 2:
+        return StopFit(x, y, 0.0, 1.0)
+    tolerance = max_error + 1e-9
+    channels = np.ascontiguousarray(y.T)
+    depth = min(BAND_DEPTH, n - 1)
+    band, open_rows, open_lo, open_hi = _band(x, channels, tolerance, depth)
+    open_rows = {row: k for k, row in enumerate(open_rows.tolist())}
+    cost = np.full(n, np.iinfo(np.int64).max)
+    parent = np.zeros(n, dtype=np.int64)
+    cost[0] = 0
+    for i in range(n - 1):
+        # Unreached starts, or ones whose segments cannot beat the fit already found
+        if cost[i] >= cost[-1] - 1:
+            continue
+        candidates = cost[i] + 1
+        reachable = band[i, :n - 1 - i]
+        k = open_rows.get(i)
+        if k is not None:
+            more = _reachable(x, channels, i, tolerance, i + 1 + depth, open_lo[:, k:k + 1], open_hi[:, k:k + 1])
+            reachable = np.concatenate([reachable, more])
+        end = i + 1 + len(reachable)
+        improve = reachable & (candidates < cost[i + 1:end])
+        cost[i + 1:end][improve] = candidates
+        parent[i + 1:end][improve] = i
+    keep = [n - 1]
+    while keep[-1] != 0:
+        keep.append(parent[keep[-1]])
+    keep.reverse()
+    fx, fy = x[keep], y[keep]
+    error = float(np.abs(evaluate(fx, fy, x) - y).max())
+    return StopFit(fx, fy, error, n / len(keep))
@@ -0,0 +1,284 @@
+"""Gradient stops kept sorted by position.
+
+:class:`StopStore` holds the stops as NumPy arrays (float64 positions, uint8
+or float32 RGBA colors) and hands out small :class:`StopView` objects only
+when a single stop is asked for.
+"""
+import numpy as np
+
+from .engine import stops_to_arrays
+
+
+class StopView:
+    """A stop inside a :class:`StopStore`, with ``position`` and ``color`` attributes.
+
+    Setting ``position`` moves the stop through :meth:`StopStore.move` and the
+    view follows it. Views from before a structural change (add, delete,
+    replace) may point at a different stop afterwards.
+    """
+    __slots__ = ('_store', '_index')
+
+    def __init__(self, store, index):
+        self._store = store
+        self._index = index
+
+    @property
+    def index(self):
+        return self._index
+
+    @property
+    def position(self):
+        return float(self._store._positions[self._index])
+
+    @position.setter
+    def position(self, value):
+        self._index = self._store.move(self._index, value)
+
+    @property
+    def color(self):
+        """``(r, g, b)`` as ints in 0-255."""
+        return tuple(int(round(c)) for c in self._store._colors[self._index, :3].tolist())
+
+    @color.setter
+    def color(self, value):
+        self._store.set_color(self._index, value)
+
+    @property
+    def alpha(self):
+        return float(self._store._colors[self._index, 3])
+
+    def __repr__(self):
+        return f'StopView({self.position!r}, {self.color!r})'
+
+
+class StopStore:
+    """Stops as a struct of arrays kept sorted by position.
+
+    Positions are float64 of shape (N,), colors are RGBA of shape (N, 4) in
+    0-255, stored as uint8 (4 bytes a stop) or float32 for unquantized colors.
+    Batch operations work on the arrays directly; indexing returns a
+    :class:`StopView`. Equal positions keep their insertion order.
+
+    The ``positions`` and ``colors`` properties are read-only views of the
+    live arrays; change stops through the methods so :meth:`arrays` stays
+    current. :meth:`snapshot` shares the arrays copy-on-write, each on its
+    own, so keeping many snapshots only costs memory for the arrays that edits
+    actually changed: a color edit copies the colors but not the positions.
+    """
+
+    def __init__(self, positions=(), colors=(), dtype=np.uint8):
+        self.dtype = np.dtype(dtype)
+        self._positions = np.empty(0, dtype=np.float64)
+        self._colors = np.empty((0, 4), dtype=self.dtype)
+        self._version = 0
+        self._arrays = None
+        # True while an array is shared with a snapshot and must be copied before writing
+        self._positions_shared = self._colors_shared = False
+        if len(positions):
+            self.replace(positions, colors)
+
+    @classmethod
+    def from_stops(cls, stops, dtype=np.uint8):
+        """Build a store from ``(position, color)`` pairs or objects with those attributes."""
+        pairs = [(s.position, s.color) if hasattr(s, 'position') else s for s in stops]
+        if not pairs:
+            return cls(dtype=dtype)
+        return cls(*stops_to_arrays(pairs), dtype=dtype)
+
+    def _rgba(self, colors):
+        colors = np.asarray(colors, dtype=np.float64).reshape(-1, np.shape(colors)[-1])
+        if colors.shape[1] not in (3, 4):
+            raise ValueError(f"expected RGB or RGBA colors, got {colors.shape[1]} channels")
+        rgba = np.full((len(colors), 4), 255.0)
+        rgba[:, :colors.shape[1]] = colors
+        np.clip(rgba, 0, 255, out=rgba)
+        return np.rint(rgba).astype(self.dtype) if self.dtype.kind == 'u' else rgba.astype(self.dtype)
+
+    def _changed(self):
+        self._version += 1
+        self._arrays = None
+
+    def _set(self, positions, colors):
+        # Structural edits build fresh arrays, which nothing else shares yet
+        self._positions, self._colors = positions, colors
+        self._positions_shared = self._colors_shared = False
+        self._changed()
+
+    def _own_positions(self):
+        if self._positions_shared:
+            self._positions = self._positions.copy()
+            self._positions_shared = False
+
+    def _own_colors(self):
+        if self._colors_shared:
+            self._colors = self._colors.copy()
+            self._colors_shared = False
+
+    def snapshot(self):
+        """The current ``(positions, colors)`` as read-only arrays, without copying.
+
+        The store copies them before its next in-place edit, so two snapshots
+        taken with no change in between are the very same objects.
+        """
+        self._positions.flags.writeable = False
+        self._colors.flags.writeable = False
+        self._positions_shared = self._colors_shared = True
+        return self._positions, self._colors
+
+    def restore(self, snapshot):
+        """Make a :meth:`snapshot` the current stops again, sharing its arrays."""
+        self._positions, self._colors = snapshot
+        self._positions_shared = self._colors_shared = True
+        self._changed()
+
+    def __len__(self):
+        return len(self._positions)
+
+    def __iter__(self):
+        return (StopView(self, i) for i in range(len(self)))
+
+    def __getitem__(self, index):
+        n = len(self)
+        index = index.__index__()
+        if index < 0:
+            index += n
+        if not 0 <= index < n:
+            raise IndexError("stop index out of range")
+        return StopView(self, index)
+
+    def __delitem__(self, index):
+        self.delete_many([index])
+
+    def __repr__(self):
+        return f'StopStore({len(self)} stops, {self.dtype})'
+
+    @property
+    def positions(self):
+        view = self._positions.view()
+        view.flags.writeable = False
+        return view
+
+    @property
+    def colors(self):
+        view = self._colors.view()
+        view.flags.writeable = False
+        return view
+
+    @property
+    def version(self):
+        """Counter bumped by every change, for cheap change detection."""
+        return self._version
+
+    @property
+    def nbytes(self):
+        return self._positions.nbytes + self._colors.nbytes
+
+    def arrays(self, channels=3):
+        """``(positions, colors)`` as float64 copies for the engine, cached until the next change.
+
+        The cached arrays are read-only and shared between callers.
+        """
+        if self._arrays is None:
+            self._arrays = {}
+        cached = self._arrays.get(channels)
+        if cached is None:
+            positions = self._positions.copy()
+            colors = self._colors[:, :channels].astype(np.float64)
+            positions.flags.writeable = colors.flags.writeable = False
+            cached = self._arrays[channels] = (positions, colors)
+        return cached
+
+    def replace(self, positions, colors):
+        """Replace every stop; the input does not need to be sorted."""
+        positions = np.asarray(positions, dtype=np.float64).reshape(-1)
+        colors = self._rgba(colors)
+        if len(colors) != len(positions):
+            raise ValueError("positions and colors differ in length")
+        order = np.argsort(positions, kind='stable')
+        self._set(positions[order], colors[order])
+
+    def clear(self):
+        self._set(self._positions[:0].copy(), self._colors[:0].copy())
+
+    def add(self, position, color):
+        """Insert one stop in order; returns its index."""
+        index = int(np.searchsorted(self._positions, position, side='right'))
+        self._set(np.insert(self._positions, index, position),
+                  np.insert(self._colors, index, self._rgba(color)[0], axis=0))
+        return index
+
+    def extend(self, positions, colors):
+        """Bulk insert: one stable merge instead of repeated insertion."""
+        self.replace(np.concatenate([self._positions, np.asarray(positions, dtype=np.float64).reshape(-1)]),
+                     np.concatenate([self._colors.astype(np.float64), self._rgba(colors).astype(np.float64)]))
+
+    def delete_many(self, indices):
+        """Bulk delete the stops at ``indices``."""
+        keep = np.ones(len(self), dtype=bool)
+        keep[np.asarray(indices, dtype=np.intp)] = False
+        self._set(self._positions[keep], self._colors[keep])
+
+    def sort(self):
+        order = np.argsort(self._positions, kind='stable')
+        self._set(self._positions[order], self._colors[order])
+
+    def transform(self, positions=None, colors=None):
+        """Apply vectorized functions to all positions and/or colors, then re-sort.
+
+        ``positions`` maps a float64 (N,) array to new positions (e.g.
+        ``lambda p: 1 - p`` mirrors the gradient); ``colors`` maps a float64
+        (N, 4) RGBA array to new colors.
+        """
+        new_positions = self._positions if positions is None else positions(self._positions.copy())
+        new_colors = self._colors.astype(np.float64) if colors is None else colors(self._colors.astype(np.float64))
+        self.replace(new_positions, new_colors)
+
+    def set_color(self, index, color):
+        """Set an RGB or RGBA color; RGB keeps the stop's alpha."""
+        rgba = self._rgba(color)[0]
+        if len(color) == 3:
+            rgba[3] = self._colors[index, 3]
+        self._own_colors()
+        self._colors[index] = rgba
+        self._changed()
+
+    def move(self, index, position):
+        """Move the stop at ``index`` to ``position``; returns its new index.
+
+        Only the stops between the old and new index are shifted, and the
+        colors are left alone (and shared) unless the stop changes places.
+        """
+        self._own_positions()
+        p = self._positions
+        # Insertion point among the other stops, after any equal positions; the
+        # count of stops <= position includes the moving stop itself when it lies below
+        new = int(p.searchsorted(position, side='right'))
+        if new > index:
+            new -= 1
+        if new != index:
+            self._own_colors()
+            c = self._colors
+            color = c[index].copy()
+            if new < index:
+                p[new + 1:index + 1] = p[new:index]
+                c[new + 1:index + 1] = c[new:index]
+            else:
+                p[index:new] = p[index + 1:new + 1]
+                c[index:new] = c[index + 1:new + 1]
+            c[new] = color
+        p[new] = position
+        self._changed()
+        return new
+
+    def hit_test(self, position, tolerance):
+        """Index of the stop nearest ``position`` and closer than ``tolerance``, or None."""
+        p = self._positions
+        i = int(p.searchsorted(position))
+        # Only the neighbours of the insertion point can be nearest
+        best, best_distance = None, tolerance
+        for j in (i - 1, i):
+            if 0 <= j < len(p):
+                distance = abs(p.item(j) - position)
+                if distance < best_distance:
+                    best, best_distance = j, distance
+        return best
@@ -0,0 +1,102 @@
+"""Event-loop stall watchdog: logs the main thread's stack when the UI stops ticking.
+
+The GUI thread calls :meth:`StallWatchdog.tick` from a repeating timer every
+``interval`` seconds. A background thread checks how late the next tick is;
+once it is more than ``budget`` late, the main thread's current Python stack
+is taken from :func:`sys._current_frames` and appended to a rotating log,
+followed by the stall's total length once the ticks resume.
+"""
+import os
+import sys
+import threading
+import time
+import traceback
+
+# Environment variable enabling the watchdog in the editor; its value is the budget in ms
+WATCHDOG_ENV = 'GRADIENT_WATCHDOG'
+DEFAULT_BUDGET_MS = 50
+LOG_MAX_BYTES = 1 << 20
+LOG_BACKUPS = 3
+
+
+def stall_logger(path, max_bytes=LOG_MAX_BYTES, backups=LOG_BACKUPS):
+    """A logger appending to ``path``, rotated at ``max_bytes`` with ``backups`` old files kept."""
+    import logging.handlers  # only paid for when the watchdog is enabled
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    logger = logging.getLogger(f'{__name__}.{os.path.abspath(path)}')
+    if not logger.handlers:
+        handler = logging.handlers.RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backups,
+                                                       encoding='utf-8')
+        handler.setFormatter(logging.Formatter('%(asctime)s %(message)s'))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+    return logger
+
+
+class StallWatchdog:
+    """Watches the thread that created it (normally the GUI thread) for missed ticks.
+
+    ``budget`` and ``interval`` are in seconds. ``logger`` receives one
+    warning with the stack per stall and an info line when it ends;
+    ``stalls`` counts the stalls seen so far.
+    """
+
+    def __init__(self, logger, budget=DEFAULT_BUDGET_MS / 1e3, interval=None):
+        self.logger = logger
+        self.budget = budget
+        self.interval = interval if interval is not None else budget / 2
+        self.stalls = 0
+        self._thread_id = threading.get_ident()
+        self._last_tick = time.perf_counter()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def tick(self):
+        self._last_tick = time.perf_counter()
+
+    def start(self):
+        self.tick()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._watch, name='stall-watchdog', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _watch(self):
+        poll = max(self.budget / 4, 0.005)
+        stalled_since = None
+        while not self._stop.wait(poll):
+            last = self._last_tick
+            if stalled_since is not None and last + self.interval != stalled_since:
+                self.logger.info(f"stall ended: tick came {(last - stalled_since) * 1e3:.0f} ms late")
+                stalled_since = None
+            late = time.perf_counter() - last - self.interval
+            if late > self.budget and stalled_since is None:
+                # The tick due at last + interval is missing; one report per stall
+                stalled_since = last + self.interval
+                self.stalls += 1
+                self._report(late)
+
+    def _report(self, late):
+        frame = sys._current_frames().get(self._thread_id)
+        stack = ''.join(traceback.format_stack(frame)) if frame is not None else "  (no Python frame)\n"
+        del frame
+        self.logger.warning(f"event loop stalled: tick {late * 1e3:.0f} ms overdue "
+                            f"(budget {self.budget * 1e3:.0f} ms); main thread stack, innermost last:\n"
+                            f"{stack.rstrip()}")
+
+
+def budget_from_env(environ=os.environ):
+    """The stall budget in ms requested through :data:`WATCHDOG_ENV`, or None when it is off."""
+    value = environ.get(WATCHDOG_ENV, '').strip()
+    if value.lower() in ('', '0', 'false', 'no', 'off'):
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return DEFAULT_BUDGET_MS
@@ -1,31 +1,96 @@
 import sys
-import platform
-import ctypes
+import os
+import hashlib
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QSlider, QColorDialog,
-    QComboBox, QFileDialog, QMessageBox, QFrame, QSizeGrip, QGraphicsDropShadowEffect
+    QComboBox, QFileDialog, QMessageBox, QFrame, QSizeGrip, QListView, QAction,
+    QProgressDialog
+)
+from PyQt5.QtGui import (
+    QPainter, QColor, QMouseEvent, QFont, QPalette, QBrush, QPen, QImage, QTransform, QPixmap, QPolygonF, QRegion,
+    QKeySequence
+)
+from PyQt5.QtCore import (
+    Qt, QObject, QRectF, QPointF, QSize, QTimer, pyqtSignal, QAbstractListModel, QModelIndex, QRunnable,
+    QThreadPool, QStandardPaths
 )
-from PyQt5.QtGui import QPainter, QColor, QLinearGradient, QMouseEvent, QFont, QPalette, QBrush, QPen
-from PyQt5.QtCore import Qt, QRectF, QPointF, QSize, QTimer, pyqtSignal
-import json
 import math
+from collections import OrderedDict
+from functools import lru_cache
+import numpy as np
+from gradient_core import build_lut
+from gradient_core.cache import content_hash, lut_cache
+from gradient_core.colorspace import hsv_to_rgb
+from gradient_core.history import History
+from gradient_core.jobs import Cancelled, Progress, atomic_write
+from gradient_core.reduce import fit_stops
+from gradient_core.stops import StopStore
+from gradient_core.formats import FULL_GRADIENT_SIZE, LUT_SIZES, WRITERS, parse_color, read_gradient, \
+    read_interpolation, write_css, write_json, write_jwf, write_png as write_png_file
+from gradient_core.library import GradientLibrary
+from gradient_core.profiling import DEFAULT_TRACE_PATH, Profiler, trace_path_from_env
+from gradient_core.watchdog import DEFAULT_BUDGET_MS, StallWatchdog, budget_from_env, stall_logger
+from gradient_core.png import write_png
+
+# Sampled palettes with more stops than this are fitted on import
+IMPORT_REDUCE_MIN_STOPS = 32
+# Larger palettes load unfitted, as the fit runs on the GUI thread
+IMPORT_REDUCE_MAX_STOPS = 4096
+# Max per-channel error (0-255) allowed when fitting; None keeps every sample
+IMPORT_MAX_ERROR = 2.0
+# Interpolation combo entries -> gradient_core kernel names
+INTERPOLATION_LABELS = {
+    "Linear": 'linear',
+    "Ease In": 'ease-in',
+    "Ease Out": 'ease-out',
+    "Ease In-Out": 'ease-in-out',
+    "Monotone Cubic": 'monotone',
+    "Catmull-Rom": 'catmull-rom',
+}
+COLOR_SPACE_LABELS = {
+    "sRGB": 'srgb',
+    "Linear RGB": 'linear',
+    "OKLab": 'oklab',
+    "OKLCh": 'oklch',
+}
+# Save dialog filters of the full export -> gradient_core.formats.WRITERS names
+FULL_EXPORT_FILTERS = {
+    "Full Gradient (*.gradient)": 'full',
+    "RGB8 LUT (*.rgb8.lut)": 'lut-rgb8',
+    "RGBA8 LUT (*.rgba8.lut)": 'lut-rgba8',
+    "Float16 RGBA LUT (*.f16.lut)": 'lut-f16',
+    "Float32 RGBA LUT (*.f32.lut)": 'lut-f32',
+    "NumPy Float32 RGBA (*.npy)": 'npy',
+}
+# Drop shadow of the frameless window, drawn into a transparent margin around its body
+SHADOW_MARGIN = 12
+SHADOW_BLUR = 10
+SHADOW_OFFSET = 2
+SHADOW_COLOR = QColor(0, 0, 0, 80)
+WINDOW_RADIUS = 20
 
 # --- Windows Acrylic Helper ---
-class ACCENTPOLICY(ctypes.Structure):
-    _fields_ = [
-        ("AccentState", ctypes.c_int),
-        ("AccentFlags", ctypes.c_int),
-        ("GradientColor", ctypes.c_int),
-        ("AnimationId", ctypes.c_int)
-    ]
-class WINCOMPATTRDATA(ctypes.Structure):
-    _fields_ = [
-        ("Attribute", ctypes.c_int),
-        ("Data", ctypes.c_void_p),
-        ("SizeOfData", ctypes.c_size_t)
-    ]
+@lru_cache(maxsize=None)
+def acrylic_structs():
+    # ctypes is only needed on Windows, so it is imported on first use
+    import ctypes
+    class ACCENTPOLICY(ctypes.Structure):
+        _fields_ = [
+            ("AccentState", ctypes.c_int),
+            ("AccentFlags", ctypes.c_int),
+            ("GradientColor", ctypes.c_int),
+            ("AnimationId", ctypes.c_int)
+        ]
+    class WINCOMPATTRDATA(ctypes.Structure):
+        _fields_ = [
+            ("Attribute", ctypes.c_int),
+            ("Data", ctypes.c_void_p),
+            ("SizeOfData", ctypes.c_size_t)
+        ]
+    return ctypes, ACCENTPOLICY, WINCOMPATTRDATA
 
 def enable_windows_acrylic(hwnd):
+    ctypes, ACCENTPOLICY, WINCOMPATTRDATA = acrylic_structs()
     accent = ACCENTPOLICY()
     accent.AccentFlags = 2
     accent.AnimationId = 0
@@ -43,22 +108,210 @@ def enable_windows_acrylic(hwnd):
         except Exception:
             continue
 
-class ColorStop:
-    def __init__(self, position, color):
-        self.position = position  # 0.0 - 1.0
-        self.color = QColor(color)
+@lru_cache(maxsize=4)
+def shadow_nine_patch(dpr):
+    """Blurred rounded-rect shadow whose middle row and column stretch to any size.
+
+    Returns ``(pixmap, corner)``: corners are ``corner`` logical pixels square.
+    """
+    corner = SHADOW_BLUR + WINDOW_RADIUS
+    side = 2 * corner + 1
+    size = int(math.ceil(side * dpr))
+    mask = QImage(size, size, QImage.Format_ARGB32_Premultiplied)
+    mask.fill(Qt.transparent)
+    painter = QPainter(mask)
+    painter.setRenderHint(QPainter.Antialiasing)
+    painter.scale(dpr, dpr)
+    painter.setPen(Qt.NoPen)
+    painter.setBrush(Qt.black)
+    painter.drawRoundedRect(QRectF(SHADOW_BLUR, SHADOW_BLUR, side - 2 * SHADOW_BLUR, side - 2 * SHADOW_BLUR),
+                            WINDOW_RADIUS, WINDOW_RADIUS)
+    painter.end()
+    alpha = np.frombuffer(mask.constBits().asstring(mask.byteCount()), np.uint8).reshape(size, size, 4)[:, :, 3]
+    # Separable Gaussian blur, 3 sigma = SHADOW_BLUR
+    sigma = SHADOW_BLUR * dpr / 3
+    reach = int(math.ceil(3 * sigma))
+    kernel = np.exp(-0.5 * (np.arange(-reach, reach + 1) / sigma) ** 2)
+    kernel /= kernel.sum()
+    blurred = alpha.astype(np.float64)
+    for axis in (0, 1):
+        padded = np.pad(blurred, [(reach, reach) if a == axis else (0, 0) for a in (0, 1)], mode='edge')
+        blurred = sum(w * np.take(padded, range(i, i + size), axis=axis) for i, w in enumerate(kernel))
+    # Premultiplied ARGB: only alpha is non-zero for a black shadow
+    pixels = np.zeros((size, size, 4), np.uint8)
+    pixels[:, :, 3] = np.rint(blurred * (SHADOW_COLOR.alpha() / 255))
+    image = QImage(pixels.data, size, size, size * 4, QImage.Format_ARGB32_Premultiplied)
+    pixmap = QPixmap.fromImage(image)
+    pixmap.setDevicePixelRatio(dpr)
+    return pixmap, corner
+
+def draw_nine_patch(painter, target, pixmap, corner):
+    # Corners are copied as is, edges stretched along their length and the middle both ways
+    dpr = pixmap.devicePixelRatioF()
+    side = pixmap.width() / dpr
+    xs = (0, corner, side - corner, side)
+    ys = xs
+    txs = (target.left(), target.left() + corner, target.right() - corner, target.right())
+    tys = (target.top(), target.top() + corner, target.bottom() - corner, target.bottom())
+    for row in range(3):
+        for col in range(3):
+            source = QRectF(xs[col] * dpr, ys[row] * dpr, (xs[col + 1] - xs[col]) * dpr, (ys[row + 1] - ys[row]) * dpr)
+            painter.drawPixmap(QRectF(txs[col], tys[row], txs[col + 1] - txs[col], tys[row + 1] - tys[row]),
+                               pixmap, source)
+
+def qcolor_rgb(color):
+    # Stops hold plain (r, g, b) tuples; QColor only exists at the widget boundary
+    return (color.red(), color.green(), color.blue())
+
+class ChangeNotifier(QObject):
+    """Coalesces gradient edits into at most one notification per display frame.
+
+    previewChanged fires for in-progress edits (drags), committed once an edit
+    is finished. Cheap consumers can repaint on every event; expensive ones
+    should only listen here.
+    """
+    previewChanged = pyqtSignal()
+    committed = pyqtSignal()
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        screen = QApplication.primaryScreen()
+        rate = screen.refreshRate() if screen and screen.refreshRate() > 0 else 60.0
+        self._pending = False
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(max(1, int(1000 / rate)))
+        self._timer.timeout.connect(self.flush)
+
+    def preview(self):
+        self._pending = True
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def flush(self):
+        if self._pending:
+            self._pending = False
+            self.previewChanged.emit()
+
+    def commit(self):
+        self._timer.stop()
+        self._pending = False
+        self.committed.emit()
 
 class GradientRamp(QWidget):
+    # Stops closer together than this many pixels share one marker
+    LOD_SPACING = 3
+    # Marker sprites keyed by (radius, selected, device pixel ratio), shared by all ramps
+    _marker_sprites = {}
     def __init__(self, stops, on_change, parent=None):
         super().__init__(parent)
         self.setMinimumHeight(80)
         self.setMaximumHeight(80)
         self.stops = stops
+        self.interpolation = 'linear'
+        self.color_space = 'srgb'
         self.selected = None
         self.dragging = False
         self.on_change = on_change
+        self.changes = ChangeNotifier(self)
+        self.changes.previewChanged.connect(on_change)
+        self.changes.committed.connect(on_change)
         self.setMouseTracking(True)
-        self.setStyleSheet("background: rgba(255, 255, 255, 0.60);")
+        self._chrome_cache = None  # glass borders for the current size
+        self._bar_cache = None  # (LUT it was drawn from, bar + borders pixmap)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._chrome_cache = None
+        self._bar_cache = None
+
+    def _new_pixmap(self, width, height):
+        dpr = self.devicePixelRatioF()
+        pixmap = QPixmap(int(width * dpr), int(height * dpr))
+        pixmap.setDevicePixelRatio(dpr)
+        pixmap.fill(Qt.transparent)
+        return pixmap
+
+    def _chrome_pixmap(self, rect):
+        # The glass borders only depend on the widget size and pixel ratio
+        if self._chrome_cache is None or self._chrome_cache.devicePixelRatioF() != self.devicePixelRatioF():
+            pixmap = self._new_pixmap(self.width(), self.height())
+            painter = QPainter(pixmap)
+            painter.setRenderHint(QPainter.Antialiasing)
+            painter.setBrush(Qt.NoBrush)
+            painter.setPen(QPen(QColor(255, 255, 255, 150), 2))
+            painter.drawRoundedRect(rect, 15, 15)
+            # Multiple inner glows for glass effect
+            painter.setPen(QPen(QColor(255, 255, 255, 80), 1))
+            painter.drawRoundedRect(rect.adjusted(1, 1, -1, -1), 14, 14)
+            painter.setPen(QPen(QColor(255, 255, 255, 40), 1))
+            painter.drawRoundedRect(rect.adjusted(2, 2, -2, -2), 13, 13)
+            painter.end()
+            self._chrome_cache = pixmap
+        return self._chrome_cache
+
+    def _bar_pixmap(self, rect):
+        # Redrawn only when the shared LUT changes, i.e. when the gradient or its width does
+        lut = lut_cache.get(*self.stops.arrays(), size=max(1, rect.width()), channels=4,
+                            **self.interpolation_options())
+        if (self._bar_cache is None or self._bar_cache[0] is not lut
+                or self._bar_cache[1].devicePixelRatioF() != self.devicePixelRatioF()):
+            pixmap = self._new_pixmap(self.width(), self.height())
+            painter = QPainter(pixmap)
+            painter.setRenderHint(QPainter.Antialiasing)
+            # One texel per pixel column
+            bar = QImage(lut.data, lut.shape[0], 1, lut.shape[0] * 4, QImage.Format_RGBA8888)
+            brush = QBrush(bar)
+            brush.setTransform(QTransform.fromTranslate(rect.left(), 0))
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(brush)
+            painter.drawRoundedRect(rect, 15, 15)
+            painter.drawPixmap(0, 0, self._chrome_pixmap(rect))
+            painter.end()
+            self._bar_cache = (lut, pixmap)
+        return self._bar_cache[1]
+
+    @classmethod
+    def _marker_sprite(cls, r, selected, dpr):
+        # Everything about a stop marker except its color: shadows, glass rim, highlight, selection rings
+        key = (r, selected, dpr)
+        sprite = cls._marker_sprites.get(key)
+        if sprite is None:
+            half = r + 10
+            sprite = QPixmap(int(2 * half * dpr), int(2 * half * dpr))
+            sprite.setDevicePixelRatio(dpr)
+            sprite.fill(Qt.transparent)
+            painter = QPainter(sprite)
+            painter.setRenderHint(QPainter.Antialiasing)
+            painter.setPen(Qt.NoPen)
+            for offset, alpha in ((3, 100), (2, 60), (1, 30)):
+                painter.setBrush(QColor(0, 0, 0, alpha))
+                painter.drawEllipse(QPointF(half + offset, half + offset), r + offset, r + offset)
+            # Punch out the disc the stop color is drawn into
+            painter.setCompositionMode(QPainter.CompositionMode_Clear)
+            painter.setBrush(Qt.black)
+            painter.drawEllipse(QPointF(half, half), r, r)
+            painter.setCompositionMode(QPainter.CompositionMode_SourceOver)
+            painter.setBrush(Qt.NoBrush)
+            painter.setPen(QPen(QColor(255, 255, 255, 220), 3 if selected else 2))
+            painter.drawEllipse(QPointF(half, half), r, r)
+            painter.setBrush(QColor(255, 255, 255, 60))
+            painter.setPen(Qt.NoPen)
+            painter.drawEllipse(QPointF(half - r/3, half - r/3), r/2, r/2)
+            if selected:
+                painter.setBrush(Qt.NoBrush)
+                painter.setPen(QPen(QColor(100, 200, 255, 200), 2))
+                painter.drawEllipse(QPointF(half, half), r + 6, r + 6)
+                painter.setPen(QPen(QColor(100, 200, 255, 100), 1))
+                painter.drawEllipse(QPointF(half, half), r + 8, r + 8)
+            painter.end()
+            cls._marker_sprites[key] = sprite
+        return sprite
+
+    def _draw_marker(self, painter, x, y, color, selected):
+        r = 14 if selected else 12
+        painter.setBrush(QColor(*color))
+        painter.drawEllipse(QPointF(x, y), r, r)
+        painter.drawPixmap(QPointF(x - r - 10, y - r - 10), self._marker_sprite(r, selected, self.devicePixelRatioF()))
 
     def paintEvent(self, event):
         painter = QPainter(self)
@@ -66,71 +319,35 @@ class GradientRamp(QWidget):
         
         # Main gradient rect
         rect = self.rect().adjusted(20, 20, -20, -40)
+        painter.drawPixmap(0, 0, self._bar_pixmap(rect))
         
-        # Draw gradient background
-        grad = QLinearGradient(rect.left(), 0, rect.right(), 0)
-        for stop in self.stops:
-            grad.setColorAt(stop.position, stop.color)
-        
-        # Draw gradient with enhanced glass border
-        painter.setPen(QPen(QColor(255, 255, 255, 150), 2))
-        painter.setBrush(QBrush(grad))
-        painter.drawRoundedRect(rect, 15, 15)
-        
-        # Draw multiple inner glows for glass effect
-        painter.setPen(QPen(QColor(255, 255, 255, 80), 1))
-        painter.setBrush(Qt.NoBrush)
-        painter.drawRoundedRect(rect.adjusted(1, 1, -1, -1), 14, 14)
-        
-        painter.setPen(QPen(QColor(255, 255, 255, 40), 1))
-        painter.drawRoundedRect(rect.adjusted(2, 2, -2, -2), 13, 13)
-        
-        # Draw stops with glass effect
-        for i, stop in enumerate(self.stops):
-            x = rect.left() + stop.position * rect.width()
-            y = rect.bottom() + 20
-            r = 14 if i == self.selected else 12
-            
-            # Multiple shadow layers for depth
-            painter.setPen(Qt.NoPen)
-            painter.setBrush(QColor(0, 0, 0, 100))
-            painter.drawEllipse(QPointF(x + 3, y + 3), r + 3, r + 3)
-            painter.setBrush(QColor(0, 0, 0, 60))
-            painter.drawEllipse(QPointF(x + 2, y + 2), r + 2, r + 2)
-            painter.setBrush(QColor(0, 0, 0, 30))
-            painter.drawEllipse(QPointF(x + 1, y + 1), r + 1, r + 1)
-            
-            # Stop circle with glass effect
-            painter.setBrush(QBrush(stop.color))
-            painter.setPen(QPen(QColor(255, 255, 255, 220), 3 if i == self.selected else 2))
-            painter.drawEllipse(QPointF(x, y), r, r)
-            
-            # Inner highlight
-            painter.setBrush(QColor(255, 255, 255, 60))
-            painter.setPen(Qt.NoPen)
-            painter.drawEllipse(QPointF(x - r/3, y - r/3), r/2, r/2)
-            
-            # Selection indicator with glow
-            if i == self.selected:
-                painter.setPen(QPen(QColor(100, 200, 255, 200), 2))
-                painter.setBrush(Qt.NoBrush)
-                painter.drawEllipse(QPointF(x, y), r + 6, r + 6)
-                painter.setPen(QPen(QColor(100, 200, 255, 100), 1))
-                painter.drawEllipse(QPointF(x, y), r + 8, r + 8)
+        # Stop markers on whole pixels so the color disc and its sprite line up
+        xs = np.rint(rect.left() + self.stops.positions * rect.width())
+        colors = self.stops.colors
+        y = rect.bottom() + 20
+        # Level of detail: stops sharing a LOD_SPACING-pixel bin get one marker, the last (topmost) one's
+        bins = xs // self.LOD_SPACING
+        shown = np.flatnonzero(np.diff(bins, append=np.nan) != 0)
+        painter.setPen(Qt.NoPen)
+        for i, x, color in zip(shown.tolist(), xs[shown].tolist(), colors[shown, :3].tolist()):
+            if i != self.selected:
+                self._draw_marker(painter, x, y, color, False)
+        # The selected stop is always drawn, on top
+        if self.selected is not None and self.selected < len(self.stops):
+            self._draw_marker(painter, xs[self.selected], y, colors[self.selected, :3].tolist(), True)
 
     def mousePressEvent(self, event: QMouseEvent):
         rect = self.rect().adjusted(20, 20, -20, -40)
         
-        # Check if clicking on existing stop
-        for i, stop in enumerate(self.stops):
-            x = rect.left() + stop.position * rect.width()
-            y = rect.bottom() + 20
-            if (QPointF(x, y) - event.pos()).manhattanLength() < 18:
-                self.selected = i
-                self.dragging = True
-                self.on_change()
-                self.update()
-                return
+        # Check if clicking on existing stop: same 18px manhattan radius, via bisect
+        dy = abs(event.y() - (rect.bottom() + 20))
+        i = self.stops.hit_test((event.x() - rect.left()) / rect.width(), (18 - dy) / rect.width())
+        if i is not None:
+            self.selected = i
+            self.dragging = True
+            self.changes.commit()
+            self.update()
+            return
         
         # Add new stop if clicking on gradient area
         if rect.contains(event.pos()):
@@ -139,62 +356,41 @@ class GradientRamp(QWidget):
             # Interpolate color at this position
             color = self.interpolate_color_at_position(pos)
             
-            new_stop = ColorStop(pos, color)
-            self.stops.append(new_stop)
-            self.stops.sort(key=lambda s: s.position)
-            self.selected = next(i for i, s in enumerate(self.stops) if s.position == pos)
-            self.on_change()
+            self.selected = self.stops.add(pos, qcolor_rgb(color))
+            self.changes.commit()
             self.update()
 
     def interpolate_color_at_position(self, pos):
         if not self.stops:
             return QColor(255, 255, 255)
-        
-        # Find surrounding stops
-        left_stop = None
-        right_stop = None
-        
-        for stop in self.stops:
-            if stop.position <= pos:
-                left_stop = stop
-            if stop.position >= pos and right_stop is None:
-                right_stop = stop
-        
-        if left_stop is None:
-            return right_stop.color
-        if right_stop is None:
-            return left_stop.color
-        if left_stop == right_stop:
-            return left_stop.color
-        
-        # Linear interpolation
-        factor = (pos - left_stop.position) / (right_stop.position - left_stop.position)
-        r = int(left_stop.color.red() + factor * (right_stop.color.red() - left_stop.color.red()))
-        g = int(left_stop.color.green() + factor * (right_stop.color.green() - left_stop.color.green()))
-        b = int(left_stop.color.blue() + factor * (right_stop.color.blue() - left_stop.color.blue()))
-        
+        r, g, b = lut_cache.evaluate(*self.stops.arrays(), pos, **self.interpolation_options())[0].astype(int)
         return QColor(r, g, b)
 
+    def interpolation_options(self):
+        # Keyword arguments shared by the LUT cache and every exporter
+        return {'mode': self.interpolation, 'space': self.color_space}
+
     def mouseMoveEvent(self, event: QMouseEvent):
         if self.dragging and self.selected is not None:
             rect = self.rect().adjusted(20, 20, -20, -40)
             pos = (event.x() - rect.left()) / rect.width()
             pos = max(0.0, min(1.0, pos))
-            self.stops[self.selected].position = pos
-            self.stops.sort(key=lambda s: s.position)
-            # Update selected index after sorting
-            self.selected = next(i for i, s in enumerate(self.stops) if s.position == pos)
-            self.on_change()
+            # Selection follows the stop itself, not its (possibly shared) position
+            self.selected = self.stops.move(self.selected, pos)
+            # Repaint now; side panel and caches hear about it once per frame
+            self.changes.preview()
             self.update()
 
     def mouseReleaseEvent(self, event: QMouseEvent):
+        if self.dragging:
+            self.changes.commit()
         self.dragging = False
 
     def mouseDoubleClickEvent(self, event: QMouseEvent):
         if self.selected is not None and len(self.stops) > 2:
             del self.stops[self.selected]
             self.selected = None
-            self.on_change()
+            self.changes.commit()
             self.update()
 
 class ColorPreviewButton(QPushButton):
@@ -202,47 +398,55 @@ class ColorPreviewButton(QPushButton):
         super().__init__(parent)
         self.color = color
         self.on_color = on_color
+        self._dialog = None
+        self.setObjectName('colorPreview')
         self.setFixedSize(44, 44)
         self.setCursor(Qt.PointingHandCursor)
         self.update_style()
         self.clicked.connect(self.pick_color)
 
     def update_style(self):
-        border_color = self.color.name()
+        # Only the fill follows the color; the border comes from the app stylesheet. Scoped by
+        # name, so the color dialog parented to this button is not restyled with it
+        name = self.color.name()
         self.setStyleSheet(f'''
-            QPushButton {{
-                border-radius: 22px;
-                border: 3px solid {border_color};
-                background: qradialgradient(cx:0.5, cy:0.5, radius:0.7, fx:0.5, fy:0.5,
-                    stop:0 #fff,
-                    stop:0.5 {self.color.name()},
-                    stop:1 #222a36);
-                box-shadow: 0 2px 10px rgba(0,0,0,0.25);
+            QPushButton#colorPreview {{
+                background: qradialgradient(cx:0.5, cy:0.5, radius:0.7, fx:0.3, fy:0.3,
+                    stop:0 rgba(255, 255, 255, 0.9),
+                    stop:0.3 {name},
+                    stop:1 rgba(40, 50, 70, 0.8));
             }}
-            QPushButton:hover {{
-                border: 3px solid #fff;
-                background: qradialgradient(cx:0.5, cy:0.5, radius:0.7, fx:0.5, fy:0.5,
-                    stop:0 #fff,
-                    stop:0.5 {self.color.name()},
-                    stop:1 #2a2a2a);
+            QPushButton#colorPreview:hover {{
+                background: qradialgradient(cx:0.5, cy:0.5, radius:0.7, fx:0.3, fy:0.3,
+                    stop:0 rgba(255, 255, 255, 1.0),
+                    stop:0.3 {name},
+                    stop:1 rgba(60, 70, 90, 0.9));
             }}
-            QPushButton:pressed {{
-                border: 3px solid {border_color};
-                background: {self.color.name()};
+            QPushButton#colorPreview:pressed {{
+                background: {name};
             }}
-        '''.replace('{', '{{').replace('}', '}}').replace('{{self.color.name()}}', '{self.color.name()}').replace('{{border_color}}', '{border_color}'))
+            QPushButton#colorPreview:disabled {{
+                background: rgba(100, 100, 100, 0.5);
+            }}
+        ''')
 
     def setColor(self, color):
+        if color == self.color:
+            return
         self.color = color
         self.update_style()
 
     def pick_color(self):
-        dlg = QColorDialog(self.color, self)
-        dlg.setOption(QColorDialog.DontUseNativeDialog)
-        palette = dlg.palette()
-        palette.setColor(dlg.backgroundRole(), Qt.white)
-        palette.setColor(dlg.foregroundRole(), Qt.black)
-        dlg.setPalette(palette)
+        # Built on first use, then reused
+        if self._dialog is None:
+            self._dialog = QColorDialog(self)
+            self._dialog.setOption(QColorDialog.DontUseNativeDialog)
+            palette = self._dialog.palette()
+            palette.setColor(self._dialog.backgroundRole(), Qt.white)
+            palette.setColor(self._dialog.foregroundRole(), Qt.black)
+            self._dialog.setPalette(palette)
+        dlg = self._dialog
+        dlg.setCurrentColor(self.color)
         if dlg.exec_():
             color = dlg.selectedColor()
             if color.isValid():
@@ -332,187 +536,253 @@ class ImprovedFineSlider(QWidget):
     def value_changed(self, value):
         self.value_label.setText(str(value))
         self.on_change(value)
-# --- UI improvement utilities ---
-def update_color_preview_styling(self):
-    if hasattr(self, 'color_preview'):
-        self.color_preview.setStyleSheet(f'''
-            QPushButton {{
-                border-radius: 22px;
-                border: 3px solid rgba(255, 255, 255, 0.8);
-                background: qradialgradient(cx:0.5, cy:0.5, radius:0.7, fx:0.3, fy:0.3,
-                    stop:0 rgba(255, 255, 255, 0.9),
-                    stop:0.3 {self.color_preview.color.name()},
-                    stop:1 rgba(40, 50, 70, 0.8));
-                min-width: 44px;
-                min-height: 44px;
-            }}
-            QPushButton:hover {{
-                border: 3px solid rgba(255, 255, 255, 1.0);
-                background: qradialgradient(cx:0.5, cy:0.5, radius:0.7, fx:0.3, fy:0.3,
-                    stop:0 rgba(255, 255, 255, 1.0),
-                    stop:0.3 {self.color_preview.color.name()},
-                    stop:1 rgba(60, 70, 90, 0.9));
-            }}
-            QPushButton:pressed {{
-                border: 3px solid rgba(100, 150, 255, 1.0);
-                background: {self.color_preview.color.name()};
-            }}
-            QPushButton:disabled {{
-                border: 3px solid rgba(255, 255, 255, 0.3);
-                background: rgba(100, 100, 100, 0.5);
-            }}
-        ''')
-def improve_gradient_ramp_styling(self):
-    if hasattr(self, 'ramp'):
-        self.ramp.setStyleSheet("""
-            QWidget {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:1,
-                    stop:0 rgba(255, 255, 255, 0.7),
-                    stop:1 rgba(255, 255, 255, 0.6));
-                border: 1px solid rgba(255, 255, 255, 0.4);
-                border-radius: 8px;
-            }
-        """)
-def improve_label_contrast():
-    return """
-        QLabel {
-            color: rgba(255, 255, 255, 0.95);
-            font-weight: 600;
-            font-size: 14px;
-            background: rgba(0, 0, 0, 0.2);
-            border-radius: 6px;
-            padding: 6px 12px;
-            margin: 2px;
-        }
-    """
-def improve_combo_box_styling():
-    return """
-        QComboBox {
-            background: rgba(255, 255, 255, 0.25);
-            color: rgba(255, 255, 255, 0.95);
-            border: 1px solid rgba(255, 255, 255, 0.5);
-            border-radius: 10px;
-            padding: 10px 15px;
-            font-size: 13px;
-            font-weight: 500;
-            min-width: 120px;
-        }
-        QComboBox:hover {
-            background: rgba(255, 255, 255, 0.35);
-            border: 1px solid rgba(255, 255, 255, 0.7);
-        }
-        QComboBox::drop-down {
-            border: none;
-            width: 30px;
-            background: transparent;
-        }
-        QComboBox::down-arrow {
-            image: none;
-            border-left: 7px solid transparent;
-            border-right: 7px solid transparent;
-            border-top: 7px solid rgba(255, 255, 255, 0.8);
-            margin-right: 10px;
-        }
-        QComboBox::down-arrow:hover {
-            border-top: 7px solid rgba(255, 255, 255, 1.0);
-        }
-        QComboBox QAbstractItemView {
-            background: rgba(40, 50, 70, 0.95);
-            color: rgba(255, 255, 255, 0.95);
-            selection-background-color: rgba(100, 150, 255, 0.5);
-            border: 1px solid rgba(255, 255, 255, 0.5);
-            border-radius: 8px;
-            padding: 5px;
-            outline: none;
-        }
-        QComboBox QAbstractItemView::item {
-            padding: 8px 12px;
-            border-radius: 4px;
-            margin: 2px;
-        }
-        QComboBox QAbstractItemView::item:selected {
-            background: rgba(100, 150, 255, 0.6);
-        }
-    """
-def apply_ui_improvements(self):
-    self.interp_combo.setStyleSheet(improve_combo_box_styling())
-    update_color_preview_styling(self)
-    improve_gradient_ramp_styling(self)
-    for label in [self.selected_label]:
-        if hasattr(label, 'setStyleSheet'):
-            label.setStyleSheet(improve_label_contrast())
+# --- Theme ---
+# The editor's whole look as one application-level stylesheet, parsed once at startup.
+# Rules are ordered from the outermost container inwards: equally specific selectors
+# resolve by order, so an inner container's rules override those of the ones around it.
+APP_STYLESHEET = """
+    QWidget#body, #body QWidget {
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:1,
+            stop:0 rgba(40, 45, 60, 0.82), stop:1 rgba(30, 32, 40, 0.92));
+        border-radius: 20px;
+        border: 1.5px solid rgba(255,255,255,0.60);
+    }
+    QWidget#content, #content QWidget {
+        background: transparent;
+        border: none;
+    }
+    QFrame#controls, #controls QFrame {
+        background: rgba(255,255,255,0.09);
+        border-radius: 14px;
+        border: 1.2px solid rgba(255,255,255,0.60);
+    }
+
+    QLabel#titleLabel {
+        color: rgba(255, 255, 255, 0.95);
+        font-size: 15px;
+        font-weight: bold;
+        background: transparent;
+    }
+    QPushButton#minimizeButton, QPushButton#closeButton {
+        border-radius: 16px;
+        font-size: 18px;
+        font-weight: bold;
+    }
+    QPushButton#minimizeButton {
+        background: rgba(255, 255, 255, 0.2);
+        border: 1px solid rgba(255, 255, 255, 0.3);
+        color: rgba(255, 255, 255, 0.9);
+    }
+    QPushButton#minimizeButton:hover {
+        background: rgba(255, 255, 255, 0.3);
+        border: 1px solid rgba(255, 255, 255, 0.5);
+    }
+    QPushButton#closeButton {
+        background: rgba(255, 100, 100, 0.4);
+        border: 1px solid rgba(255, 100, 100, 0.6);
+        color: white;
+    }
+    QPushButton#closeButton:hover {
+        background: rgba(255, 100, 100, 0.7);
+        border: 1px solid rgba(255, 100, 100, 0.9);
+    }
+
+    QLabel#fieldLabel {
+        font-weight: bold;
+        font-size: 14px;
+        color: #f0f0f0;
+        padding-right: 10px;
+    }
+    #controls QComboBox {
+        background: rgba(255, 255, 255, 0.25);
+        color: rgba(255, 255, 255, 0.95);
+        border: 1px solid rgba(255, 255, 255, 0.5);
+        border-radius: 10px;
+        padding: 10px 15px;
+        font-size: 13px;
+        font-weight: 500;
+        min-width: 120px;
+    }
+    #controls QComboBox:hover {
+        background: rgba(255, 255, 255, 0.35);
+        border: 1px solid rgba(255, 255, 255, 0.7);
+    }
+    #controls QComboBox::drop-down {
+        border: none;
+        width: 30px;
+        background: transparent;
+    }
+    #controls QComboBox::down-arrow {
+        image: none;
+        border-left: 7px solid transparent;
+        border-right: 7px solid transparent;
+        border-top: 7px solid rgba(255, 255, 255, 0.8);
+        margin-right: 10px;
+    }
+    #controls QComboBox::down-arrow:hover {
+        border-top: 7px solid rgba(255, 255, 255, 1.0);
+    }
+    #controls QComboBox QAbstractItemView {
+        background: rgba(40, 50, 70, 0.95);
+        color: rgba(255, 255, 255, 0.95);
+        selection-background-color: rgba(100, 150, 255, 0.5);
+        border: 1px solid rgba(255, 255, 255, 0.5);
+        border-radius: 8px;
+        padding: 5px;
+        outline: none;
+    }
+    #controls QComboBox QAbstractItemView::item {
+        padding: 8px 12px;
+        border-radius: 4px;
+        margin: 2px;
+    }
+    #controls QComboBox QAbstractItemView::item:selected {
+        background: rgba(100, 150, 255, 0.6);
+    }
+    QLabel#selectedLabel {
+        color: rgba(255, 255, 255, 0.95);
+        font-weight: 600;
+        font-size: 14px;
+        background: rgba(0, 0, 0, 0.2);
+        border-radius: 6px;
+        padding: 6px 12px;
+        margin: 2px;
+    }
+    QPushButton#colorPreview {
+        border-radius: 22px;
+        border: 3px solid rgba(255, 255, 255, 0.8);
+        min-width: 44px;
+        min-height: 44px;
+    }
+    QPushButton#colorPreview:hover {
+        border: 3px solid rgba(255, 255, 255, 1.0);
+    }
+    QPushButton#colorPreview:pressed {
+        border: 3px solid rgba(100, 150, 255, 1.0);
+    }
+    QPushButton#colorPreview:disabled {
+        border: 3px solid rgba(255, 255, 255, 0.3);
+    }
+    QLabel#quickColorLabel {
+        color: #f0f0f0;
+        font-size: 13px;
+        font-weight: bold;
+        letter-spacing: 2px;
+        margin-bottom: 4px;
+    }
+    QPushButton#colorOptionsButton {
+        color: #f0f0f0;
+        background: #222;
+        border-radius: 8px;
+    }
+
+    QPushButton#actionButton {
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:1,
+            stop:0 #444a5a, stop:1 #353945);
+        color: #e0e0e0;
+        border: 1.5px solid rgba(255,255,255,0.13);
+        border-radius: 10px;
+        font-size: 13px;
+        margin: 0 12px;
+        letter-spacing: 0.5px;
+    }
+    QPushButton#actionButton:hover {
+        background: #5a5f73;
+        border: 1.5px solid #7faaff;
+    }
+    QPushButton#actionButton:pressed {
+        background: #23242a;
+    }
+
+    QLabel#libraryTitle {
+        font-weight: bold;
+        font-size: 13px;
+        color: #f0f0f0;
+    }
+    QListView#libraryView {
+        background: rgba(0,0,0,0.18);
+        border-radius: 8px;
+        border: 1.2px solid rgba(255,255,255,0.13);
+        color: #e0e0e0;
+        font-size: 12px;
+    }
+    QListView#libraryView::item:selected {
+        background: rgba(100, 150, 255, 0.35);
+    }
+
+    QSizeGrip#sizeGrip {
+        background: rgba(255, 255, 255, 0.3);
+        width: 18px;
+        height: 18px;
+        border-radius: 9px;
+    }
+    QLabel#profilerHUD {
+        color: #e8ffe8;
+        background: rgba(0, 0, 0, 170);
+        padding: 6px;
+        border-radius: 6px;
+    }
+    QColorDialog#darkColorDialog, QColorDialog#darkColorDialog QWidget {
+        color: #f0f0f0;
+        background: #222228;
+        font-family: 'Segoe UI', Arial, sans-serif;
+    }
+"""
+APP_FONT = ("Segoe UI", 11)
+
+
+def apply_theme(app):
+    """Install the app stylesheet, once, before the first widget is polished with it."""
+    if app.styleSheet() != APP_STYLESHEET:
+        app.setStyleSheet(APP_STYLESHEET)
+
+
+def dark_color_dialog(owner, color):
+    """``owner``'s dark color dialog, built on first use and reused after."""
+    dlg = getattr(owner, '_color_dialog', None)
+    if dlg is None:
+        dlg = QColorDialog(owner)
+        dlg.setObjectName('darkColorDialog')
+        dlg.setOption(QColorDialog.DontUseNativeDialog)
+        dark_palette = dlg.palette()
+        dark_palette.setColor(QPalette.Window, QColor(34, 34, 40))
+        dark_palette.setColor(QPalette.Base, QColor(34, 34, 40))
+        dark_palette.setColor(QPalette.Text, QColor(240, 240, 240))
+        dark_palette.setColor(QPalette.ButtonText, QColor(240, 240, 240))
+        dark_palette.setColor(QPalette.WindowText, QColor(240, 240, 240))
+        dark_palette.setColor(QPalette.Highlight, QColor(100, 150, 255))
+        dark_palette.setColor(QPalette.HighlightedText, QColor(34, 34, 40))
+        dlg.setPalette(dark_palette)
+        owner._color_dialog = dlg
+    dlg.setCurrentColor(color)
+    return dlg
 
 class TitleBar(QWidget):
     def __init__(self, parent):
         super().__init__(parent)
         self.parent = parent
-        self.setFixedHeight(45)
-        self.setStyleSheet("""
-            QWidget {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:1,
-                    stop:0 rgba(255, 255, 255, 0.25),
-                    stop:1 rgba(255, 255, 255, 0.15));
-                border: 1px solid rgba(255, 255, 255, 0.4);
-                border-top-left-radius: 20px;
-                border-top-right-radius: 20px;
-                border-bottom: none;
-            }
-        """)
-        
+        self.setFixedHeight(44)
+
         layout = QHBoxLayout(self)
         layout.setContentsMargins(20, 0, 20, 0)
         
         title = QLabel(" Glass Gradient Editor")
-        title.setStyleSheet("""
-            QLabel {
-                color: rgba(255, 255, 255, 0.95);
-                font-size: 15px;
-                font-weight: bold;
-                background: transparent;
-                text-shadow: 0 1px 3px rgba(0, 0, 0, 0.5);
-            }
-        """)
-        
+        title.setObjectName('titleLabel')
+
         layout.addWidget(title)
         layout.addStretch()
         
         # Minimize button
         min_btn = QPushButton("−")
+        min_btn.setObjectName('minimizeButton')
         min_btn.setFixedSize(32, 32)
-        min_btn.setStyleSheet("""
-            QPushButton {
-                background: rgba(255, 255, 255, 0.2);
-                border: 1px solid rgba(255, 255, 255, 0.3);
-                border-radius: 16px;
-                color: rgba(255, 255, 255, 0.9);
-                font-size: 18px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background: rgba(255, 255, 255, 0.3);
-                border: 1px solid rgba(255, 255, 255, 0.5);
-            }
-        """)
         min_btn.clicked.connect(parent.showMinimized)
         layout.addWidget(min_btn)
         
         # Close button
         close_btn = QPushButton("×")
+        close_btn.setObjectName('closeButton')
         close_btn.setFixedSize(32, 32)
-        close_btn.setStyleSheet("""
-            QPushButton {
-                background: rgba(255, 100, 100, 0.4);
-                border: 1px solid rgba(255, 100, 100, 0.6);
-                border-radius: 16px;
-                color: white;
-                font-size: 18px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background: rgba(255, 100, 100, 0.7);
-                border: 1px solid rgba(255, 100, 100, 0.9);
-            }
-        """)
         close_btn.clicked.connect(parent.close)
         layout.addWidget(close_btn)
 
@@ -525,29 +795,223 @@ class TitleBar(QWidget):
             self.parent.move(self.parent.pos() + event.globalPos() - self.parent.drag_pos)
             self.parent.drag_pos = event.globalPos()
 
+class ThumbnailSignals(QObject):
+    ready = pyqtSignal(int, int, QImage)  # generation, row, image
+
+class ThumbnailTask(QRunnable):
+    """Renders one library entry's thumbnail off the GUI thread.
+
+    Thumbnails are stored on disk keyed by a hash of the entry's bytes, so
+    each gradient is only ever rendered once across sessions. Without a
+    ``cache_dir`` nothing is stored.
+    """
+    def __init__(self, signals, generation, row, raw, decode, cache_dir, size):
+        super().__init__()
+        self.signals = signals
+        self.generation = generation
+        self.row = row
+        self.raw = raw
+        self.decode = decode
+        self.cache_dir = cache_dir
+        self.size = size
+
+    def run(self):
+        width, height = self.size.width(), self.size.height()
+        path = None
+        if self.cache_dir is not None:
+            digest = hashlib.blake2b(self.raw, digest_size=16).hexdigest()
+            path = os.path.join(self.cache_dir, f"{digest}-{width}x{height}.png")
+        image = QImage(path) if path is not None and os.path.exists(path) else QImage()
+        if image.isNull():
+            try:
+                positions, colors = self.decode(self.raw)
+            except ValueError:
+                self.signals.ready.emit(self.generation, self.row, QImage())
+                return
+            pixels = np.empty((height, width, 4), dtype=np.uint8)
+            pixels[:] = build_lut(positions, colors, size=width, channels=4)
+            image = QImage(pixels.data, width, height, width * 4, QImage.Format_RGBA8888).copy()
+            if path is not None:
+                try:
+                    # Duplicate entries share a path; atomic_write's temporary file is per thread
+                    with atomic_write(path, binary=True) as f:
+                        write_png(f, pixels)
+                except OSError:
+                    pass
+        self.signals.ready.emit(self.generation, self.row, image)
+
+class ExportSignals(QObject):
+    progress = pyqtSignal(int)  # per mille
+    finished = pyqtSignal()
+    failed = pyqtSignal(str)
+    cancelled = pyqtSignal()
+
+class ExportJob(QRunnable):
+    """Writes one export off the GUI thread.
+
+    ``write(f, progress)`` must only use data captured when the job was
+    created (the stops' read-only arrays), so editing can go on meanwhile.
+    Output goes to a temporary file that replaces ``path`` only once it is
+    complete; a cancelled or failed job leaves ``path`` untouched.
+    """
+    def __init__(self, path, write, binary=False):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.path = path
+        self.write = write
+        self.binary = binary
+        self.signals = ExportSignals()
+        self.progress = Progress(self._report)
+        self._reported = -1
+
+    def _report(self, fraction):
+        value = int(fraction * 1000)
+        if value != self._reported:
+            self._reported = value
+            self.signals.progress.emit(value)
+
+    def cancel(self):
+        self.progress.cancel()
+
+    def run(self):
+        try:
+            with atomic_write(self.path, self.binary) as f:
+                self.write(f, self.progress)
+        except Cancelled:
+            self.signals.cancelled.emit()
+        except OSError as e:
+            # Name the destination rather than the temporary file
+            self.signals.failed.emit(f"{e.strerror or e}: {self.path}")
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+        else:
+            self.signals.finished.emit()
+
+class LibraryModel(QAbstractListModel):
+    """List model over a GradientLibrary that renders thumbnails on demand.
+
+    Views only ask for visible rows, and thumbnails live in a bounded LRU, so
+    memory does not grow with the size of the library.
+    """
+    THUMBNAIL_SIZE = QSize(160, 18)
+    MAX_THUMBNAILS = 512
+    # QListView relayouts every row on dataChanged, so finished thumbnails are
+    # announced with this instead and views just repaint the item
+    thumbnailReady = pyqtSignal(int)
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.library = None
+        self._names = []
+        self._thumbnails = OrderedDict()
+        self._pending = set()
+        self._generation = 0
+        self._pool = QThreadPool(self)
+        self._signals = ThumbnailSignals(self)
+        self._signals.ready.connect(self._thumbnail_ready)
+        cache_root = QStandardPaths.writableLocation(QStandardPaths.CacheLocation) or os.path.expanduser('~/.cache')
+        self.cache_dir = os.path.join(cache_root, 'ifs-gradient-gen', 'thumbnails')
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+        except OSError:
+            # Thumbnails are then only kept in the in-memory LRU
+            self.cache_dir = None
+
+    def set_library(self, library):
+        self.beginResetModel()
+        self.cancel_pending()
+        if self.library is not None:
+            self.library.close()
+        self.library = library
+        self._names = library.names if library is not None else []
+        self._thumbnails.clear()
+        self._generation += 1
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._names)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = index.row()
+        if role == Qt.DisplayRole:
+            return self._names[row]
+        if role == Qt.DecorationRole:
+            image = self._thumbnails.get(row)
+            if image is not None:
+                self._thumbnails.move_to_end(row)
+                return image
+            self._request(row)
+        return None
+
+    def _request(self, row):
+        if row in self._pending:
+            return
+        self._pending.add(row)
+        raw = self.library.entry_bytes(row)
+        self._pool.start(ThumbnailTask(self._signals, self._generation, row, raw, self.library.decode,
+                                       self.cache_dir, self.THUMBNAIL_SIZE))
+
+    def cancel_pending(self):
+        # Drop queued renders for rows that scrolled away; visible rows ask again on repaint
+        self._pool.clear()
+        self._pending.clear()
+
+    def _thumbnail_ready(self, generation, row, image):
+        if generation != self._generation:
+            return
+        self._pending.discard(row)
+        self._thumbnails[row] = image
+        if len(self._thumbnails) > self.MAX_THUMBNAILS:
+            self._thumbnails.popitem(last=False)
+        self.thumbnailReady.emit(row)
+
+class LibraryPanel(QFrame):
+    """Side panel listing the gradients of an opened library file."""
+    gradientActivated = pyqtSignal(int)
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setFixedWidth(300)
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(12, 12, 12, 12)
+        self.title = QLabel("Library")
+        self.title.setObjectName('libraryTitle')
+        layout.addWidget(self.title)
+        self.model = LibraryModel(self)
+        self.view = QListView()
+        self.view.setModel(self.model)
+        self.view.setUniformItemSizes(True)
+        self.view.setIconSize(LibraryModel.THUMBNAIL_SIZE)
+        self.view.setObjectName('libraryView')
+        self.view.verticalScrollBar().valueChanged.connect(self.model.cancel_pending)
+        self.model.thumbnailReady.connect(lambda row: self.view.update(self.model.index(row)))
+        # Not clicked as well: where a single click activates, both fire and the entry loads twice
+        self.view.activated.connect(lambda index: self.gradientActivated.emit(index.row()))
+        layout.addWidget(self.view, 1)
+
+    def set_library(self, library):
+        self.model.set_library(library)
+        self.title.setText(f"{os.path.basename(library.path)} \u2014 {len(library)} gradients")
+
 class GradientEditorWindow(QMainWindow):
     def __init__(self):
         super().__init__()
+        apply_theme(QApplication.instance())
         self.setWindowTitle("Gradient Editor")
-        self.setGeometry(200, 200, 1200, 700)
-        self.setMinimumSize(1200, 700)
+        # The body keeps its 1200x700 minimum; the margin around it holds the drop shadow
+        self.setGeometry(200 - SHADOW_MARGIN, 200 - SHADOW_MARGIN, 1200 + 2 * SHADOW_MARGIN, 700 + 2 * SHADOW_MARGIN)
+        self.setMinimumSize(1200 + 2 * SHADOW_MARGIN, 700 + 2 * SHADOW_MARGIN)
+        self.setContentsMargins(SHADOW_MARGIN, SHADOW_MARGIN, SHADOW_MARGIN, SHADOW_MARGIN)
+        self._shadow_cache = None  # full-window shadow pixmap for the current size
         
         self.setAttribute(Qt.WA_TranslucentBackground, True)
         self.setWindowFlags(Qt.FramelessWindowHint | Qt.WindowStaysOnTopHint)
-        self.setStyleSheet(GlassStyles.main_window())
+        self.setFont(QFont(*APP_FONT))
         self.main_widget = QWidget()
+        self.main_widget.setObjectName('body')
         self.setCentralWidget(self.main_widget)
-        self.main_widget.setStyleSheet(GlassStyles.main_widget())
-        controls_frame = QFrame()
-        controls_frame.setStyleSheet(GlassStyles.controls_frame())
-        # Add subtle drop shadow
-        shadow = QGraphicsDropShadowEffect()
-        shadow.setBlurRadius(10)
-        shadow.setColor(QColor(0, 0, 0, 80))
-        shadow.setOffset(0, 2)
-        self.setGraphicsEffect(shadow)
         # Apply blur after show
-        if platform.system() == "Windows":
+        if sys.platform == "win32":
             QTimer.singleShot(100, lambda: enable_windows_acrylic(int(self.winId())))
         
         main_layout = QVBoxLayout(self.main_widget)
@@ -560,164 +1024,107 @@ class GradientEditorWindow(QMainWindow):
         
         # Content area
         content = QWidget()
-        content.setStyleSheet("""
-            QWidget {
-                background: transparent;
-                border: none;
-            }
-        """)
+        content.setObjectName('content')
         content_layout = QVBoxLayout(content)
         content_layout.setContentsMargins(28, 28, 28, 28)
-        content_layout.setSpacing(24)
+        content_layout.setSpacing(32)
         
         # Color stops
-        self.stops = [ColorStop(0.0, '#FF6B6B'), ColorStop(0.5, '#4ECDC4'), ColorStop(1.0, '#45B7D1')]
+        self.stops = StopStore.from_stops([(0.0, parse_color('#FF6B6B')), (0.5, parse_color('#4ECDC4')),
+                                           (1.0, parse_color('#45B7D1'))])
         self.ramp = GradientRamp(self.stops, self.update_ui)
+        self._lut_digest = None
+        # (stops digest, positions, colors) of the full-resolution palette the stops were fitted from
+        self.source_palette = None
+        self.ramp.changes.previewChanged.connect(self.gradient_changed)
+        self.ramp.changes.committed.connect(self.gradient_changed)
+        # Exports write from read-only snapshots of the stops on their own threads
+        self.export_pool = QThreadPool(self)
+        self._export_jobs = {}  # running ExportJob -> its progress dialog
+        # Every committed edit is one undo step; drags and wheel gestures only commit when they end
+        self.history = History(self.editor_state())
+        self.ramp.changes.committed.connect(self.record_history)
+        undo_action = QAction("Undo", self)
+        undo_action.setShortcuts(QKeySequence.Undo)
+        undo_action.triggered.connect(self.undo)
+        redo_action = QAction("Redo", self)
+        redo_keys = QKeySequence.keyBindings(QKeySequence.Redo)
+        if QKeySequence("Ctrl+Y") not in redo_keys:
+            redo_keys.append(QKeySequence("Ctrl+Y"))
+        redo_action.setShortcuts(redo_keys)
+        redo_action.triggered.connect(self.redo)
+        self.addActions([undo_action, redo_action])
         content_layout.addWidget(self.ramp)
         
         # Controls container with enhanced glass effect
         controls_frame = QFrame()
-        controls_frame.setStyleSheet("""
-            QFrame {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:1,
-                    stop:0 rgba(255, 255, 255, 0.18),
-                    stop:1 rgba(255, 255, 255, 0.12));
-                border-radius: 16px;
-                border: 1px solid rgba(255, 255, 255, 0.25);
-                box-shadow: inset 0 1px 0 rgba(255, 255, 255, 0.3);
-            }
-        """)
+        controls_frame.setObjectName('controls')
         controls_layout = QVBoxLayout(controls_frame)
-        controls_layout.setContentsMargins(24, 20, 24, 20)
-        controls_layout.setSpacing(18)
+        controls_layout.setContentsMargins(32, 28, 32, 28)
+        controls_layout.setSpacing(22)
         
         # Interpolation
         interp_layout = QHBoxLayout()
         interp_label = QLabel("Interpolation:")
-        interp_label.setStyleSheet("""
-            QLabel {
-                color: rgba(255, 255, 255, 0.95);
-                font-weight: bold;
-                font-size: 13px;
-                text-shadow: 0 1px 2px rgba(0, 0, 0, 0.5);
-            }
-        """)
-        
+        interp_label.setObjectName('fieldLabel')
+
         self.interp_combo = QComboBox()
-        self.interp_combo.addItems(["Linear", "Ease In", "Ease Out", "Ease In-Out"])
-        self.interp_combo.setStyleSheet("""
-            QComboBox {
-                background: rgba(255, 255, 255, 0.2);
-                color: rgba(255, 255, 255, 0.95);
-                border: 1px solid rgba(255, 255, 255, 0.4);
-                border-radius: 10px;
-                padding: 10px 15px;
-                font-size: 12px;
-                font-weight: 500;
-                text-shadow: 0 1px 2px rgba(0, 0, 0, 0.3);
-            }
-            QComboBox::drop-down {
-                border: none;
-                width: 25px;
-            }
-            QComboBox::down-arrow {
-                image: none;
-                border-left: 6px solid transparent;
-                border-right: 6px solid transparent;
-                border-top: 6px solid rgba(255, 255, 255, 0.8);
-            }
-            QComboBox QAbstractItemView {
-                background: rgba(30, 30, 50, 0.95);
-                color: rgba(255, 255, 255, 0.95);
-                selection-background-color: rgba(100, 150, 255, 0.4);
-                border: 1px solid rgba(255, 255, 255, 0.4);
-                border-radius: 10px;
-                padding: 5px;
-            }
-        """)
-        
+        self.interp_combo.addItems(list(INTERPOLATION_LABELS))
+        self.interp_combo.currentTextChanged.connect(self.set_interpolation)
+        self.space_combo = QComboBox()
+        self.space_combo.addItems(list(COLOR_SPACE_LABELS))
+        self.space_combo.setToolTip("Color space the stops are blended in")
+        self.space_combo.currentTextChanged.connect(self.set_color_space)
+
         interp_layout.addWidget(interp_label)
         interp_layout.addWidget(self.interp_combo)
+        interp_layout.addWidget(self.space_combo)
         interp_layout.addStretch()
         controls_layout.addLayout(interp_layout)
         
-        # Selected stop editor
+        # Selected stop editor, with the quick color panel beside it once a stop is selected
+        editor_layout = QHBoxLayout()
+        stop_layout = QVBoxLayout()
         self.selected_label = QLabel("Click on a gradient stop to edit")
-        self.selected_label.setStyleSheet("""
-            QLabel {
-                color: rgba(255, 255, 255, 0.85);
-                font-size: 13px;
-                font-style: italic;
-                text-shadow: 0 1px 2px rgba(0, 0, 0, 0.5);
-            }
-        """)
-        controls_layout.addWidget(self.selected_label)
+        self.selected_label.setObjectName('selectedLabel')
+        stop_layout.addWidget(self.selected_label, 1)
         
         # Color wheel
         color_layout = QHBoxLayout()
         color_label = QLabel("Color:")
-        color_label.setStyleSheet("""
-            QLabel {
-                color: rgba(255, 255, 255, 0.95);
-                font-weight: bold;
-                font-size: 13px;
-                text-shadow: 0 1px 2px rgba(0, 0, 0, 0.5);
-            }
-        """)
+        color_label.setObjectName('fieldLabel')
         color_layout.addWidget(color_label)
-        self.color_preview = ColorPreviewButton(QColor('#FF6B6B'), self.change_selected_color)
+        self.color_preview = ColorPreviewButton(QColor('#FF6B6B'), self.commit_selected_color)
         self.color_preview.setEnabled(False)
         color_layout.addWidget(self.color_preview)
         color_layout.addStretch()
-        controls_layout.addLayout(color_layout)
+        stop_layout.addLayout(color_layout)
+        editor_layout.addLayout(stop_layout, 1)
         
         # Fine sliders
         self.fine_slider_layout = QVBoxLayout()
-        self.fine_slider_layout.setSpacing(10)
-        controls_layout.addLayout(self.fine_slider_layout)
+        self.fine_slider_layout.setSpacing(14)
+        editor_layout.addLayout(self.fine_slider_layout)
+        controls_layout.addLayout(editor_layout, 1)
         
         content_layout.addWidget(controls_frame)
         
-        # Buttons with enhanced glass styling
+        # Buttons
         btn_layout = QHBoxLayout()
-        btn_style = """
-            QPushButton {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:1,
-                    stop:0 rgba(255, 255, 255, 0.25),
-                    stop:1 rgba(255, 255, 255, 0.15));
-                color: rgba(255, 255, 255, 0.95);
-                border: 1px solid rgba(255, 255, 255, 0.4);
-                border-radius: 12px;
-                padding: 12px 24px;
-                font-weight: 600;
-                font-size: 13px;
-                text-shadow: 0 1px 2px rgba(0, 0, 0, 0.3);
-                box-shadow: 0 2px 8px rgba(0, 0, 0, 0.2);
-            }
-            QPushButton:hover {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:1,
-                    stop:0 rgba(255, 255, 255, 0.35),
-                    stop:1 rgba(255, 255, 255, 0.25));
-                border: 1px solid rgba(255, 255, 255, 0.6);
-                box-shadow: 0 4px 16px rgba(0, 0, 0, 0.3);
-            }
-            QPushButton:pressed {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:1,
-                    stop:0 rgba(255, 255, 255, 0.15),
-                    stop:1 rgba(255, 255, 255, 0.1));
-                box-shadow: inset 0 2px 4px rgba(0, 0, 0, 0.2);
-            }
-        """
-        
+        btn_layout.setSpacing(24)
+        btn_layout.setContentsMargins(24, 12, 24, 12)
+        btn_layout.addStretch(1)
         save_btn = QPushButton("Save Gradient")
         load_btn = QPushButton("Load Gradient")
         export_btn = QPushButton("Export CSS")
         export_jw_btn = QPushButton("Export JWF Gradient")
         export_full_btn = QPushButton("Export Full .gradient")
         export_png_btn = QPushButton("Export PNG")
-        # Now set their styles
         for btn in [save_btn, load_btn, export_btn, export_jw_btn, export_full_btn, export_png_btn]:
-            btn.setStyleSheet(GlassStyles.glass_button() + btn_style)
+            btn.setObjectName('actionButton')
+            btn.setMinimumWidth(150)
+            btn.setMaximumWidth(220)
+            btn.setMinimumHeight(44)
         
         save_btn.clicked.connect(self.save_gradient)
         
@@ -740,502 +1147,396 @@ class GradientEditorWindow(QMainWindow):
         btn_layout.addWidget(export_full_btn)
         btn_layout.addWidget(export_png_btn)
         btn_layout.addStretch()
+        btn_layout.addStretch(1)
         
         content_layout.addLayout(btn_layout)
-        main_layout.addWidget(content)
+        # The gradient library browser is built when the first .ugr/.map library is opened
+        self.library_panel = None
+        self.body_layout = QHBoxLayout()
+        self.body_layout.setContentsMargins(0, 0, 0, 0)
+        self.body_layout.addWidget(content, 1)
+        main_layout.addLayout(self.body_layout)
         
         self.fine_sliders = []
+        self.quick_color_label = None
+        self.hsv_color_wheel = None
         
         # Size grip for resizing
         self.size_grip = QSizeGrip(self)
-        self.size_grip.setStyleSheet("""
-            QSizeGrip {
-                background: rgba(255, 255, 255, 0.3);
-                width: 18px;
-                height: 18px;
-                border-radius: 9px;
-            }
-        """)
-        
-        self.update_ui()
+        self.size_grip.setObjectName('sizeGrip')
 
-        # --- GLASSMORPHIC UI IMPROVEMENTS (Reference-Inspired) ---
-        # Remove unsupported QSS properties and improve button spacing
-        # Title bar styling (no text-shadow/box-shadow)
-        self.title_bar.setFixedHeight(44)
-        self.title_bar.setStyleSheet("""
-            QFrame#titleBar {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:1,
-                    stop:0 rgba(255,255,255,0.18), stop:1 rgba(255,255,255,0.10));
-                border-top-left-radius: 18px;
-                border-top-right-radius: 18px;
-                border-bottom: 1px solid rgba(255,255,255,0.60);
-            }
-        """)
-        # Main widget background
-        self.main_widget.setStyleSheet("""
-            QWidget {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:1,
-                    stop:0 rgba(40, 45, 60, 0.82), stop:1 rgba(30, 32, 40, 0.92));
-                border-radius: 20px;
-                border: 1.5px solid rgba(255,255,255,0.60);
-            }
-        """)
-        # Control panel glass effect
-        controls_frame.setStyleSheet("""
-            QFrame {
-                background: rgba(255,255,255,0.09);
-                border-radius: 14px;
-                border: 1.2px solid rgba(255,255,255,0.60);
-            }
-        """)
-        # Button bar
-        btn_layout.setSpacing(28)
-        btn_layout.setContentsMargins(20, 18, 20, 18)
-        for btn in [save_btn, load_btn, export_btn, export_jw_btn, export_full_btn, export_png_btn]:
-            btn.setMinimumWidth(150)
-            btn.setMaximumWidth(220)
-            btn.setMinimumHeight(44)
-            btn.setStyleSheet(
-                """
-                QPushButton {
-                    background: qlineargradient(x1:0, y1:0, x2:1, y2:1,
-                        stop:0 #444a5a, stop:1 #353945);
-                    color: #e0e0e0;
-                    border: 1.5px solid rgba(255,255,255,0.13);
-                    border-radius: 10px;
-                    font-size: 13px;
-                    margin: 0 12px;
-                    letter-spacing: 0.5px;
-                }
-                QPushButton:hover {
-                    background: #5a5f73;
-                    border: 1.5px solid #7faaff;
-                }
-                QPushButton:pressed {
-                    background: #23242a;
-                }
-                """
-            )
-        btn_layout.setSpacing(24)
-        btn_layout.setContentsMargins(24, 12, 24, 12)
-        btn_layout.insertStretch(0, 1)
-        btn_layout.addStretch(1)
-        self.setMinimumHeight(700)
-        # Interpolation and color controls
-        interp_label.setStyleSheet("font-weight: bold; font-size: 13px; color: #e0e0e0; padding-right: 8px;")
-        self.interp_combo.setStyleSheet("""
-            QComboBox {
-                background: rgba(0,0,0,0.18); border-radius: 8px; padding: 7px 16px;
-                border: 1.2px solid rgba(255,255,255,0.13); color: #e0e0e0; font-size: 12px;
-            }
-            QComboBox::drop-down { border: none; width: 22px; }
-            QComboBox QAbstractItemView {
-                background: #23242a; border: 1px solid rgba(255,255,255,0.13);
-                selection-background-color: rgba(100, 150, 255, 0.13);
-            }
-        """)
-        color_label.setStyleSheet("font-weight: bold; font-size: 13px; color: #e0e0e0; padding-right: 8px;")
-        # Interpolation label: high contrast
-        interp_label.setStyleSheet("font-weight: bold; font-size: 14px; color: #f0f0f0; padding-right: 10px;")
-        # Selected label: high contrast
-        self.selected_label.setStyleSheet('''
-            QLabel {
-                color: #f0f0f0;
-                font-size: 13px;
-                font-style: italic;
-                background: rgba(60,60,80,0.18);
-                border-radius: 10px;
-                padding: 18px 12px;
-                margin-bottom: 10px;
-            }
-        ''')
-        # Fine slider layout
-        self.fine_slider_layout.setSpacing(14)
-        controls_layout.setSpacing(22)
-        controls_layout.setContentsMargins(32, 28, 32, 28)
-        content_layout.setSpacing(32)
-        # Window background polish
-        self.setStyleSheet(self.styleSheet() + "QMainWindow {background: #23242a;}")
-        # --- END GLASSMORPHIC UI IMPROVEMENTS ---
-
-        # --- UI COLOR & FONT IMPROVEMENTS (APPLY AFTER UI CREATION) ---
-        # Set a modern, readable font for the whole app
-        try:
-            app_font = QFont("Segoe UI", 11)
-            self.setFont(app_font)
-        except Exception:
-            pass
-        # Apply font and color to all labels and buttons
-        def set_font_recursive(widget, font):
-            widget.setFont(font)
-            for child in widget.findChildren(QWidget):
-                child.setFont(font)
-        set_font_recursive(self, QFont("Segoe UI", 11))
-        # Ensure all labels use high-contrast color
-        for label in self.findChildren(QLabel):
-            label.setStyleSheet(label.styleSheet() + "color: #f0f0f0; font-family: 'Segoe UI', Arial, sans-serif;")
-        for btn in self.findChildren(QPushButton):
-            btn.setStyleSheet(btn.styleSheet() + "color: #f0f0f0; font-family: 'Segoe UI', Arial, sans-serif;")
-        for combo in self.findChildren(QComboBox):
-            combo.setStyleSheet(combo.styleSheet() + "color: #f0f0f0; font-family: 'Segoe UI', Arial, sans-serif;")
-        # Color wheel button: make border and background stand out
-        self.color_preview.setStyleSheet(f'''
-            QPushButton {{
-                border-radius: 22px;
-                border: 3px solid #7faaff;
-                background: qradialgradient(cx:0.5, cy:0.5, radius:0.7, fx:0.5, fy:0.5,
-                    stop:0 #fff,
-                    stop:0.7 {self.color_preview.color.name()},
-                    stop:1 #222a36);
-            }}
-            QPushButton:hover {{
-                border: 3px solid #fff;
-                background: qradialgradient(cx:0.5, cy:0.5, radius:0.7, fx:0.5, fy:0.5,
-                    stop:0 #fff,
-                    stop:0.7 {self.color_preview.color.name()},
-                    stop:1 #2a2a2a);
-            }}
-            QPushButton:pressed {{
-                border: 3px solid #7faaff;
-                background: {self.color_preview.color.name()};
-            }}
-        ''')
-        # Color label: high contrast
-        color_label.setStyleSheet("font-weight: bold; font-size: 14px; color: #f0f0f0; padding-right: 10px;")
-        # Interpolation label: high contrast
-        interp_label.setStyleSheet("font-weight: bold; font-size: 14px; color: #f0f0f0; padding-right: 10px;")
-        # Selected label: high contrast
-        self.selected_label.setStyleSheet('''
-            QLabel {
-                color: #f0f0f0;
-                font-size: 13px;
-                font-style: italic;
-                background: rgba(60,60,80,0.18);
-                border-radius: 10px;
-                padding: 18px 12px;
-                margin-bottom: 10px;
-            }
-        ''')
-        # --- END UI COLOR & FONT IMPROVEMENTS ---
-
-        apply_ui_improvements(self)
+        self.update_ui()
 
     def resizeEvent(self, event):
         super().resizeEvent(event)
-        # Position size grip in bottom right
+        self._shadow_cache = None
+        # Position size grip in bottom right of the body
         if hasattr(self, 'size_grip'):
-            self.size_grip.move(self.width() - 18, self.height() - 18)
+            self.size_grip.move(self.width() - 18 - SHADOW_MARGIN, self.height() - 18 - SHADOW_MARGIN)
+
+    def paintEvent(self, event):
+        # Drop shadow behind the body: a single cached blit, where a QGraphicsEffect would
+        # re-render and blur the whole window on every child repaint
+        painter = QPainter(self)
+        painter.drawPixmap(0, 0, self._shadow_pixmap())
+
+    def _shadow_pixmap(self):
+        dpr = self.devicePixelRatioF()
+        if self._shadow_cache is None or self._shadow_cache.devicePixelRatioF() != dpr:
+            pixmap = QPixmap(int(self.width() * dpr), int(self.height() * dpr))
+            pixmap.setDevicePixelRatio(dpr)
+            pixmap.fill(Qt.transparent)
+            painter = QPainter(pixmap)
+            body = QRectF(self.centralWidget().geometry())
+            draw_nine_patch(painter, body.translated(0, SHADOW_OFFSET).adjusted(
+                -SHADOW_BLUR, -SHADOW_BLUR, SHADOW_BLUR, SHADOW_BLUR), *shadow_nine_patch(dpr))
+            painter.end()
+            self._shadow_cache = pixmap
+        return self._shadow_cache
 
     def update_ui(self):
         sel = self.ramp.selected
-        # Clear existing sliders
-        for slider in self.fine_sliders:
-            slider.setParent(None)
-        self.fine_sliders.clear()
-        # Remove old color wheel if present
-        if hasattr(self, 'hsv_color_wheel') and self.hsv_color_wheel:
-            self.hsv_color_wheel.setParent(None)
-            self.hsv_color_wheel = None
-        if hasattr(self, 'quick_color_label') and self.quick_color_label:
-            self.quick_color_label.setParent(None)
-            self.quick_color_label = None
         if sel is not None and sel < len(self.stops):
             stop = self.stops[sel]
             self.selected_label.setText(f"Editing stop at position {stop.position:.3f}")
             self.color_preview.setEnabled(True)
-            self.color_preview.setColor(stop.color)
-            # Add 'QUICK COLOR' label
-            from PyQt5.QtWidgets import QLabel
-            self.quick_color_label = QLabel("QUICK COLOR")
-            self.quick_color_label.setStyleSheet("color: #f0f0f0; font-size: 13px; font-weight: bold; letter-spacing: 2px; margin-bottom: 4px; font-family: 'Segoe UI', Arial, sans-serif;")
-            self.fine_slider_layout.addWidget(self.quick_color_label)
-            # Add HSV color wheel
-            self.hsv_color_wheel = HSVColorWheel(stop.color, self)
-            self.hsv_color_wheel.colorChanged.connect(self.change_selected_color)
-            self.fine_slider_layout.addWidget(self.hsv_color_wheel)
-            # Link: when color is changed by QColorDialog, update HSV wheel and stop
-            def open_linked_color_dialog():
-                dlg = QColorDialog(stop.color, self)
-                dlg.setOption(QColorDialog.DontUseNativeDialog)
-                dark_palette = dlg.palette()
-                from PyQt5.QtGui import QPalette
-                dark_palette.setColor(QPalette.Window, QColor(34, 34, 40))
-                dark_palette.setColor(QPalette.Base, QColor(34, 34, 40))
-                dark_palette.setColor(QPalette.Text, QColor(240, 240, 240))
-                dark_palette.setColor(QPalette.ButtonText, QColor(240, 240, 240))
-                dark_palette.setColor(QPalette.WindowText, QColor(240, 240, 240))
-                dark_palette.setColor(QPalette.Highlight, QColor(100, 150, 255))
-                dark_palette.setColor(QPalette.HighlightedText, QColor(34, 34, 40))
-                dlg.setPalette(dark_palette)
-                dlg.setStyleSheet("QWidget { color: #f0f0f0; background: #222228; font-family: 'Segoe UI', Arial, sans-serif; }")
-                if dlg.exec_():
-                    color = dlg.selectedColor()
-                    if color.isValid():
-                        self.hsv_color_wheel.setColor(color)
-                        self.change_selected_color(color)
-            # Patch the color options button to open the linked dialog
-            self.hsv_color_wheel._picker_btn.clicked.disconnect()
-            self.hsv_color_wheel._picker_btn.clicked.connect(open_linked_color_dialog)
+            self.color_preview.setColor(QColor(*stop.color))
+            self.ensure_color_panel()
+            # Only push the color back when it differs, so a wheel drag is not reset mid-gesture
+            if qcolor_rgb(self.hsv_color_wheel.color()) != stop.color:
+                self.hsv_color_wheel.setColor(QColor(*stop.color))
+            self.quick_color_label.setVisible(True)
+            self.hsv_color_wheel.setVisible(True)
         else:
             self.selected_label.setText("Click on a gradient stop to edit")
             self.color_preview.setEnabled(False)
+            if self.hsv_color_wheel is not None:
+                self.quick_color_label.setVisible(False)
+                self.hsv_color_wheel.setVisible(False)
+
+    def ensure_color_panel(self):
+        # The quick color panel is built on first selection and then only updated in place
+        if self.hsv_color_wheel is not None:
+            return
+        self.quick_color_label = QLabel("QUICK COLOR")
+        self.quick_color_label.setObjectName('quickColorLabel')
+        self.fine_slider_layout.addWidget(self.quick_color_label)
+        self.hsv_color_wheel = HSVColorWheel(self.color_preview.color, self)
+        self.hsv_color_wheel.colorChanged.connect(self.change_selected_color)
+        self.hsv_color_wheel.editingFinished.connect(self.ramp.changes.commit)
+        self.fine_slider_layout.addWidget(self.hsv_color_wheel, 1)
+        # Patch the color options button to open the linked dialog
+        self.hsv_color_wheel._picker_btn.clicked.disconnect()
+        self.hsv_color_wheel._picker_btn.clicked.connect(self.open_linked_color_dialog)
+
+    def open_linked_color_dialog(self):
+        # Link: when color is changed by QColorDialog, update HSV wheel and stop
+        dlg = dark_color_dialog(self, self.hsv_color_wheel.color())
+        if dlg.exec_():
+            color = dlg.selectedColor()
+            if color.isValid():
+                self.hsv_color_wheel.setColor(color)
+                self.commit_selected_color(color)
+
+    def gradient_changed(self):
+        # At most once per frame while editing: drop only the LUTs of the superseded gradient
+        digest = content_hash(*self.stops.arrays())
+        if digest != self._lut_digest:
+            if self._lut_digest is not None:
+                lut_cache.invalidate(self._lut_digest)
+            self._lut_digest = digest
 
     def change_selected_rgb(self, channel, value):
         sel = self.ramp.selected
         if sel is not None and sel < len(self.stops):
-            color = self.stops[sel].color
-            rgb = [color.red(), color.green(), color.blue()]
+            rgb = list(self.stops[sel].color)
             rgb[channel] = value
-            self.stops[sel].color = QColor(*rgb)
+            self.stops[sel].color = tuple(rgb)
             self.ramp.update()
-            self.update_ui()
+            self.ramp.changes.commit()
 
     def change_selected_position(self, value):
         sel = self.ramp.selected
         if sel is not None and sel < len(self.stops):
             pos = value / 1000.0
-            self.stops[sel].position = pos
-            self.stops.sort(key=lambda s: s.position)
-            self.ramp.selected = self.stops.index(self.stops[sel])
+            self.ramp.selected = self.stops.move(sel, pos)
             self.ramp.update()
-            self.update_ui()
+            self.ramp.changes.commit()
 
     def change_selected_color(self, color):
         sel = self.ramp.selected
         if sel is not None and sel < len(self.stops):
-            self.stops[sel].color = color
+            self.stops[sel].color = qcolor_rgb(color)
             self.ramp.update()
-            self.color_preview.setColor(color)
-            self.update_ui()
+            # Called for every wheel move; the side panel catches up once per frame
+            self.ramp.changes.preview()
+
+    def commit_selected_color(self, color):
+        self.change_selected_color(color)
+        self.ramp.changes.commit()
+
+    def start_export(self, path, write, binary=False, title="Exported", message="", error="Failed to export"):
+        # Run ``write(f, progress)`` on the export pool with a cancellable progress dialog
+        job = ExportJob(path, write, binary)
+        dialog = QProgressDialog(f"Writing {os.path.basename(path)}...", "Cancel", 0, 1000, self)
+        dialog.setWindowTitle("Exporting")
+        # Quick exports finish before the dialog would show
+        dialog.setMinimumDuration(400)
+        dialog.setAutoClose(False)
+        dialog.setAutoReset(False)
+        dialog.canceled.connect(job.cancel)
+        job.signals.progress.connect(dialog.setValue)
+
+        def done(report=None):
+            self._export_jobs.pop(job, None)
+            dialog.canceled.disconnect(job.cancel)
+            dialog.close()
+            dialog.deleteLater()
+            if report is not None:
+                report()
+
+        job.signals.finished.connect(lambda: done(lambda: QMessageBox.information(self, title, message)))
+        job.signals.failed.connect(lambda e: done(lambda: QMessageBox.warning(self, "Error", f"{error}: {e}")))
+        job.signals.cancelled.connect(done)
+        self._export_jobs[job] = dialog
+        self.export_pool.start(job)
+        return job
+
+    def closeEvent(self, event):
+        # Abandon running exports; their temporary files are removed before the pool drains
+        for job in list(self._export_jobs):
+            job.cancel()
+        self.export_pool.waitForDone()
+        super().closeEvent(event)
 
     def save_gradient(self):
-        data = [
-            {'position': stop.position, 'color': stop.color.name()} for stop in self.stops
-        ]
-        try:
-            with open('gradient.json', 'w') as f:
-                json.dump(data, f, indent=2)
-            QMessageBox.information(self, "Saved", "Gradient saved to gradient.json")
-        except Exception as e:
-            QMessageBox.warning(self, "Error", f"Failed to save: {e}")
+        positions, colors = self.stops.arrays()
+        self.start_export('gradient.json', lambda f, progress: write_json(f, positions, colors),
+                          title="Saved", message="Gradient saved to gradient.json", error="Failed to save")
 
     def load_gradient(self):
-        fname, _ = QFileDialog.getOpenFileName(self, "Load Gradient", "", "Gradient Files (*.json *.gradient)")
+        fname, _ = QFileDialog.getOpenFileName(
+            self, "Load Gradient", "", "Gradient Files (*.json *.gradient);;Gradient Libraries (*.ugr *.map)")
         if not fname:
             return
-        if fname.endswith('.json'):
-            try:
-                with open(fname, 'r') as f:
-                    data = json.load(f)
-                self.stops.clear()
-                for stop in data:
-                    self.stops.append(ColorStop(stop['position'], stop['color']))
-                self.ramp.selected = None
-                self.ramp.update()
-                self.update_ui()
-                QMessageBox.information(self, "Loaded", f"Gradient loaded from {fname}")
-            except Exception as e:
-                QMessageBox.warning(self, "Error", f"Failed to load: {e}")
-        elif fname.endswith('.gradient'):
-            try:
-                with open(fname, 'r') as f:
-                    lines = f.readlines()
-                # First, try to parse editor metadata stops
-                stops = []
-                for line in lines:
-                    if line.strip().startswith('# pos='):
-                        parts = line.strip().split()
-                        pos = float(parts[1].split('=')[1])
-                        color = parts[2].split('=')[1]
-                        stops.append(ColorStop(pos, color))
-                if stops:
-                    self.stops.clear()
-                    self.stops.extend(sorted(stops, key=lambda s: s.position))
-                    self.ramp.selected = None
-                    self.ramp.update()
-                    self.update_ui()
-                    QMessageBox.information(self, "Loaded", f"Gradient loaded from {fname}")
-                    return
-                # Fallback: parse index/color lines as before
-                stops = []
-                for line in lines:
-                    if line.strip().startswith('index=') and 'color=' in line:
-                        parts = line.strip().split()
-                        idx = int(parts[0].split('=')[1])
-                        packed = int(parts[1].split('=')[1])
-                        r = (packed >> 16) & 0xFF
-                        g = (packed >> 8) & 0xFF
-                        b = packed & 0xFF
-                        color = QColor(r, g, b)
-                        pos = idx / 511.0
-                        stops.append(ColorStop(pos, color))
-                    elif len(line.strip().split()) == 4 and line.strip().split()[0].isdigit():
-                        # JWildfire simple format: pos r g b
-                        parts = line.strip().split()
-                        pos = int(parts[0]) / 255.0
-                        r, g, b = map(int, parts[1:4])
-                        color = QColor(r, g, b)
-                        stops.append(ColorStop(pos, color))
-                if stops:
-                    self.stops.clear()
-                    self.stops.extend(sorted(stops, key=lambda s: s.position))
-                    self.ramp.selected = None
-                    self.ramp.update()
-                    self.update_ui()
-                    QMessageBox.information(self, "Loaded", f"Gradient loaded from {fname}")
-                else:
-                    QMessageBox.warning(self, "Error", "No stops found in .gradient file.")
-            except Exception as e:
-                QMessageBox.warning(self, "Error", f"Failed to load: {e}")
+        if fname.lower().endswith(('.ugr', '.map')):
+            self.open_library(fname)
+            return
+        try:
+            positions, colors, sampled = read_gradient(fname, return_sampled=True)
+            mode, space = read_interpolation(fname)
+        except Exception as e:
+            QMessageBox.warning(self, "Error", f"Failed to load: {e}")
+            return
+        message = self.set_gradient(positions, colors, mode, space, sampled)
+        QMessageBox.information(self, "Loaded", f"Gradient loaded from {fname}" + message)
 
-    def export_css(self):
-        stops_css = ', '.join(f"{stop.color.name()} {int(stop.position * 100)}%" for stop in self.stops)
-        css = f"background: linear-gradient(90deg, {stops_css});"
+    def open_library(self, fname):
         try:
-            fname, _ = QFileDialog.getSaveFileName(self, "Export CSS", "gradient.css", "CSS Files (*.css)")
-            if fname:
-                with open(fname, 'w') as f:
-                    f.write(css)
-                QMessageBox.information(self, "Exported", f"CSS exported to {fname}")
+            library = GradientLibrary(fname)
         except Exception as e:
-            QMessageBox.warning(self, "Error", f"Failed to export: {e}")
-
-    def hex_to_rgb(self, hex_color):
-        hex_color = hex_color.strip().lstrip("#")
-        if len(hex_color) == 6:
-            return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
-        elif len(hex_color) == 8:
-            return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))  # ignore alpha
-        else:
-            return (255, 255, 255)
+            QMessageBox.warning(self, "Error", f"Failed to open library: {e}")
+            return
+        if self.library_panel is None:
+            self.library_panel = LibraryPanel()
+            self.library_panel.gradientActivated.connect(self.load_library_entry)
+            self.body_layout.addWidget(self.library_panel)
+        self.library_panel.set_library(library)
+        self.library_panel.show()
+
+    def load_library_entry(self, row):
+        try:
+            positions, colors = self.library_panel.model.library[row]
+        except Exception as e:
+            QMessageBox.warning(self, "Error", f"Failed to load: {e}")
+            return
+        # Library entries are sampled palettes
+        self.set_gradient(positions, colors, sampled=True)
+
+    def editor_state(self):
+        # Immutable history entry; unchanged stops share their arrays with the previous entry
+        return self.stops.snapshot() + (self.ramp.interpolation, self.ramp.color_space)
+
+    def record_history(self):
+        self.history.record(self.editor_state())
+
+    def undo(self):
+        state = self.history.undo()
+        if state is not None:
+            self.restore_state(state)
+
+    def redo(self):
+        state = self.history.redo()
+        if state is not None:
+            self.restore_state(state)
+
+    def restore_state(self, state):
+        positions, colors, mode, space = state
+        self.stops.restore((positions, colors))
+        self.set_interpolation_options(mode, space)
+        self.ramp.dragging = False
+        if self.ramp.selected is not None and self.ramp.selected >= len(self.stops):
+            self.ramp.selected = None
+        self.ramp.update()
+        # Recording the restored state again is a no-op, so this only refreshes the UI
+        self.ramp.changes.commit()
+
+    def set_interpolation_options(self, mode, space):
+        # Apply without going through the combos' handlers, which would commit each change
+        self.ramp.interpolation, self.ramp.color_space = mode, space
+        for combo, labels, value in ((self.interp_combo, INTERPOLATION_LABELS, mode),
+                                     (self.space_combo, COLOR_SPACE_LABELS, space)):
+            combo.blockSignals(True)
+            combo.setCurrentIndex(list(labels.values()).index(value))
+            combo.blockSignals(False)
+
+    def set_interpolation(self, label):
+        self.ramp.interpolation = INTERPOLATION_LABELS[label]
+        self.ramp.update()
+        self.ramp.changes.commit()
+
+    def set_color_space(self, label):
+        self.ramp.color_space = COLOR_SPACE_LABELS[label]
+        self.ramp.update()
+        self.ramp.changes.commit()
+
+    def set_gradient(self, positions, colors, mode='linear', space='srgb', sampled=False):
+        # Replace the edited stops; sampled palettes are fitted, and a note about that is returned for the user
+        message = ""
+        self.source_palette = None
+        if (sampled and IMPORT_MAX_ERROR is not None
+                and IMPORT_REDUCE_MIN_STOPS < len(positions) <= IMPORT_REDUCE_MAX_STOPS):
+            fit = fit_stops(positions, colors, IMPORT_MAX_ERROR)
+            self.source_palette = (content_hash(fit.positions, fit.colors), positions, colors, mode, space)
+            # Fitted stops reproduce the samples under linear sRGB interpolation
+            mode, space = 'linear', 'srgb'
+            message = (f"\nFitted {len(positions)} samples with {len(fit.positions)} stops "
+                       f"(max error {fit.max_error:.2f}, {fit.ratio:.1f}x fewer)")
+            positions, colors = fit.positions, fit.colors
+        self.stops.replace(positions, colors)
+        self.set_interpolation_options(mode, space)
+        self.ramp.selected = None
+        self.ramp.update()
+        self.ramp.changes.commit()
+        return message
+
+    def export_css(self):
+        fname, _ = QFileDialog.getSaveFileName(self, "Export CSS", "gradient.css", "CSS Files (*.css)")
+        if fname:
+            positions, colors = self.stops.arrays()
+            options = self.ramp.interpolation_options()
+            self.start_export(fname, lambda f, progress: write_css(f, positions, colors, **options),
+                              message=f"CSS exported to {fname}")
 
     def export_jwildfire_gradient(self):
         fname, _ = QFileDialog.getSaveFileName(self, "Export JWildfire Gradient", "gradient.gradient", "JWildfire Gradient (*.gradient)")
         if fname:
-            try:
-                with open(fname, "w") as f:
-                    f.write("JWFGradient\n")
-                    sorted_stops = sorted(self.stops, key=lambda s: s.position)
-                    for stop in sorted_stops:
-                        pos = int(stop.position * 255)
-                        # Use hex_to_rgb for robust color extraction
-                        r, g, b = self.hex_to_rgb(stop.color.name())
-                        line = f"{pos} {r} {g} {b}\n"
-                        print(line.strip())  # Debug print
-                        f.write(line)
-                QMessageBox.information(self, "Exported", f"JWildfire gradient exported to {fname}")
-            except Exception as e:
-                QMessageBox.warning(self, "Error", f"Failed to export: {e}")
+            positions, colors = self.stops.arrays()
+            options = self.ramp.interpolation_options()
+            self.start_export(fname, lambda f, progress: write_jwf(f, positions, colors, **options),
+                              message=f"JWildfire gradient exported to {fname}")
 
     def get_color_at(self, t):
         # Interpolate color at position t in [0, 1] using current stops and interpolation
-        stops = sorted(self.stops, key=lambda s: s.position)
-        if t <= stops[0].position:
-            return stops[0].color.name()
-        if t >= stops[-1].position:
-            return stops[-1].color.name()
-        for i in range(1, len(stops)):
-            left = stops[i-1]
-            right = stops[i]
-            if left.position <= t <= right.position:
-                # Linear interpolation (can be replaced with other methods)
-                f = (t - left.position) / (right.position - left.position)
-                r = int(left.color.red() + f * (right.color.red() - left.color.red()))
-                g = int(left.color.green() + f * (right.color.green() - left.color.green()))
-                b = int(left.color.blue() + f * (right.color.blue() - left.color.blue()))
-                return '#{:02X}{:02X}{:02X}'.format(r, g, b)
-        return stops[-1].color.name()
+        r, g, b = lut_cache.evaluate(*self.stops.arrays(), t, **self.ramp.interpolation_options())[0].astype(int)
+        return '#{:02X}{:02X}{:02X}'.format(r, g, b)
 
     def export_full_gradient(self):
-        fname, _ = QFileDialog.getSaveFileName(self, "Export Full .gradient", "full.gradient", "Full Gradient (*.gradient)")
-        if fname:
-            try:
-                with open(fname, "w") as f:
-                    # Write editor metadata as comments
-                    f.write("# editor_version=1.0\n")
-                    f.write("# editable_stops:\n")
-                    for stop in self.stops:
-                        f.write(f"# pos={stop.position:.6f} color={stop.color.name()}\n")
-                    f.write("\ngradient:\n")
-                    f.write(' title="CustomGradient" smooth=no\n')
-                    for i in range(512):
-                        t = i / 511.0
-                        hex_color = self.get_color_at(t)
-                        r, g, b = self.hex_to_rgb(hex_color)
-                        packed = (r << 16) | (g << 8) | b
-                        f.write(f" index={i} color={packed}\n")
-                QMessageBox.information(self, "Exported", f"Full .gradient exported to {fname}")
-            except Exception as e:
-                QMessageBox.warning(self, "Error", f"Failed to export: {e}")
+        from PyQt5.QtWidgets import QInputDialog
+        sizes = [str(size) for size in LUT_SIZES]
+        size, ok = QInputDialog.getItem(self, "Resolution", "Palette entries:", sizes,
+                                        sizes.index(str(FULL_GRADIENT_SIZE)), False)
+        if not ok:
+            return
+        fname, selected = QFileDialog.getSaveFileName(self, "Export Full .gradient", "full.gradient",
+                                                      ";;".join(FULL_EXPORT_FILTERS))
+        if not fname:
+            return
+        fmt = FULL_EXPORT_FILTERS.get(selected, 'full')
+        suffix, writer, binary = WRITERS[fmt]
+        if fmt != 'full' and not fname.endswith(suffix):
+            fname = os.path.splitext(fname)[0] + suffix
+        positions, colors = self.stops.arrays()
+        source = None
+        options = self.ramp.interpolation_options()
+        # Unedited imports keep their original samples
+        if (self.source_palette and self.source_palette[0] == content_hash(positions, colors)
+                and options == {'mode': 'linear', 'space': 'srgb'}):
+            source = self.source_palette[1:]
+        self.start_export(fname, lambda f, progress: writer(
+            f, positions, colors, size=int(size), source=source, progress=progress, **options),
+            binary=binary, message=f"{size}-entry gradient exported to {fname}")
 
     def export_png(self):
         from PyQt5.QtWidgets import QInputDialog
-        width, ok1 = QInputDialog.getInt(self, "PNG Width", "Enter PNG width:", 1200, 100, 8000)
+        width, ok1 = QInputDialog.getInt(self, "PNG Width", "Enter PNG width:", 1200, 100, 65536)
         if not ok1:
             return
-        height, ok2 = QInputDialog.getInt(self, "PNG Height", "Enter PNG height:", 200, 50, 4000)
+        height, ok2 = QInputDialog.getInt(self, "PNG Height", "Enter PNG height:", 200, 50, 65536)
         if not ok2:
             return
+        depth, ok3 = QInputDialog.getItem(self, "PNG Depth", "Bits per channel:", ["8-bit", "16-bit"], 0, False)
+        if not ok3:
+            return
         fname, _ = QFileDialog.getSaveFileName(self, "Export PNG", "gradient.png", "PNG Files (*.png)")
         if not fname:
             return
-        # Render the gradient ramp to a QImage
-        from PyQt5.QtGui import QImage
-        img = QImage(width, height, QImage.Format_ARGB32)
-        img.fill(QColor(0, 0, 0, 0))
-        painter = QPainter(img)
-        painter.setRenderHint(QPainter.Antialiasing)
-        grad = QLinearGradient(0, 0, width, 0)
-        for stop in self.stops:
-            grad.setColorAt(stop.position, stop.color)
-        painter.setBrush(QBrush(grad))
-        painter.setPen(Qt.NoPen)
-        painter.drawRect(0, 0, width, height)
-        painter.end()
-        img.save(fname)
-        QMessageBox.information(self, "Exported", f"Gradient PNG exported to {fname}")
-
-class GlassStyles:
-    @staticmethod
-    def main_window():
-        return """
-            QMainWindow {
-                background: transparent;
-            }
-        """
-    @staticmethod
-    def main_widget():
-        return """
-            background: qlineargradient(x1:0, y1:0, x2:1, y2:1,
-                stop:0 rgba(255, 255, 255, 0.18),
-                stop:0.3 rgba(255, 255, 255, 0.12),
-                stop:0.7 rgba(255, 255, 255, 0.10),
-                stop:1 rgba(255, 255, 255, 0.08));
-            border-radius: 20px;
-            border: 1.5px solid rgba(255,255,255,0.10);
-        """
-    @staticmethod
-    def controls_frame():
-        return """
-            QFrame {
-                background: rgba(255, 255, 255, 0.12);
-                border-radius: 16px;
-                border: 1px solid rgba(255, 255, 255, 0.13);
-            }
-        """
-    @staticmethod
-    def glass_button():
-        return """
-            background: qlineargradient(x1:0, y1:0, x2:1, y2:1,
-                stop:0 rgba(255, 255, 255, 0.13),
-                stop:1 rgba(255, 255, 255, 0.08));
-        """
+        # Streamed from the same LUT the .gradient exporter uses; memory only scales with the width
+        positions, colors = self.stops.arrays()
+        options = self.ramp.interpolation_options()
+        bit_depth = 16 if depth == "16-bit" else 8
+        self.start_export(fname, lambda f, progress: write_png_file(
+            f, positions, colors, width=width, height=height, bit_depth=bit_depth, progress=progress, **options),
+            binary=True, message=f"Gradient PNG exported to {fname}")
+
+@lru_cache(maxsize=4)
+def sv_triangle_weights(verts):
+    # Hue-independent part of the SV triangle raster for one geometry
+    x0 = math.floor(min(x for x, _ in verts))
+    y0 = math.floor(min(y for _, y in verts))
+    x1 = math.ceil(max(x for x, _ in verts))
+    y1 = math.ceil(max(y for _, y in verts))
+    px, py = np.meshgrid(np.arange(x0, x1) + 0.5, np.arange(y0, y1) + 0.5)
+    (ax, ay), (bx, by), (cx, cy) = verts
+    det = (by - cy) * (ax - cx) + (cx - bx) * (ay - cy)
+    # Barycentric weights of the white (u), black (v) and pure hue (w) corners
+    u = ((by - cy) * (px - cx) + (cx - bx) * (py - cy)) / det
+    v = ((cy - ay) * (px - cx) + (ax - cx) * (py - cy)) / det
+    w = 1.0 - u - v
+    # Weight times the opposite altitude is the distance to that edge in pixels,
+    # which gives an antialiased coverage mask
+    altitudes = [abs(det) / math.hypot(q2[0] - q1[0], q2[1] - q1[1])
+                 for q1, q2 in ((verts[1], verts[2]), (verts[2], verts[0]), (verts[0], verts[1]))]
+    edge_dist = np.minimum(np.minimum(u * altitudes[0], v * altitudes[1]), w * altitudes[2])
+    coverage = np.clip(edge_dist + 0.5, 0.0, 1.0)
+    # Same mapping as the selector: S = w, V = u + w. HSV to RGB is then
+    # V * (1 - S) + V * S * pure_hue, so only the pure hue varies per render
+    s = np.clip(w, 0.0, 1.0)
+    val = np.minimum(np.clip(u, 0.0, 1.0) + s, 1.0)
+    return (x0, y0), val * (1.0 - s), val * s, coverage
+
+def render_sv_triangle(hue, p_white, p_black, p_hue, dpr=1.0):
+    # Rasterize the SV triangle in device pixels; returns (logical top-left, QImage)
+    (x0, y0), base, scale, coverage = sv_triangle_weights(
+        tuple((p.x() * dpr, p.y() * dpr) for p in (p_white, p_black, p_hue)))
+    pure = hsv_to_rgb(hue, 1.0, 1.0)
+    pixels = np.empty(base.shape + (4,), dtype=np.uint8)
+    pixels[..., :3] = (base[..., None] + scale[..., None] * pure) * 255.0 + 0.5
+    pixels[..., 3] = coverage * 255.0 + 0.5
+    height, width = base.shape
+    image = QImage(pixels.data, width, height, width * 4, QImage.Format_RGBA8888).copy()
+    image.setDevicePixelRatio(dpr)
+    return QPointF(x0 / dpr, y0 / dpr), image
 
 # --- Replace HSVColorWheel with improved version ---
 class HSVColorWheel(QWidget):
     """A modern HSV color wheel with SV triangle and screen color picker."""
     colorChanged = pyqtSignal(QColor)
+    editingFinished = pyqtSignal()
+    # Rasterized SV triangles keyed by (quantized hue, widget size, pixel ratio), shared by all wheels
+    _triangle_cache = OrderedDict()
+    TRIANGLE_CACHE_SIZE = 32
+    HUE_STEPS = 360
     def __init__(self, color=QColor(255, 0, 0), parent=None):
         super().__init__(parent)
         self.setMinimumSize(180, 180)
@@ -1245,57 +1546,58 @@ class HSVColorWheel(QWidget):
         self._val = color.valueF() if color.isValid() else 1
         self._drag_mode = None  # 'hue' or 'sv'
         self._triangle_points = None
+        self._ring_cache = None  # hue ring pixmap for the current size
         self._picker_btn = QPushButton('color options', self)
         self._picker_btn.setGeometry(10, self.height()-40, 160, 30)
         self._picker_btn.clicked.connect(self.pick_screen_color)
         self._picker_btn.raise_()
+        self._picker_btn.setObjectName('colorOptionsButton')
         self._picker_btn.setFont(QFont("Segoe UI", 10, QFont.Bold))
-        self._picker_btn.setStyleSheet("color: #f0f0f0; background: #222; border-radius: 8px; font-family: 'Segoe UI', Arial, sans-serif;")
     def resizeEvent(self, event):
         self._picker_btn.setGeometry(10, self.height()-40, 160, 30)
+        self._ring_cache = None
+    def _geometry(self):
+        r = min(self.width(), self.height()-50) // 2 - 8
+        center = QPointF(self.width()/2, (self.height()-50)/2+10)
+        return center, r
+    def _ring_pixmap(self):
+        # The hue ring only depends on the widget size, so render it once per size
+        if self._ring_cache is None:
+            dpr = self.devicePixelRatioF()
+            pixmap = QPixmap(self.size() * dpr)
+            pixmap.setDevicePixelRatio(dpr)
+            pixmap.fill(Qt.transparent)
+            painter = QPainter(pixmap)
+            painter.setRenderHint(QPainter.Antialiasing)
+            center, r = self._geometry()
+            for angle in range(0, 360, 1):
+                color = QColor.fromHsv(angle, 255, 255)
+                painter.setPen(QPen(color, 10))
+                painter.drawArc(int(center.x()-r), int(center.y()-r), 2*r, 2*r, angle*16, 16)
+            painter.end()
+            self._ring_cache = pixmap
+        return self._ring_cache
     def paintEvent(self, event):
         painter = QPainter(self)
         painter.setRenderHint(QPainter.Antialiasing)
-        r = min(self.width(), self.height()-50) // 2 - 8
-        center = QPointF(self.width()/2, (self.height()-50)/2+10)
+        center, r = self._geometry()
         # Draw hue ring
-        for angle in range(0, 360, 1):
-            color = QColor.fromHsv(angle, 255, 255)
-            painter.setPen(QPen(color, 10))
-            painter.drawArc(int(center.x()-r), int(center.y()-r), 2*r, 2*r, angle*16, 16)
+        painter.drawPixmap(0, 0, self._ring_pixmap())
         # SV triangle points (top: white, bottom left: black, bottom right: pure hue)
         tri_r = r-18
         p_white = QPointF(center.x(), center.y() - tri_r)
         p_black = QPointF(center.x() - tri_r * math.sin(math.radians(60)), center.y() + tri_r * math.cos(math.radians(60)))
         p_hue = QPointF(center.x() + tri_r * math.sin(math.radians(60)), center.y() + tri_r * math.cos(math.radians(60)))
         self._triangle_points = [p_white, p_black, p_hue]
-        # Draw triangle with correct color interpolation
-        steps = 80
-        for i in range(steps):
-            for j in range(steps-i):
-                u = i / steps
-                v = j / steps
-                w = 1 - u - v
-                if w < 0: continue
-                x = u*p_white.x() + v*p_black.x() + w*p_hue.x()
-                y = u*p_white.y() + v*p_black.y() + w*p_hue.y()
-                # Color at this barycentric
-                # S = w (hue), V = u + w
-                s = w
-                vval = u + w
-                color = QColor.fromHsvF(self._hue, s, vval)
-                painter.setPen(color)
-                painter.drawPoint(int(x), int(y))
+        # Draw triangle from the cached raster for this hue and size
+        origin, image = self._triangle_image(p_white, p_black, p_hue)
+        painter.drawImage(origin, image)
         # Draw triangle border
         painter.setPen(QPen(Qt.white, 2))
         painter.setBrush(Qt.NoBrush)
         painter.drawPolygon(p_white, p_black, p_hue)
         # Draw selector for hue
-        hue_angle = int(self._hue * 360)
-        sel_r = r - 5
-        angle_rad = math.radians(hue_angle)
-        sel_x = center.x() + sel_r * math.cos(angle_rad)
-        sel_y = center.y() - sel_r * math.sin(angle_rad)
+        sel_x, sel_y = self._hue_selector_pos()
         painter.setPen(QPen(Qt.white, 3))
         painter.setBrush(self._color)
         painter.drawEllipse(QPointF(sel_x, sel_y), 9, 9)
@@ -1304,6 +1606,37 @@ class HSVColorWheel(QWidget):
         painter.setPen(QPen(Qt.black, 2))
         painter.setBrush(Qt.white)
         painter.drawEllipse(QPointF(sv_x, sv_y), 7, 7)
+    def _triangle_image(self, p_white, p_black, p_hue):
+        dpr = self.devicePixelRatioF()
+        key = (round(self._hue * self.HUE_STEPS) % self.HUE_STEPS, self.width(), self.height(), dpr)
+        cache = self._triangle_cache
+        if key in cache:
+            cache.move_to_end(key)
+            return cache[key]
+        entry = render_sv_triangle(key[0] / self.HUE_STEPS, p_white, p_black, p_hue, dpr)
+        cache[key] = entry
+        if len(cache) > self.TRIANGLE_CACHE_SIZE:
+            cache.popitem(last=False)
+        return entry
+    def _hue_selector_pos(self):
+        center, r = self._geometry()
+        hue_angle = int(self._hue * 360)
+        sel_r = r - 5
+        angle_rad = math.radians(hue_angle)
+        return center.x() + sel_r * math.cos(angle_rad), center.y() - sel_r * math.sin(angle_rad)
+    def _selector_rects(self):
+        # Bounding boxes of the hue and SV selectors, including pen and antialiasing
+        hx, hy = self._hue_selector_pos()
+        sx, sy = self._sv_to_pos()
+        return [QRectF(hx-12, hy-12, 24, 24).toAlignedRect(), QRectF(sx-9, sy-9, 18, 18).toAlignedRect()]
+    def _triangle_rect(self):
+        return QPolygonF(self._triangle_points).boundingRect().toAlignedRect().adjusted(-2, -2, 2, 2)
+    def _update_dirty(self, rects):
+        # Repaint only the given rectangles instead of the whole widget
+        region = QRegion()
+        for rect in rects:
+            region = region.united(rect)
+        self.update(region)
     def mousePressEvent(self, event):
         if self._on_hue_ring(event.pos()):
             self._drag_mode = 'hue'
@@ -1317,6 +1650,8 @@ class HSVColorWheel(QWidget):
         elif self._drag_mode == 'sv':
             self._set_sv_from_pos(event.pos())
     def mouseReleaseEvent(self, event):
+        if self._drag_mode is not None:
+            self.editingFinished.emit()
         self._drag_mode = None
     def _on_hue_ring(self, pos):
         center = QPointF(self.width()/2, (self.height()-50)/2+10)
@@ -1340,10 +1675,15 @@ class HSVColorWheel(QWidget):
         dy = center.y() - pos.y()
         angle = math.atan2(dy, dx)
         hue = (math.degrees(angle) % 360) / 360.0
+        dirty = self._selector_rects() if self._triangle_points else None
         self._hue = hue
         self._color = QColor.fromHsvF(self._hue, self._sat, self._val)
         self.colorChanged.emit(self._color)
-        self.update()
+        if dirty is None:
+            self.update()
+        else:
+            # A new hue also changes the triangle underneath the SV selector
+            self._update_dirty(dirty + self._selector_rects() + [self._triangle_rect()])
     def _set_sv_from_pos(self, pos):
         p_white, p_black, p_hue = self._triangle_points
         # Barycentric coordinates
@@ -1361,18 +1701,19 @@ class HSVColorWheel(QWidget):
             w = (d00 * d21 - d01 * d20) / denom
             u = 1.0 - v - w
             return u, v, w
+        dirty = self._selector_rects()
         u, v, w = barycentric(pos, p_white, p_black, p_hue)
         # Clamp barycentric
         u = max(0, min(1, u))
         v = max(0, min(1, v))
         w = max(0, min(1, w))
         s = w
-        vval = u + w
+        vval = min(1, u + w)
         self._sat = s
         self._val = vval
         self._color = QColor.fromHsvF(self._hue, self._sat, self._val)
         self.colorChanged.emit(self._color)
-        self.update()
+        self._update_dirty(dirty + self._selector_rects())
     def _sv_to_pos(self):
         p_white, p_black, p_hue = self._triangle_points
         s = self._sat
@@ -1394,26 +1735,115 @@ class HSVColorWheel(QWidget):
     def color(self):
         return self._color
     def pick_screen_color(self):
-        dlg = QColorDialog(self._color, self)
-        dlg.setOption(QColorDialog.DontUseNativeDialog)
-        dark_palette = dlg.palette()
-        dark_palette.setColor(QPalette.Window, QColor(34, 34, 40))
-        dark_palette.setColor(QPalette.Base, QColor(34, 34, 40))
-        dark_palette.setColor(QPalette.Text, QColor(240, 240, 240))
-        dark_palette.setColor(QPalette.ButtonText, QColor(240, 240, 240))
-        dark_palette.setColor(QPalette.WindowText, QColor(240, 240, 240))
-        dark_palette.setColor(QPalette.Highlight, QColor(100, 150, 255))
-        dark_palette.setColor(QPalette.HighlightedText, QColor(34, 34, 40))
-        dlg.setPalette(dark_palette)
-        dlg.setStyleSheet("QWidget { color: #f0f0f0; background: #222228; font-family: 'Segoe UI', Arial, sans-serif; }")
+        dlg = dark_color_dialog(self, self._color)
         if dlg.exec_():
             color = dlg.selectedColor()
             if color.isValid():
                 self.setColor(color)
                 self.colorChanged.emit(color)
+                self.editingFinished.emit()
+
+# Hot paths timed when profiling is enabled; the stylesheet cost is every setStyleSheet call
+PROFILED_METHODS = [
+    ('GradientRamp', ['paintEvent', 'mousePressEvent', 'mouseMoveEvent', 'mouseReleaseEvent']),
+    ('HSVColorWheel', ['paintEvent', 'mousePressEvent', 'mouseMoveEvent', 'mouseReleaseEvent']),
+    ('GradientEditorWindow', ['paintEvent', 'update_ui', 'gradient_changed', 'change_selected_color',
+                              'set_gradient', 'undo', 'redo']),
+    ('ExportJob', ['run']),
+    ('QWidget', ['setStyleSheet']),
+]
+
+
+def enable_profiling():
+    """Time PROFILED_METHODS from now on; call before creating the window."""
+    profiler = Profiler()
+    for class_name, names in PROFILED_METHODS:
+        cls = globals()[class_name]
+        for name in names:
+            setattr(cls, name, profiler.wrap(getattr(cls, name), f"{class_name}.{name}"))
+    return profiler
+
+
+class ProfilerHUD(QLabel):
+    """Overlay listing the profiled hot paths with rolling p50/p95/p99; F12 toggles it."""
+    REFRESH_MS = 500
+
+    def __init__(self, profiler, window):
+        super().__init__(window)
+        self.profiler = profiler
+        self._counts = {}
+        self.setAttribute(Qt.WA_TransparentForMouseEvents)
+        self.setTextFormat(Qt.PlainText)
+        font = QFont("Consolas", 9)
+        font.setStyleHint(QFont.Monospace)
+        self.setFont(font)
+        self.setObjectName('profilerHUD')
+        toggle = QAction(window)
+        toggle.setShortcut(Qt.Key_F12)
+        toggle.triggered.connect(lambda: self.setVisible(not self.isVisible()))
+        window.addAction(toggle)
+        self._timer = QTimer(self)
+        self._timer.timeout.connect(self.refresh)
+        self._timer.start(self.REFRESH_MS)
+        self.refresh()
+
+    def refresh(self):
+        if not self.isVisible():
+            return
+        lines = [f"{'hot path (ms)':<34} {'/s':>5} {'last':>7} {'p50':>7} {'p95':>7} {'p99':>7}"]
+        for name, calls, last, p50, p95, p99 in self.profiler.summary():
+            rate = (calls - self._counts.get(name, calls)) * 1000 / self.REFRESH_MS
+            self._counts[name] = calls
+            lines.append(f"{name:<34} {rate:>5.0f} {last:>7.2f} {p50:>7.2f} {p95:>7.2f} {p99:>7.2f}")
+        self.setText('\n'.join(lines))
+        self.adjustSize()
+        # Bottom right of the body, above the export buttons
+        window = self.parentWidget()
+        self.move(window.width() - SHADOW_MARGIN - 24 - self.width(),
+                  window.height() - SHADOW_MARGIN - 100 - self.height())
+        self.raise_()
+
+
+def start_watchdog(budget_ms, log_path=None):
+    """Log every GUI event-loop stall longer than ``budget_ms``; call from the GUI thread."""
+    if log_path is None:
+        data_root = QStandardPaths.writableLocation(QStandardPaths.GenericDataLocation) or \
+            os.path.expanduser('~/.local/share')
+        log_path = os.path.join(data_root, 'ifs-gradient-gen', 'stalls.log')
+    watchdog = StallWatchdog(stall_logger(log_path), budget_ms / 1e3)
+    watchdog.log_path = log_path
+    watchdog.timer = QTimer()
+    watchdog.timer.setTimerType(Qt.PreciseTimer)
+    watchdog.timer.timeout.connect(watchdog.tick)
+    watchdog.timer.start(max(1, round(watchdog.interval * 1e3)))
+    watchdog.start()
+    return watchdog
+
 
 if __name__ == '__main__':
-    app = QApplication(sys.argv)
+    import argparse
+    parser = argparse.ArgumentParser(description="IFS gradient editor")
+    parser.add_argument('--profile', nargs='?', const=DEFAULT_TRACE_PATH, metavar='TRACE.json',
+                        help=f"time hot paths, show the F12 overlay and write a trace on exit "
+                             f"(default: {DEFAULT_TRACE_PATH}; also enabled by GRADIENT_PROFILE)")
+    parser.add_argument('--watchdog', nargs='?', type=float, const=DEFAULT_BUDGET_MS, metavar='MS',
+                        help=f"log the main thread's stack whenever the UI is blocked for longer than MS "
+                             f"(default: {DEFAULT_BUDGET_MS}; also enabled by GRADIENT_WATCHDOG=MS)")
+    parser.add_argument('--stall-log', metavar='PATH', help="where --watchdog appends its rotating log")
+    args, qt_args = parser.parse_known_args()
+    trace_path = args.profile or trace_path_from_env()
+    profiler = enable_profiling() if trace_path else None
+    app = QApplication(sys.argv[:1] + qt_args)
     window = GradientEditorWindow()
+    if profiler is not None:
+        window.profiler_hud = ProfilerHUD(profiler, window)
     window.show()
-    sys.exit(app.exec_())
\ No newline at end of file
+    budget_ms = args.watchdog or budget_from_env()
+    if budget_ms:
+        watchdog = start_watchdog(budget_ms, args.stall_log)
+        print(f"Logging UI stalls over {budget_ms:g} ms to {watchdog.log_path}", file=sys.stderr)
+    status = app.exec_()
+    if profiler is not None:
+        count = profiler.write_trace(trace_path)
+        print(f"Wrote {count} trace events to {trace_path}", file=sys.stderr)
+    sys.exit(status)
\ No newline at end of file